@@ -0,0 +1,175 @@
+"""
+Cold vs warm latency of the Astra DB RAG tools.
+
+Runs the retrieval of `orchestrate_rag_tool` and `orchestrate_graph_rag_tool`
+against a local in-memory vector store whose embeddings and setup sleep for
+a configurable time, standing in for the watsonx.ai embedding call and the
+Astra DB collection lookup. Compares the previous behaviour, which built the
+embeddings, vector store and retriever on every invocation, with the shared
+store pool of `astra_rag`, first without and then with the result cache.
+
+Usage:
+    python benchmarks/rag_tool_benchmark.py --embed-ms 80 --setup-ms 300
+"""
+
+import argparse
+import hashlib
+import os
+import statistics
+import sys
+import time
+from typing import List
+
+from graph_retriever.strategies import Eager
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import InMemoryVectorStore
+from langchain_graph_retriever import GraphRetriever
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "wxo", "tools"))
+
+import astra_rag  # noqa: E402
+from astra_rag import EDGES, CachedEmbeddings, DocStore, StorePool, TTLCache  # noqa: E402
+
+TOPICS = ["agents", "tools", "connections", "knowledge bases", "flows", "channels", "models"]
+QUESTIONS = [
+    "How do I import a Python tool?",
+    "How do I add credentials to a connection?",
+    "What LLMs can an agent use?",
+    "How do I attach a knowledge base to an agent?",
+    "How do I deploy an agent to a channel?",
+]
+
+# Embedded documents, copied into every store the benchmark connects
+SEEDED_STORE = {}
+
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic hashed bag-of-words vectors, with a simulated network delay."""
+
+    def __init__(self, delay: float, dim: int = 64):
+        self.delay = delay
+        self.dim = dim
+        self.calls = 0
+
+    def _vector(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for word in text.lower().split():
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim] += 1.0
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.calls += 1
+        time.sleep(self.delay)
+        return self._vector(text)
+
+
+def make_docs(pages: int) -> List[Document]:
+    docs = []
+    for i in range(pages):
+        topic = TOPICS[i % len(TOPICS)]
+        docs.append(
+            Document(
+                id=f"page-{i}",
+                page_content=f"watsonx Orchestrate {topic} guide, part {i}. " * 20,
+                metadata={
+                    "id": f"page-{i}",
+                    "url": f"https://docs.example.com/{i}",
+                    "hyperlinks": [f"https://docs.example.com/{(i * 7 + j) % pages}" for j in range(3)],
+                },
+            )
+        )
+    return docs
+
+
+def connect(args) -> InMemoryVectorStore:
+    """Stands in for creating WatsonxEmbeddings and AstraDBVectorStore."""
+    time.sleep(args.setup_ms / 1000)
+    embeddings = FakeEmbeddings(args.embed_ms / 1000)
+    # AstraDBVectorStore embeds a sample sentence to find the vector dimension
+    embeddings.embed_query("This is a sample sentence.")
+    store = InMemoryVectorStore(embedding=embeddings)
+    store.store = dict(SEEDED_STORE)
+    return store
+
+
+def legacy_search(args, question: str, k: int, max_depth: int) -> str:
+    vectorstore = connect(args)
+    retriever = GraphRetriever(
+        store=vectorstore, edges=EDGES, strategy=Eager(k=k, start_k=5, max_depth=max_depth)
+    )
+    results_str = ""
+    for result in retriever.invoke(question):
+        results_str += result.page_content
+        results_str += "\n\n------------"
+    return results_str
+
+
+def summarize(name: str, latencies: List[float], first_round: int, embeds: int) -> None:
+    """
+    Prints the first call, new questions and repeated questions of a variant.
+
+    New questions are the plain RAG calls of the first round after the very
+    first one, so every variant is compared on the same calls of the same tool.
+    """
+    print(
+        f"{name:<22} {latencies[0]:>9.1f} "
+        f"{statistics.mean(latencies[2:first_round:2]):>9.1f} "
+        f"{statistics.mean(latencies[first_round:]):>10.1f} {embeds:>7}"
+    )
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Astra DB RAG tool latency benchmark")
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--embed-ms", type=float, default=80)
+    parser.add_argument("--setup-ms", type=float, default=300)
+    parser.add_argument("--rounds", type=int, default=3, help="times each question is asked")
+    args = parser.parse_args()
+
+    docs = make_docs(args.pages)
+    seeded = InMemoryVectorStore(embedding=FakeEmbeddings(0))
+    seeded.add_documents(docs)
+    SEEDED_STORE.update(seeded.store)
+
+    # Each question goes to both tools, as an agent may call either
+    calls = [(q, k, depth) for q in QUESTIONS for k, depth in ((5, 0), (6, 1))] * args.rounds
+
+    print(f"{'variant':<22} {'first ms':>9} {'new q ms':>9} {'repeat ms':>10} {'embeds':>7}")
+
+    latencies = [timed(legacy_search, args, *call) for call in calls]
+    first_round = len(QUESTIONS) * 2
+    summarize("per-call setup", latencies, first_round, len(calls) * 2)
+
+    for name, ttl in (("pooled", 0), ("pooled + result cache", 300)):
+        pool = StorePool()
+        stores = []
+
+        def connect_pooled():
+            vectorstore = connect(args)
+            embeddings = CachedEmbeddings(vectorstore.embedding)
+            vectorstore.embedding = embeddings
+            store = DocStore(vectorstore, embeddings)
+            store.results = TTLCache(astra_rag.RESULT_CACHE_SIZE, ttl)
+            stores.append(store)
+            return store
+
+        def pooled_search(question, k, max_depth):
+            return pool.get_or_create("benchmark", connect_pooled).search(question, k, max_depth)
+
+        latencies = [timed(pooled_search, *call) for call in calls]
+        embeds = stores[0].embeddings.embeddings.calls
+        summarize(name, latencies, first_round, embeds)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,8 @@ orchestrate connections set-credentials -a astradb --environment draft -e ASTRA_
 orchestrate connections set-credentials -a watsonx --environment draft -e WATSONX_APIKEY=$WATSONX_APIKEY -e WATSONX_PROJECT_ID=$WATSONX_PROJECT_ID
 
 # Tools
-orchestrate tools import -k python -f wxo/tools/orchestrate_rag_tool.py --app-id astradb --app-id watsonx -r wxo/tools/requirements.txt
-orchestrate tools import -k python -f wxo/tools/orchestrate_graph_rag_tool.py --app-id astradb --app-id watsonx -r wxo/tools/requirements.txt
+orchestrate tools import -k python -f wxo/tools/orchestrate_rag_tool.py -p wxo/tools --app-id astradb --app-id watsonx -r wxo/tools/requirements.txt
+orchestrate tools import -k python -f wxo/tools/orchestrate_graph_rag_tool.py -p wxo/tools --app-id astradb --app-id watsonx -r wxo/tools/requirements.txt
 
 # Agent
 orchestrate agents import -f wxo/agents/orchestrate_docs_agent.yaml
\ No newline at end of file
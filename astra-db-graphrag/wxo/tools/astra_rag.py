@@ -0,0 +1,249 @@
+"""
+Shared retrieval for the Astra DB RAG and GraphRAG tools.
+
+Building the watsonx.ai embeddings client and the Astra DB vector store costs
+several HTTP round trips (collection lookup, and a sample embedding to find
+the vector dimension), so both are created once per set of connection
+credentials and reused by later tool invocations of the same process. Query
+embeddings and, optionally, search results are cached as well.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from graph_retriever.strategies import Eager
+from ibm_watsonx_orchestrate.run import connections
+from langchain_astradb import AstraDBVectorStore
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+from langchain_graph_retriever import GraphRetriever
+from langchain_ibm import WatsonxEmbeddings
+from pydantic import BaseModel, Field
+
+EMBEDDING_MODEL_ID = "ibm/granite-embedding-278m-multilingual"
+WATSONX_URL = "https://us-south.ml.cloud.ibm.com"
+COLLECTION = "wxo_docs"
+EDGES = [("hyperlinks", "url")]
+RESULT_SEPARATOR = "\n\n------------"
+
+# Vector stores kept open, one per set of credentials
+MAX_STORES = int(os.getenv("RAG_MAX_STORES", "8"))
+# Query embeddings kept per store
+EMBEDDING_CACHE_SIZE = int(os.getenv("RAG_EMBEDDING_CACHE_SIZE", "1024"))
+# Search results kept per store; a TTL of 0 disables the result cache
+RESULT_CACHE_SIZE = int(os.getenv("RAG_RESULT_CACHE_SIZE", "256"))
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RAG_RESULT_CACHE_TTL_SECONDS", "300"))
+
+
+class RAGSearchResults(BaseModel):
+    """
+    This class represents the search results.
+    """
+    context_data: str | None = Field(description="Context data for the question")
+    document_titles: List[str] | None = Field(description="A list of document titles")
+
+
+def normalize_question(question: str) -> str:
+    return " ".join(question.split()).lower()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps an embeddings client and remembers the embedding of recent queries,
+    so a question asked again, or by both tools, is embedded once.
+    """
+
+    def __init__(self, embeddings: Embeddings, max_size: int = EMBEDDING_CACHE_SIZE):
+        self.embeddings = embeddings
+        self.max_size = max_size
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        with self._lock:
+            vector = self._cache.get(text)
+            if vector is not None:
+                self._cache.move_to_end(text)
+                self.hits += 1
+                return vector
+            self.misses += 1
+        vector = self.embeddings.embed_query(text)
+        with self._lock:
+            self._cache[text] = vector
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return vector
+
+
+class TTLCache:
+    """Small LRU cache whose entries expire `ttl` seconds after being stored."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable):
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, value) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+class DocStore:
+    """A vector store with its embeddings, graph retrievers and result cache."""
+
+    def __init__(self, vectorstore: VectorStore, embeddings: Optional[CachedEmbeddings] = None):
+        self.vectorstore = vectorstore
+        self.embeddings = embeddings
+        self.results = TTLCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL_SECONDS)
+        self._retrievers: Dict[Tuple[int, int], GraphRetriever] = {}
+        self._lock = threading.Lock()
+
+    def retriever(self, k: int, max_depth: int) -> GraphRetriever:
+        """
+        Get the retriever returning up to `k` documents, 5 from semantic search
+        and the rest from following hyperlinks up to `max_depth` hops away.
+        """
+        with self._lock:
+            retriever = self._retrievers.get((k, max_depth))
+            if retriever is None:
+                retriever = GraphRetriever(
+                    store=self.vectorstore,
+                    edges=EDGES,
+                    strategy=Eager(k=k, start_k=5, max_depth=max_depth),
+                )
+                self._retrievers[(k, max_depth)] = retriever
+            return retriever
+
+    def search(self, question: str, k: int, max_depth: int) -> RAGSearchResults:
+        key = (normalize_question(question), k, max_depth)
+        cached = self.results.get(key)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+
+        docs = self.retriever(k, max_depth).invoke(question)
+        result = RAGSearchResults(
+            context_data="".join(doc.page_content + RESULT_SEPARATOR for doc in docs),
+            document_titles=[doc.metadata["id"] for doc in docs],
+        )
+        self.results.put(key, result.model_copy(deep=True))
+        return result
+
+
+class StorePool:
+    """
+    Open document stores keyed by connection credentials, least recently used
+    first out. Concurrent first uses of the same credentials build the store once.
+    """
+
+    def __init__(self, max_stores: int = MAX_STORES):
+        self.max_stores = max_stores
+        self._stores: "OrderedDict[str, DocStore]" = OrderedDict()
+        self._building: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key: str, connect: Callable[[], DocStore]) -> DocStore:
+        with self._lock:
+            store = self._stores.get(key)
+            if store is not None:
+                self._stores.move_to_end(key)
+                return store
+            building = self._building.setdefault(key, threading.Lock())
+
+        with building:
+            with self._lock:
+                store = self._stores.get(key)
+                if store is not None:
+                    return store
+            store = connect()
+            with self._lock:
+                self._stores[key] = store
+                self._building.pop(key, None)
+                while len(self._stores) > self.max_stores:
+                    self._stores.popitem(last=False)
+            return store
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stores.clear()
+
+
+def credentials_key(*values: str) -> str:
+    """Pool key for a set of credentials, hashed so secrets are not kept as keys."""
+    return hashlib.sha256("\0".join(values).encode("utf-8")).hexdigest()
+
+
+def connect_astra(
+    api_endpoint: str, token: str, watsonx_apikey: str, watsonx_project_id: str
+) -> DocStore:
+    embeddings = CachedEmbeddings(
+        WatsonxEmbeddings(
+            model_id=EMBEDDING_MODEL_ID,
+            url=WATSONX_URL,
+            apikey=watsonx_apikey,
+            project_id=watsonx_project_id,
+        )
+    )
+    vectorstore = AstraDBVectorStore(
+        embedding=embeddings,
+        collection_name=COLLECTION,
+        pre_delete_collection=False,
+        api_endpoint=api_endpoint,
+        token=token,
+    )
+    return DocStore(vectorstore, embeddings)
+
+
+# Global pool shared by the tools of this process
+store_pool = StorePool()
+
+
+def search_docs(question: str, k: int, max_depth: int) -> RAGSearchResults:
+    """
+    Retrieve context data for a question from the Astra DB collection, using
+    the credentials of the `astradb` and `watsonx` connections.
+
+    :param question: The question to retrieve context for
+    :param k: Maximum number of documents returned
+    :param max_depth: Hyperlink hops followed from the semantic search results, 0 for plain RAG
+    :returns: Context data and the ids of the documents used
+    """
+    astradb_conn = connections.key_value("astradb")
+    watsonx_conn = connections.key_value("watsonx")
+    credentials = (
+        astradb_conn["ASTRA_DB_API_ENDPOINT"],
+        astradb_conn["ASTRA_DB_APPLICATION_TOKEN"],
+        watsonx_conn["WATSONX_APIKEY"],
+        watsonx_conn["WATSONX_PROJECT_ID"],
+    )
+    store = store_pool.get_or_create(
+        credentials_key(*credentials), lambda: connect_astra(*credentials)
+    )
+    return store.search(question, k, max_depth)
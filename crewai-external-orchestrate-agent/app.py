@@ -5,11 +5,11 @@ This template demonstrates how to build a modular multi-agent Retrieval-Augmente
 system using CrewAI, FastAPI, and IBM watsonx.
 
 Features:
-- Multi-agent classification and routing
+- Multi-agent classification and routing (keyword router with LLM fallback and route cache)
 - Dynamic tool usage (query cleaning, classification, vector search)
-- Streaming responses via Server-Sent Events (SSE)
+- Token-level streaming responses via Server-Sent Events (SSE)
 - IBM watsonx LLM integration
-- Elasticsearch vector search
+- Elasticsearch vector search (async, cached, optional BM25 + kNN hybrid)
 - Extensible event listener system for debugging and live progress
 
 Adapt and extend this for your own domain (e.g., manufacturing, finance, healthcare).
@@ -19,10 +19,11 @@ Adapt and extend this for your own domain (e.g., manufacturing, finance, healthc
 from dotenv import load_dotenv
 import os
 import re
+import logging
 import nltk
 import queue
 import threading
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Optional
 from fastapi import FastAPI, Header, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
@@ -30,14 +31,19 @@ import json
 import time
 import uuid
 import asyncio
+import contextvars
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
-from elasticsearch import Elasticsearch
+from elasticsearch import AsyncElasticsearch
 from crewai import Agent, Task, Crew, Process, LLM
 from crewai.tools import BaseTool
 from crewai.events import *
 from crewai.utilities.events.base_event_listener import BaseEventListener
 
+logger = logging.getLogger(__name__)
+
 # --- Setup NLTK for text preprocessing ---
 # Downloads tokenizers and stopwords on first run if missing
 try:
@@ -59,16 +65,34 @@ ES_USER = os.getenv("username", None)
 ES_PASS = os.getenv("password", None)
 EXPECTED_API_KEY = os.getenv("ORCH_API_KEY")
 
+ES_INDEX = os.getenv("ES_INDEX", "your_index_name")
+
+# --- Retrieval tuning ---
+SEARCH_K = int(os.getenv("SEARCH_K", "5"))
+SEARCH_NUM_CANDIDATES = int(os.getenv("SEARCH_NUM_CANDIDATES", "100"))
+# Fuse BM25 and kNN results with reciprocal-rank fusion instead of kNN only
+SEARCH_HYBRID = os.getenv("SEARCH_HYBRID", "false").lower() == "true"
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "512"))
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "300"))
+RRF_K = 60
+
 # --- Connect to Elasticsearch (for RAG retrieval) ---
 # This assumes you’ve stored vector embeddings in an Elasticsearch index.
-es = Elasticsearch(
+# The async client keeps a pool of keep-alive connections per node, shared by all searches.
+es = AsyncElasticsearch(
     ES_URL,
     basic_auth=(ES_USER, ES_PASS),
     verify_certs=False,
     max_retries=5,
     retry_on_timeout=True,
+    connections_per_node=int(os.getenv("ES_CONNECTIONS_PER_NODE", "10")),
 )
 
+# CrewAI calls tools synchronously from the crew threads, so searches are submitted to one
+# event loop running in the background, which owns the async client and its connections.
+search_loop = asyncio.new_event_loop()
+threading.Thread(target=search_loop.run_forever, name="es-search-loop", daemon=True).start()
+
 # --- Configure IBM watsonx as the primary LLM ---
 # This model handles reasoning, classification, and generation.
 llm = LLM(
@@ -77,8 +101,104 @@ llm = LLM(
     api_key=WX_API_KEY,
     project_id=PROJECT_ID,
     max_tokens=4000,
+    # Emit tokens as LLMStreamChunkEvent so the SSE endpoint can forward them as they arrive
+    stream=True,
 )
 
+# --- Live progress via CrewAI events ---
+# The event bus is process-wide and calls handlers in the thread running the crew, so
+# each streaming request binds its sink to that thread's context and only sees its own events.
+
+# Marker of the agent's answer in a ReAct turn, everything before it is scratchpad
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+
+@dataclass
+class RequestStream:
+    """Forwards the CrewAI events of one request to its SSE stream."""
+
+    send: Callable[[Dict[str, Any]], None]
+    # Token chunks are only forwarded once the query is routed to the answering agent,
+    # the supervisor's classification reasoning is not part of the answer
+    forward_tokens: bool = False
+    streamed_tokens: bool = False
+    closed: bool = field(default=False, repr=False)
+    # Text of the current LLM turn up to its final answer, whether answer text was sent, and
+    # whitespace held back until more answer text follows, so the chunks add up to the
+    # stripped answer the agent returns
+    _turn: Optional[str] = field(default="", repr=False)
+    _answered: bool = field(default=False, repr=False)
+    _pending: str = field(default="", repr=False)
+
+    def emit(self, payload: Dict[str, Any]) -> None:
+        if not self.closed:
+            self.send(payload)
+
+    def start_turn(self) -> None:
+        self._turn, self._answered, self._pending = "", False, ""
+
+    def forward(self, chunk: str) -> None:
+        """Forwards the part of a token chunk that follows the turn's final answer marker."""
+        if self._turn is not None:
+            self._turn += chunk
+            if FINAL_ANSWER_MARKER not in self._turn:
+                return
+            chunk = self._turn.split(FINAL_ANSWER_MARKER, 1)[1]
+            self._turn = None
+        text = self._pending + chunk
+        if not self._answered:
+            text = text.lstrip()
+        answer = text.rstrip()
+        self._pending = text[len(answer):]
+        if answer:
+            self._answered = self.streamed_tokens = True
+            self.emit({"chunk": answer})
+
+
+_request_stream: contextvars.ContextVar[Optional[RequestStream]] = contextvars.ContextVar(
+    "request_stream", default=None
+)
+
+
+class StreamingEventListener(BaseEventListener):
+    """Routes LLM tokens and agent/tool step events to the SSE stream of the current request."""
+
+    def setup_listeners(self, crewai_event_bus):
+        @crewai_event_bus.on(LLMCallStartedEvent)
+        def on_llm_started(source, event):
+            stream = _request_stream.get()
+            if stream:
+                stream.start_turn()
+
+        @crewai_event_bus.on(LLMStreamChunkEvent)
+        def on_llm_chunk(source, event):
+            # Thought/Action turns of the agent stay out of the answer, only the text
+            # after "Final Answer:" is streamed
+            stream = _request_stream.get()
+            if stream and stream.forward_tokens and event.chunk:
+                stream.forward(event.chunk)
+
+        @crewai_event_bus.on(AgentExecutionStartedEvent)
+        def on_agent_started(source, event):
+            stream = _request_stream.get()
+            if stream:
+                stream.emit({"event": "agent_started", "agent": event.agent.role})
+
+        @crewai_event_bus.on(ToolUsageStartedEvent)
+        def on_tool_started(source, event):
+            stream = _request_stream.get()
+            if stream:
+                stream.emit({"event": "tool_started", "tool": event.tool_name})
+
+        @crewai_event_bus.on(ToolUsageFinishedEvent)
+        def on_tool_finished(source, event):
+            stream = _request_stream.get()
+            if stream:
+                stream.emit({"event": "tool_finished", "tool": event.tool_name})
+
+
+streaming_listener = StreamingEventListener()
+
 # --- Initialise FastAPI ---
 # Provides REST endpoints for querying the multi-agent system.
 app = FastAPI(title="Multi-Agent CrewAI RAG", version="1.0")
@@ -101,9 +221,9 @@ class QueryRequest(BaseModel):
 class QueryCleanerTool(BaseTool):
     """Cleans and normalizes user queries for RAG search."""
 
-    name = "query_cleaner"
-    description = "Removes stopwords and noise, preserving short technical terms"
-    keep_words = ["ac", "dc", "hv", "lv", "ip", "kw", "hp"]
+    name: str = "query_cleaner"
+    description: str = "Removes stopwords and noise, preserving short technical terms"
+    keep_words: List[str] = ["ac", "dc", "hv", "lv", "ip", "kw", "hp"]
 
     def _run(self, query: str) -> str:
         # Clean punctuation and lowercase text
@@ -116,44 +236,148 @@ class QueryCleanerTool(BaseTool):
         return " ".join(filtered) if filtered else query
 
 
-class VectorSearchTool(BaseTool):
-    """Performs semantic vector search using Elasticsearch."""
-
-    name = "vector_search"
-    description = "Retrieves relevant text chunks and metadata from a vector database"
-
-    def _run(self, query: str) -> str:
+def reciprocal_rank_fusion(
+    result_lists: List[List[Dict[str, Any]]], k: int = RRF_K
+) -> List[Dict[str, Any]]:
+    """Merges ranked hit lists, scoring each hit by the sum of 1 / (k + rank) over the lists."""
+    scores: Dict[str, float] = {}
+    hits: Dict[str, Dict[str, Any]] = {}
+    for result in result_lists:
+        for rank, hit in enumerate(result, start=1):
+            scores[hit["_id"]] = scores.get(hit["_id"], 0.0) + 1.0 / (k + rank)
+            hits.setdefault(hit["_id"], hit)
+    return [hits[doc_id] for doc_id in sorted(scores, key=scores.get, reverse=True)]
+
+
+class VectorSearchRetriever:
+    """
+    Async Elasticsearch retrieval shared by all agents.
+
+    Results are cached per cleaned query, so the knowledge and expert agents (and repeated
+    questions) reuse one search, and concurrent identical searches share a single request.
+    """
+
+    def __init__(
+        self,
+        client: AsyncElasticsearch,
+        index: str = ES_INDEX,
+        k: int = SEARCH_K,
+        num_candidates: int = SEARCH_NUM_CANDIDATES,
+        hybrid: bool = SEARCH_HYBRID,
+        cache_size: int = SEARCH_CACHE_SIZE,
+        cache_ttl: float = SEARCH_CACHE_TTL_SECONDS,
+    ):
+        self.client = client
+        self.index = index
+        self.k = k
+        self.num_candidates = num_candidates
+        self.hybrid = hybrid
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._cleaner = QueryCleanerTool()
+        self.stats = {"searches": 0, "cache_hits": 0, "coalesced": 0}
+
+    async def _knn(self, query: str) -> List[Dict[str, Any]]:
         # Elasticsearch kNN query for semantic retrieval
-        search_query = {
-            "knn": {
+        response = await self.client.search(
+            index=self.index,
+            knn={
                 "field": "vector_query_field.predicted_value",
-                "k": 5,
-                "num_candidates": 100,
+                "k": self.k,
+                "num_candidates": max(self.num_candidates, self.k),
                 "query_vector_builder": {
                     "text_embedding": {
                         "model_id": "embaas__sentence-transformers-multilingual-e5-base",
                         "model_text": query,
                     }
                 },
-            }
-        }
+            },
+            size=self.k,
+            source=["text_field", "metadata.url"],
+        )
+        return response["hits"]["hits"]
+
+    async def _bm25(self, query: str) -> List[Dict[str, Any]]:
+        response = await self.client.search(
+            index=self.index,
+            query={"match": {"text_field": query}},
+            size=self.k,
+            source=["text_field", "metadata.url"],
+        )
+        return response["hits"]["hits"]
+
+    async def _search(self, query: str) -> List[Dict[str, Any]]:
+        self.stats["searches"] += 1
+        if not self.hybrid:
+            return await self._knn(query)
+        knn_hits, bm25_hits = await asyncio.gather(self._knn(query), self._bm25(query))
+        return reciprocal_rank_fusion([knn_hits, bm25_hits])[: self.k]
+
+    async def search(self, query: str) -> List[Dict[str, Any]]:
+        """Returns the hits of a query, served from the cache when possible."""
+        cleaned = self._cleaner._run(query) or query
+        key = (cleaned, self.hybrid, self.k, self.num_candidates)
+
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return cached[1]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        pending = asyncio.ensure_future(self._search(cleaned))
+        self._inflight[key] = pending
+        try:
+            hits = await pending
+        finally:
+            self._inflight.pop(key, None)
+
+        self._cache[key] = (time.monotonic() + self.cache_ttl, hits)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return hits
+
+    def search_sync(self, query: str) -> List[Dict[str, Any]]:
+        """Runs `search` on the background search loop from a synchronous caller."""
+        return asyncio.run_coroutine_threadsafe(self.search(query), search_loop).result()
+
+
+def format_hits(hits: List[Dict[str, Any]]) -> str:
+    results = []
+    # Combine text and metadata for display
+    for hit in hits:
+        text = hit["_source"].get("text_field", "")
+        url = hit["_source"].get("metadata", {}).get("url", "")
+        if text:
+            results.append(f"{text}\n(Source: {url})" if url else text)
+    return "\n\n".join(results)
+
+
+retriever = VectorSearchRetriever(es)
+
+
+class VectorSearchTool(BaseTool):
+    """Performs semantic (optionally hybrid) search using Elasticsearch."""
 
-        response = es.search(index="your_index_name", body=search_query)
-        results = []
-        # Combine text and metadata for display
-        for hit in response["hits"]["hits"]:
-            text = hit["_source"].get("text_field", "")
-            url = hit["_source"].get("metadata", {}).get("url", "")
-            if text:
-                results.append(f"{text}\n(Source: {url})" if url else text)
-        return "\n\n".join(results)
+    name: str = "vector_search"
+    description: str = "Retrieves relevant text chunks and metadata from a vector database"
+
+    def _run(self, query: str) -> str:
+        return format_hits(retriever.search_sync(query))
 
 
 class QueryClassifierTool(BaseTool):
     """Classifies incoming queries into different agent routes."""
 
-    name = "query_classifier"
-    description = "Classifies queries into 'knowledge_agent' or 'expert_agent'"
+    name: str = "query_classifier"
+    description: str = "Classifies queries into 'knowledge_agent' or 'expert_agent'"
 
     def _run(self, query: str) -> str:
         # Prompt the LLM to determine which agent should handle the query
@@ -171,72 +395,233 @@ class QueryClassifierTool(BaseTool):
 
 # --- Define Agents ---
 # Agents are autonomous units powered by the LLM and optional tools.
+# Crews are reused across requests, so agents are built per pooled crew instead of shared.
+
+def build_knowledge_agent() -> Agent:
+    return Agent(
+        role="Knowledge Agent",
+        goal="Answer factual and documentation-based queries using RAG",
+        llm=llm,
+        tools=[QueryCleanerTool(), VectorSearchTool()],
+    )
+
+
+def build_expert_agent() -> Agent:
+    return Agent(
+        role="Expert Agent",
+        goal="Provide reasoning-based or context-aware responses using domain knowledge",
+        llm=llm,
+        tools=[VectorSearchTool()],
+    )
+
+
+# --- Prebuilt Crews ---
+# Task descriptions hold a {query} placeholder filled in by `kickoff(inputs=...)`, so a crew
+# is built once and reused. A crew runs one query at a time; concurrent requests get their
+# own crew from the pool, which grows on demand.
+
+def build_knowledge_crew() -> Crew:
+    agent = build_knowledge_agent()
+    task = Task(
+        description="""
+        Use query_cleaner → vector_search → synthesize clear answer for:
+        "{query}"
+        """,
+        agent=agent,
+        expected_output="Concise, structured factual answer",
+    )
+    return Crew(agents=[agent], tasks=[task], process=Process.sequential)
+
+
+def build_expert_crew() -> Crew:
+    agent = build_expert_agent()
+    task = Task(
+        description="""
+        Use vector_search to generate a context-aware expert response for:
+        "{query}"
+        """,
+        agent=agent,
+        expected_output="Technical or reasoning-based expert response",
+    )
+    return Crew(agents=[agent], tasks=[task], process=Process.sequential)
+
+
+class CrewPool:
+    """Hands out idle prebuilt crews of one route, building a new one when all are busy."""
+
+    def __init__(self, factory: Callable[[], Crew]):
+        self.factory = factory
+        self._idle: List[Crew] = []
+        self._lock = threading.Lock()
+
+    def kickoff(self, query: str) -> str:
+        with self._lock:
+            crew = self._idle.pop() if self._idle else None
+        if crew is None:
+            crew = self.factory()
+        try:
+            return str(crew.kickoff(inputs={"query": query}))
+        finally:
+            # CrewAI appends every tool call to the agent and never resets it, a reused crew
+            # would otherwise grow with each query and carry its tool results into the next
+            for agent in crew.agents:
+                agent.tools_results = []
+            with self._lock:
+                self._idle.append(crew)
+
+
+# --- Query Routing ---
+# Most queries can be routed from their wording alone. The LLM classifier is only asked when
+# the keyword scores are ambiguous, and every decision is cached per normalized query.
+
+# LLM round-trips of the former supervisor crew: the agent picks the classifier tool, the tool
+# calls the LLM, and the agent writes its final answer
+SUPERVISOR_LLM_CALLS = 3
+ROUTER_CONFIDENCE_THRESHOLD = float(os.getenv("ROUTER_CONFIDENCE_THRESHOLD", "0.5"))
+ROUTE_CACHE_SIZE = int(os.getenv("ROUTE_CACHE_SIZE", "1024"))
+
+# Cue words of each route, matched against the normalized query
+ROUTE_KEYWORDS = {
+    "knowledge_agent": {
+        "what", "which", "define", "definition", "meaning", "specification", "specifications",
+        "spec", "specs", "datasheet", "manual", "documentation", "document", "list", "rating",
+        "rated", "standard", "version", "model", "dimensions", "weight", "capacity", "voltage",
+        "where", "when", "who",
+    },
+    "expert_agent": {
+        "why", "should", "recommend", "recommendation", "recommendations", "suggest", "best",
+        "better", "compare", "comparison", "versus", "troubleshoot", "troubleshooting",
+        "diagnose", "fix", "failing", "failure", "fault", "error", "improve", "optimize",
+        "optimise", "reduce", "choose", "decide", "plan", "strategy", "impact", "risk", "can",
+    },
+}
+
+
+@dataclass
+class RoutingDecision:
+    """How a query was routed and what it cost."""
+
+    route: str
+    source: str  # "cache", "keywords" or "llm"
+    confidence: float
+    llm_calls: int
+
+    @property
+    def llm_calls_saved(self) -> int:
+        return SUPERVISOR_LLM_CALLS - self.llm_calls
+
+
+class QueryRouter:
+    """Routes queries with keyword scores, an LLM fallback and a normalized-query cache."""
+
+    def __init__(
+        self,
+        threshold: float = ROUTER_CONFIDENCE_THRESHOLD,
+        cache_size: int = ROUTE_CACHE_SIZE,
+    ):
+        self.threshold = threshold
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._classifier = QueryClassifierTool()
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Cache key of a query: lowercased, punctuation and whitespace collapsed.
+
+        Stopwords and word order are kept, since cue words such as "why" and "when" are
+        stopwords and decide the route.
+        """
+        return " ".join(re.sub(r"[^a-z0-9\s]", " ", query.lower()).split())
+
+    def score(self, query: str) -> tuple:
+        """Returns the best route by keyword hits and its confidence between 0 and 1."""
+        words = set(self.normalize(query).split())
+        hits = {route: len(words & keywords) for route, keywords in ROUTE_KEYWORDS.items()}
+        route = max(hits, key=hits.get)
+        total = sum(hits.values())
+        if not total:
+            return route, 0.0
+        # Margin of the winning route, damped for a single cue word
+        margin = (2 * hits[route] - total) / total
+        return route, margin * min(1.0, hits[route] / 2)
+
+    def route(self, query: str) -> RoutingDecision:
+        key = self.normalize(query)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return RoutingDecision(cached, "cache", 1.0, 0)
+
+        route, confidence = self.score(query)
+        if confidence >= self.threshold:
+            decision = RoutingDecision(route, "keywords", confidence, 0)
+        else:
+            decision = RoutingDecision(self._classifier._run(query), "llm", confidence, 1)
 
-supervisor_agent = Agent(
-    role="Supervisor",
-    goal="Classify incoming user queries and delegate tasks to appropriate agents",
-    llm=llm,
-    tools=[QueryClassifierTool()],
-)
-
-knowledge_agent = Agent(
-    role="Knowledge Agent",
-    goal="Answer factual and documentation-based queries using RAG",
-    llm=llm,
-    tools=[QueryCleanerTool(), VectorSearchTool()],
-)
-
-expert_agent = Agent(
-    role="Expert Agent",
-    goal="Provide reasoning-based or context-aware responses using domain knowledge",
-    llm=llm,
-    tools=[VectorSearchTool()],
-)
+        with self._lock:
+            self._cache[key] = decision.route
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return decision
 
 
 # --- Multi-Agent System Orchestration ---
 # The system coordinates classification, routing, and generation.
 
+@dataclass
+class RAGAnswer:
+    text: str
+    routing: RoutingDecision
+
+
 class MultiAgentRAGSystem:
-    def process_query(self, user_input: str) -> str:
-        # Step 1: Classify query via the Supervisor agent
-        classifier_task = Task(
-            description=f"Classify the query: '{user_input}'",
-            agent=supervisor_agent,
-            expected_output="knowledge_agent or expert_agent",
+    def __init__(self):
+        self.router = QueryRouter()
+        self.crews = {
+            "knowledge_agent": CrewPool(build_knowledge_crew),
+            "expert_agent": CrewPool(build_expert_crew),
+        }
+
+    def run(self, user_input: str) -> RAGAnswer:
+        # Step 1: Classify query locally, falling back to the LLM classifier
+        decision = self.router.route(user_input)
+        logger.debug(
+            "Routed to %s via %s (confidence %.2f, %d LLM calls saved)",
+            decision.route,
+            decision.source,
+            decision.confidence,
+            decision.llm_calls_saved,
         )
 
-        supervisor_crew = Crew([supervisor_agent], [classifier_task], Process.sequential)
-        classification = str(supervisor_crew.kickoff()).lower()
-
-        # Step 2: Route query to appropriate agent
-        if "knowledge_agent" in classification:
-            task = Task(
-                description=f"""
-                Use query_cleaner → vector_search → synthesize clear answer for:
-                "{user_input}"
-                """,
-                agent=knowledge_agent,
-                expected_output="Concise, structured factual answer",
+        # Step 2: Route query to the prebuilt crew of the agent
+        stream = _request_stream.get()
+        if stream:
+            stream.emit(
+                {
+                    "event": "routed",
+                    "agent": decision.route,
+                    "source": decision.source,
+                    "llm_calls_saved": decision.llm_calls_saved,
+                }
             )
-            return str(Crew([knowledge_agent], [task], Process.sequential).kickoff())
+            stream.forward_tokens = True
+
+        return RAGAnswer(self.crews[decision.route].kickoff(user_input), decision)
+
+    def process_query(self, user_input: str) -> str:
+        return self.run(user_input).text
 
-        else:
-            task = Task(
-                description=f"""
-                Use vector_search to generate a context-aware expert response for:
-                "{user_input}"
-                """,
-                agent=expert_agent,
-                expected_output="Technical or reasoning-based expert response",
-            )
-            return str(Crew([expert_agent], [task], Process.sequential).kickoff())
+
+# Shared across requests so the route cache and prebuilt crews are reused
+rag_system = MultiAgentRAGSystem()
 
 
 # --- Helper function for direct use ---
 def run_rag(query: str):
     """Convenience wrapper for synchronous execution."""
-    return MultiAgentRAGSystem().process_query(query)
+    return rag_system.process_query(query)
 
 
 # --- API Endpoint for Chat Completion ---
@@ -263,25 +648,56 @@ async def chat_completion(request: ChatRequest, authorization: str = Header(None
     if request.stream:
         return StreamingResponse(stream_response(query), media_type="text/event-stream")
     else:
-        return {"response": run_rag(query)}
+        # Run the crew off the event loop so other requests keep being served
+        answer = await asyncio.to_thread(rag_system.run, query)
+        return {
+            "response": answer.text,
+            "routing": {
+                "agent": answer.routing.route,
+                "source": answer.routing.source,
+                "confidence": round(answer.routing.confidence, 2),
+                "llm_calls_saved": answer.routing.llm_calls_saved,
+            },
+        }
 
 
 # --- Streaming Implementation ---
-# This streams the model output to the client incrementally (chunked by words).
+# The crew runs in a worker thread; its tokens and step events are forwarded to the client
+# as they are produced, so the first bytes arrive while the answer is still being generated.
+_STREAM_END = object()
+
+
+def _sse(payload: Dict[str, Any]) -> str:
+    return f"data: {json.dumps(payload)}\n\n"
+
+
 async def stream_response(query: str):
-    """Streams RAG output as Server-Sent Events."""
-    result_text = run_rag(query)
-    words = result_text.split()
-    chunk = []
-
-    for i, word in enumerate(words, 1):
-        chunk.append(word)
-        if len(chunk) >= 25 or i == len(words):
-            payload = {"chunk": " ".join(chunk)}
-            yield f"data: {json.dumps(payload)}\n\n"
-            chunk = []
-            await asyncio.sleep(0.05)
-    yield "data: [DONE]\n\n"
+    """Streams RAG tokens and progress events as Server-Sent Events."""
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    stream = RequestStream(lambda payload: loop.call_soon_threadsafe(events.put_nowait, payload))
+
+    def run() -> None:
+        _request_stream.set(stream)
+        try:
+            result = run_rag(query)
+            # Fall back to the final answer if the LLM did not stream any tokens
+            if not stream.streamed_tokens:
+                stream.emit({"chunk": result})
+        except Exception as e:
+            stream.emit({"error": str(e)})
+        finally:
+            loop.call_soon_threadsafe(events.put_nowait, _STREAM_END)
+
+    # to_thread runs `run` in a copy of the current context, so the sink stays request-local
+    job = asyncio.ensure_future(asyncio.to_thread(run))
+    try:
+        while (payload := await events.get()) is not _STREAM_END:
+            yield _sse(payload)
+        yield "data: [DONE]\n\n"
+    finally:
+        # The client may disconnect early, the crew cannot be interrupted but stops reporting
+        stream.closed = True
 
 
 # --- Health Check Endpoint ---
@@ -0,0 +1,77 @@
+"""
+Checks that the SSE stream of a query carries the agent's final answer only.
+
+The crew is replaced by a fake one that replays a ReAct conversation through the CrewAI
+event bus as LLM token chunks, the way a streaming LLM does. Run with `pytest test_streaming.py`.
+"""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+# The Elasticsearch client is created on import but never contacted by these tests
+os.environ.setdefault("elasticsearch_url", "http://localhost:9200")
+os.environ.setdefault("username", "elastic")
+os.environ.setdefault("password", "changeme")
+
+from crewai.agents.parser import parse
+from crewai.events import crewai_event_bus, LLMCallStartedEvent, LLMStreamChunkEvent
+
+import app
+
+QUERY = "What is the voltage rating of the AC motor?"
+
+# LLM turns of one answer: a tool call, then the final answer
+TURNS = [
+    "Thought: I should look this up in the manuals.\n"
+    "Action: vector_search\n"
+    'Action Input: {"query": "AC motor voltage rating"}',
+    "Thought: I now know the final answer\n"
+    "Final Answer: The AC motor is rated for 400 V.\n\n"
+    "It runs at 50 Hz.  \n",
+]
+
+
+class FakeStreamingCrew:
+    """Streams each LLM turn in small chunks and answers like the CrewAI ReAct parser."""
+
+    agents = []
+
+    def __init__(self, chunk_size: int):
+        self.chunk_size = chunk_size
+
+    def kickoff(self, inputs):
+        for turn in TURNS:
+            crewai_event_bus.emit(self, LLMCallStartedEvent(messages=inputs["query"]))
+            for start in range(0, len(turn), self.chunk_size):
+                chunk = turn[start : start + self.chunk_size]
+                crewai_event_bus.emit(self, LLMStreamChunkEvent(chunk=chunk))
+        return parse(TURNS[-1]).output
+
+
+def streamed_events(query):
+    async def collect():
+        return [chunk async for chunk in app.stream_response(query)]
+
+    events = []
+    for line in asyncio.run(collect()):
+        data = line.removeprefix("data: ").strip()
+        if data != "[DONE]":
+            events.append(json.loads(data))
+    return events
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64])
+def test_stream_carries_the_final_answer_only(monkeypatch, chunk_size):
+    for route in app.rag_system.crews:
+        pool = app.CrewPool(lambda: FakeStreamingCrew(chunk_size))
+        monkeypatch.setitem(app.rag_system.crews, route, pool)
+
+    events = streamed_events(QUERY)
+    chunks = [event["chunk"] for event in events if "chunk" in event]
+
+    assert chunks
+    assert "".join(chunks) == app.run_rag(QUERY)
+    assert not any("error" in event for event in events)
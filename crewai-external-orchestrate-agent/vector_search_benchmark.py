@@ -0,0 +1,133 @@
+"""
+Retrieval benchmark for VectorSearchTool
+----------------------------------------
+Replays RAG traffic against an in-memory Elasticsearch stand-in with a fixed per-request
+latency and compares:
+
+- blocking: the former tool, one synchronous kNN request per tool call
+- retriever: the async retriever with the cleaned-query cache (kNN and hybrid)
+
+Each simulated request calls the tool twice with the same question, as the knowledge agent
+does (once cleaned, once raw), and a share of the questions repeat across users.
+
+Usage:
+    python vector_search_benchmark.py --requests 200 --concurrency 16 --latency-ms 40
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+os.environ.setdefault("elasticsearch_url", "http://localhost:9200")
+
+import app  # noqa: E402
+
+TOPICS = ["motor", "pump", "breaker", "inverter", "transformer", "compressor", "valve", "sensor"]
+QUESTIONS = [
+    "What is the voltage rating of the {} ?",
+    "How do I troubleshoot a failing {} ?",
+    "Which maintenance schedule applies to the {} ?",
+    "What are the safety instructions for the {} ?",
+]
+
+
+class FakeAsyncElasticsearch:
+    """Scores documents by term overlap and answers after a fixed delay."""
+
+    def __init__(self, docs: List[Dict[str, Any]], latency: float):
+        self.docs = docs
+        self.latency = latency
+        self.requests = 0
+
+    def _rank(self, text: str, size: int) -> Dict[str, Any]:
+        terms = set(text.lower().split())
+        scored = sorted(
+            self.docs, key=lambda d: len(terms & set(d["text_field"].split())), reverse=True
+        )
+        return {"hits": {"hits": [{"_id": d["id"], "_source": d} for d in scored[:size]]}}
+
+    async def search(self, index: str, size: int = 10, knn=None, query=None, **kwargs):
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        text = knn["query_vector_builder"]["text_embedding"]["model_text"] if knn else (
+            query["match"]["text_field"]
+        )
+        return self._rank(text, size)
+
+
+def make_traffic(requests: int, repeat_share: float, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    popular = [q.format(t) for q in QUESTIONS for t in TOPICS[:3]]
+    return [
+        rng.choice(popular)
+        if rng.random() < repeat_share
+        else f"{rng.choice(QUESTIONS).format(rng.choice(TOPICS))} unit {rng.randint(1, 10**6)}"
+        for _ in range(requests)
+    ]
+
+
+def run(tool_call, traffic: List[str], concurrency: int) -> float:
+    cleaner = app.QueryCleanerTool()
+
+    def handle(question: str) -> None:
+        tool_call(cleaner._run(question))
+        tool_call(question)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(handle, traffic))
+    return time.perf_counter() - start
+
+
+def report(name: str, es_requests: int, elapsed: float, requests: int) -> None:
+    print(f"{name:<18} {es_requests:>12} {elapsed:>8.2f} {2 * requests / elapsed:>13.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="VectorSearchTool retrieval benchmark")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=40)
+    parser.add_argument("--repeat-share", type=float, default=0.5)
+    parser.add_argument("--docs", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    docs = [
+        {
+            "id": str(i),
+            "text_field": f"{rng.choice(TOPICS)} {rng.choice(TOPICS)} manual section {i}",
+            "metadata": {"url": f"https://example.com/docs/{i}"},
+        }
+        for i in range(args.docs)
+    ]
+    traffic = make_traffic(args.requests, args.repeat_share)
+    latency = args.latency_ms / 1000
+
+    print(f"{'variant':<18} {'ES requests':>12} {'wall s':>8} {'tool calls/s':>13}")
+
+    # The former tool blocked its thread on every request
+    blocking = FakeAsyncElasticsearch(docs, latency)
+
+    def blocking_call(query: str) -> str:
+        time.sleep(latency)
+        blocking.requests += 1
+        return str(blocking._rank(query, app.SEARCH_K))
+
+    elapsed = run(blocking_call, traffic, args.concurrency)
+    report("blocking", blocking.requests, elapsed, len(traffic))
+
+    for hybrid in (False, True):
+        fake = FakeAsyncElasticsearch(docs, latency)
+        app.retriever = app.VectorSearchRetriever(fake, hybrid=hybrid)
+        name = "retriever hybrid" if hybrid else "retriever knn"
+        elapsed = run(app.VectorSearchTool()._run, traffic, args.concurrency)
+        report(name, fake.requests, elapsed, len(traffic))
+
+
+if __name__ == "__main__":
+    main()
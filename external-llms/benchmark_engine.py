@@ -0,0 +1,182 @@
+"""
+Throughput and latency of the batching engine on CPU.
+
+Sends concurrent chat prompts straight to `BatchingEngine` (no HTTP) and
+compares one-at-a-time generation (max batch size 1, as the server used to
+run) with dynamic batching. It then replays multi-turn agent conversations,
+which resend a long system prompt and the history every turn, with and
+without the prefix cache, reporting time-to-first-token and the prompt
+tokens that did not have to be prefilled. Finally, it runs many such
+conversations concurrently with batching enabled, with and without the
+prefix cache, to check that sharing a system prompt does not stop requests
+from being batched. Use a tiny checkpoint to keep runs short:
+
+    python benchmark_engine.py --model sshleifer/tiny-gpt2 --requests 64 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import torch
+from transformers import AutoModelForCausalLM, AutoTokenizer
+
+from engine import BatchingEngine
+
+QUESTIONS = [
+    "What is the capital of France?",
+    "Summarize the benefits of unit testing in two sentences.",
+    "Write a haiku about the ocean.",
+    "Explain what a hash map is.",
+    "List three prime numbers.",
+    "How do I reverse a list in Python?",
+]
+
+
+def make_prompts(requests: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        f"System: You are a helpful assistant.\nUser: {rng.choice(QUESTIONS)}\nAssistant:"
+        for _ in range(requests)
+    ]
+
+
+async def run(engine: BatchingEngine, prompts: list[str], concurrency: int, max_tokens: int):
+    limit = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    tokens = 0
+
+    async def one(prompt: str) -> None:
+        nonlocal tokens
+        async with limit:
+            start = time.perf_counter()
+            result = await engine.generate(prompt, max_tokens, temperature=0.3, top_p=0.95)
+            latencies.append(time.perf_counter() - start)
+            tokens += result.completion_tokens
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(p) for p in prompts))
+    return time.perf_counter() - start, tokens, sorted(latencies)
+
+
+SYSTEM_PROMPT = (
+    "System: You are an operations agent. Follow the runbook, cite the tools you used, "
+    "answer in short sentences and never invent order numbers. "
+) * 8
+
+
+async def converse(
+    engine: BatchingEngine, turns: int, max_tokens: int, offset: int = 0
+) -> list[float]:
+    """Plays one conversation turn by turn, returning the time to first token of each turn."""
+    history = SYSTEM_PROMPT
+    ttfts = []
+    for turn in range(turns):
+        history += f"\nUser: {QUESTIONS[(turn + offset) % len(QUESTIONS)]}\nAssistant:"
+        stream = engine.stream(history, max_tokens, temperature=0.3, top_p=0.95)
+        reply = "".join([text async for text in stream])
+        ttfts.append(stream.result.ttft_seconds)
+        history += f" {reply}"
+    return ttfts
+
+
+def run_conversations(model, tokenizer, args) -> None:
+    print(
+        f"\n{'prefix cache':<12} {'avg ttft s':>11} {'later turns ttft s':>19} "
+        f"{'tokens saved':>13}"
+    )
+    for name, cache_bytes in (("off", 0), ("on", 256 * 1024 * 1024)):
+        engine = BatchingEngine(
+            model, tokenizer, max_batch_size=1, prefix_cache_bytes=cache_bytes
+        )
+        ttfts = []
+        for _ in range(args.conversations):
+            ttfts.extend(asyncio.run(converse(engine, args.turns, args.max_tokens)))
+        later = [t for i, t in enumerate(ttfts) if i % args.turns]
+        saved = engine.stats().get("prefix_cache", {}).get("tokens_saved", 0)
+        engine.shutdown()
+        print(
+            f"{name:<12} {statistics.mean(ttfts):>11.3f} {statistics.mean(later):>19.3f} "
+            f"{saved:>13}"
+        )
+
+
+def run_concurrent_conversations(model, tokenizer, args) -> None:
+    print(
+        f"\n{'concurrent':<12} {'wall s':>8} {'req/s':>8} {'avg batch':>10} "
+        f"{'avg ttft s':>11} {'tokens saved':>13}"
+    )
+    for name, cache_bytes in (("batched", 0), ("+ prefix", 256 * 1024 * 1024)):
+        engine = BatchingEngine(
+            model,
+            tokenizer,
+            max_batch_size=args.max_batch_size,
+            max_wait_ms=args.wait_ms,
+            prefix_cache_bytes=cache_bytes,
+        )
+
+        async def all_conversations():
+            return await asyncio.gather(
+                *(
+                    converse(engine, args.turns, args.max_tokens, offset=i)
+                    for i in range(args.concurrency)
+                )
+            )
+
+        start = time.perf_counter()
+        ttfts = [t for conversation in asyncio.run(all_conversations()) for t in conversation]
+        elapsed = time.perf_counter() - start
+        stats = engine.stats()
+        engine.shutdown()
+        saved = stats.get("prefix_cache", {}).get("tokens_saved", 0)
+        print(
+            f"{name:<12} {elapsed:>8.2f} {len(ttfts) / elapsed:>8.1f} "
+            f"{stats['avg_batch_size']:>10.1f} {statistics.mean(ttfts):>11.3f} {saved:>13}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batching engine benchmark")
+    parser.add_argument("--model", required=True, help="model name or path, a tiny one on CPU")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--max-tokens", type=int, default=32)
+    parser.add_argument("--max-batch-size", type=int, default=8)
+    parser.add_argument("--wait-ms", type=float, default=10)
+    parser.add_argument("--conversations", type=int, default=4)
+    parser.add_argument("--turns", type=int, default=6)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+    model = AutoModelForCausalLM.from_pretrained(args.model, torch_dtype=torch.float32)
+    model.eval()
+    prompts = make_prompts(args.requests)
+
+    print(
+        f"{'variant':<12} {'wall s':>8} {'req/s':>8} {'tok/s':>8} "
+        f"{'p50 s':>8} {'p95 s':>8} {'avg batch':>10}"
+    )
+    for name, batch_size in (("sequential", 1), ("batched", args.max_batch_size)):
+        engine = BatchingEngine(
+            model, tokenizer, max_batch_size=batch_size, max_wait_ms=args.wait_ms
+        )
+        elapsed, tokens, latencies = asyncio.run(
+            run(engine, prompts, args.concurrency, args.max_tokens)
+        )
+        stats = engine.stats()
+        engine.shutdown()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(
+            f"{name:<12} {elapsed:>8.2f} {len(prompts) / elapsed:>8.1f} {tokens / elapsed:>8.1f} "
+            f"{statistics.median(latencies):>8.3f} {p95:>8.3f} {stats['avg_batch_size']:>10.1f}"
+        )
+
+    run_conversations(model, tokenizer, args)
+    run_concurrent_conversations(model, tokenizer, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,517 @@
+"""
+Batching inference engine for the Granite OpenAI-compatible server.
+
+Requests are queued from the event loop and served by one worker thread that
+owns the model. The worker waits up to `max_wait_ms` after the oldest pending
+request for others to arrive, then runs them as one left-padded `generate`
+call. A batch only mixes requests with the same sampling parameters and
+similar prompt lengths, so short prompts do not pay for padding up to a long
+one; requests left out are served by the next batch.
+
+Tokens are handed to each request as they are generated, for streaming and
+time-to-first-token accounting. Requests generated on their own reuse the
+past-key-values of earlier conversations sharing a prefix with their prompt
+(see `PrefixCache`), so a follow-up turn only prefills its new messages. Only
+a prompt continuing a whole cached conversation is kept out of batches for
+that; prompts merely sharing a system prompt with cached ones are batched.
+"""
+
+import asyncio
+import copy
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable
+
+import torch
+from transformers.generation.streamers import BaseStreamer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GenerationResult:
+    text: str
+    prompt_tokens: int
+    completion_tokens: int
+    finish_reason: str
+    queue_seconds: float
+    batch_size: int
+    ttft_seconds: float | None = None
+    cached_prompt_tokens: int = 0
+
+
+@dataclass
+class _Request:
+    input_ids: list[int]
+    max_new_tokens: int
+    temperature: float
+    top_p: float
+    future: Future
+    on_text: Callable[[str], None] | None = None
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    first_token_at: float | None = None
+
+    @property
+    def sampling_key(self) -> tuple[float, float]:
+        return (self.temperature, self.top_p)
+
+
+def _common_prefix_length(a: list[int], b: list[int]) -> int:
+    n = min(len(a), len(b))
+    for i in range(n):
+        if a[i] != b[i]:
+            return i
+    return n
+
+
+# Per-layer tensor lists of caches predating `cache.layers`, and of hybrid Mamba/attention caches
+_CACHE_TENSOR_LISTS = ("key_cache", "value_cache", "conv_states", "ssm_states")
+
+
+def _cache_nbytes(cache) -> int | None:
+    """
+    Approximate memory held by a cache, summed over its tensors.
+
+    Returns None when no tensor could be found, so the size cannot be trusted.
+    """
+    tensors = []
+    for layer in getattr(cache, "layers", None) or []:
+        tensors.extend(v for v in vars(layer).values() if isinstance(v, torch.Tensor))
+    for name in _CACHE_TENSOR_LISTS:
+        try:
+            values = getattr(cache, name, None)
+        except Exception:  # deprecated accessors of some versions raise
+            values = None
+        if isinstance(values, torch.Tensor):
+            values = [values]
+        tensors.extend(v for v in values or [] if isinstance(v, torch.Tensor))
+    # The legacy accessors may return the tensors of `layers` again
+    seen = {}
+    for tensor in tensors:
+        if tensor.numel():
+            seen[(tensor.data_ptr(), tensor.numel())] = tensor.numel() * tensor.element_size()
+    return sum(seen.values()) if seen else None
+
+
+class PrefixCache:
+    """
+    LRU of past-key-values keyed by the tokens they cover, capped by memory.
+
+    Entries are stored after a generation, covering its prompt and
+    completion, which is what the next turn of the same conversation resends.
+    A lookup returns a copy of the entry sharing the longest token prefix with
+    a prompt, cropped to that prefix when the cache type supports it. Caches
+    whose size cannot be measured are not stored, so the memory cap holds.
+    """
+
+    def __init__(
+        self, max_bytes: int, min_prefix_tokens: int = 16, continuation_slack_tokens: int = 4
+    ):
+        self.max_bytes = max_bytes
+        self.min_prefix_tokens = min_prefix_tokens
+        # Re-encoding a completion as part of the next prompt may change its last tokens
+        self.continuation_slack_tokens = continuation_slack_tokens
+        self._entries: OrderedDict[tuple[int, ...], tuple[object, int]] = OrderedDict()
+        self._bytes = 0
+        self.stats = {
+            "hits": 0, "misses": 0, "tokens_saved": 0, "evictions": 0, "unmeasured": 0
+        }
+
+    def _best_match(self, input_ids: list[int]) -> tuple[tuple[int, ...] | None, int]:
+        best_key, best_length = None, 0
+        # At least one prompt token has to be run through the model to sample from
+        limit = len(input_ids) - 1
+        for key, (cache, _) in self._entries.items():
+            length = min(_common_prefix_length(list(key), input_ids), limit)
+            if length < len(key) and not getattr(cache, "is_croppable", hasattr(cache, "crop")):
+                continue
+            if length > best_length:
+                best_key, best_length = key, length
+        if best_length < self.min_prefix_tokens:
+            return None, 0
+        return best_key, best_length
+
+    def match_length(self, input_ids: list[int]) -> int:
+        return self._best_match(input_ids)[1]
+
+    def continuation_length(self, input_ids: list[int]) -> int:
+        """
+        Tokens reused if the prompt continues a stored conversation, that is if
+        it covers a whole stored entry rather than sharing, say, only the system
+        prompt with it; 0 otherwise.
+        """
+        key, length = self._best_match(input_ids)
+        if key is None or length < len(key) - self.continuation_slack_tokens:
+            return 0
+        return length
+
+    def lookup(self, input_ids: list[int]):
+        """Returns a private copy of the best cache for a prompt and the tokens it covers."""
+        key, length = self._best_match(input_ids)
+        if key is None:
+            self.stats["misses"] += 1
+            return None, 0
+        self._entries.move_to_end(key)
+        cache = copy.deepcopy(self._entries[key][0])
+        if length < len(key):
+            cache.crop(-(len(key) - length))
+        self.stats["hits"] += 1
+        self.stats["tokens_saved"] += length
+        return cache, length
+
+    def store(self, tokens: list[int], cache) -> None:
+        key = tuple(tokens)
+        nbytes = _cache_nbytes(cache)
+        if nbytes is None:
+            self.stats["unmeasured"] += 1
+            return
+        if len(key) < self.min_prefix_tokens or nbytes > self.max_bytes:
+            return
+        # Entries covering a prefix of the new one are superseded by it
+        for other in [k for k in self._entries if k == key[: len(k)]]:
+            self._bytes -= self._entries.pop(other)[1]
+        self._entries[key] = (cache, nbytes)
+        self._bytes += nbytes
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+            self.stats["evictions"] += 1
+
+    def summary(self) -> dict:
+        return {**self.stats, "entries": len(self._entries), "bytes": self._bytes}
+
+
+class _IncrementalDecoder:
+    """Turns the tokens of one request into text deltas, holding back incomplete characters."""
+
+    def __init__(self, tokenizer, request: _Request, eos_token_id: int | None):
+        self.tokenizer = tokenizer
+        self.request = request
+        self.eos_token_id = eos_token_id
+        self.tokens: list[int] = []
+        self.sent = ""
+        self.done = False
+
+    def put(self, token: int) -> None:
+        if self.done:
+            return
+        if self.request.first_token_at is None:
+            self.request.first_token_at = time.perf_counter()
+        if token == self.eos_token_id:
+            self.done = True
+            return
+        self.tokens.append(token)
+        if len(self.tokens) >= self.request.max_new_tokens:
+            self.done = True
+        if self.request.on_text is None:
+            return
+        text = self.tokenizer.decode(self.tokens, skip_special_tokens=True).lstrip()
+        if text.endswith("�") and not self.done:
+            return
+        if len(text) > len(self.sent):
+            self.request.on_text(text[len(self.sent) :])
+            self.sent = text
+
+
+class _BatchStreamer(BaseStreamer):
+    """Receives each generation step of a batch and fans the tokens out per request."""
+
+    def __init__(self, decoders: list[_IncrementalDecoder]):
+        self.decoders = decoders
+        self.prompt_seen = False
+
+    def put(self, value: torch.Tensor) -> None:
+        # The first call carries the prompt
+        if not self.prompt_seen:
+            self.prompt_seen = True
+            return
+        tokens = value.reshape(len(self.decoders), -1)[:, -1].tolist()
+        for decoder, token in zip(self.decoders, tokens):
+            decoder.put(token)
+
+    def end(self) -> None:
+        pass
+
+
+class TokenStream:
+    """Text deltas of a streamed request, with its `GenerationResult` once exhausted."""
+
+    def __init__(self, deltas: asyncio.Queue, future: Future):
+        self._deltas = deltas
+        self._future = future
+        self.result: GenerationResult | None = None
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        waiter = asyncio.ensure_future(asyncio.wrap_future(self._future))
+        try:
+            while True:
+                getter = asyncio.ensure_future(self._deltas.get())
+                done, _ = await asyncio.wait({getter, waiter}, return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    yield getter.result()
+                    continue
+                getter.cancel()
+                break
+            # Deltas queued before the result was set are still delivered
+            while not self._deltas.empty():
+                yield self._deltas.get_nowait()
+            self.result = waiter.result()
+        finally:
+            waiter.cancel()
+
+
+class BatchingEngine:
+    def __init__(
+        self,
+        model,
+        tokenizer,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        max_padding_ratio: float = 0.3,
+        prefix_cache_bytes: int = 0,
+        solo_prefix_tokens: int = 64,
+    ):
+        """
+        Args:
+            model: causal LM, used by the worker thread only
+            tokenizer: tokenizer of the model
+            max_batch_size: maximum number of requests generated together
+            max_wait_ms: how long the oldest request waits for others to batch with
+            max_padding_ratio: maximum share of padding tokens in a batch
+            prefix_cache_bytes: memory for reusable past-key-values, 0 disables the prefix cache
+            solo_prefix_tokens: cached tokens a conversation continuation must reuse to be
+                generated alone instead of batched
+        """
+        self.model = model
+        self.tokenizer = tokenizer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_padding_ratio = max_padding_ratio
+        self.pad_token_id = (
+            tokenizer.pad_token_id
+            if tokenizer.pad_token_id is not None
+            else tokenizer.eos_token_id
+        )
+        self.prefix_cache = PrefixCache(prefix_cache_bytes) if prefix_cache_bytes > 0 else None
+        self.solo_prefix_tokens = solo_prefix_tokens
+        self._queue: queue.Queue[_Request | None] = queue.Queue()
+        self._pending: list[_Request] = []
+        self._stats = {
+            "requests": 0,
+            "batches": 0,
+            "completion_tokens": 0,
+            "padding_tokens": 0,
+            "ttft_seconds_total": 0.0,
+        }
+        self._worker = threading.Thread(target=self._run, name="generation-worker", daemon=True)
+        self._worker.start()
+
+    def _submit(
+        self,
+        prompt: str,
+        max_new_tokens: int,
+        temperature: float,
+        top_p: float,
+        on_text: Callable[[str], None] | None = None,
+    ) -> Future:
+        request = _Request(
+            input_ids=self.tokenizer(prompt).input_ids,
+            max_new_tokens=max_new_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            future=Future(),
+            on_text=on_text,
+        )
+        self._queue.put(request)
+        return request.future
+
+    async def generate(
+        self, prompt: str, max_new_tokens: int, temperature: float, top_p: float
+    ) -> GenerationResult:
+        """Queues a prompt and waits for its completion without blocking the event loop."""
+        future = self._submit(prompt, max_new_tokens, temperature, top_p)
+        return await asyncio.wrap_future(future)
+
+    def stream(
+        self, prompt: str, max_new_tokens: int, temperature: float, top_p: float
+    ) -> TokenStream:
+        """Queues a prompt and returns its text deltas as they are generated."""
+        loop = asyncio.get_running_loop()
+        deltas: asyncio.Queue = asyncio.Queue()
+        future = self._submit(
+            prompt,
+            max_new_tokens,
+            temperature,
+            top_p,
+            on_text=lambda text: loop.call_soon_threadsafe(deltas.put_nowait, text),
+        )
+        return TokenStream(deltas, future)
+
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        requests = stats["requests"]
+        stats["avg_batch_size"] = requests / stats["batches"] if stats["batches"] else 0.0
+        stats["avg_ttft_seconds"] = stats.pop("ttft_seconds_total") / requests if requests else 0.0
+        stats["queued"] = self._queue.qsize() + len(self._pending)
+        if self.prefix_cache is not None:
+            stats["prefix_cache"] = self.prefix_cache.summary()
+        return stats
+
+    def shutdown(self) -> None:
+        self._queue.put(None)
+        self._worker.join()
+
+    # --- worker thread ---
+
+    def _collect(self) -> bool:
+        """Moves queued requests to pending, waiting for the batch window to fill."""
+        if not self._pending:
+            request = self._queue.get()
+            if request is None:
+                return False
+            self._pending.append(request)
+        deadline = self._pending[0].enqueued_at + self.max_wait
+        while len(self._pending) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            try:
+                request = (
+                    self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if request is None:
+                return False
+            self._pending.append(request)
+        return True
+
+    def _runs_solo(self, request: _Request) -> bool:
+        """
+        Whether a request continues a cached conversation by enough tokens to be
+        worth generating alone. Prompts that merely share a system prompt with
+        cached ones are batched.
+        """
+        if self.prefix_cache is None:
+            return False
+        return self.prefix_cache.continuation_length(request.input_ids) >= max(
+            self.solo_prefix_tokens, 1
+        )
+
+    def _select_batch(self) -> list[_Request]:
+        """Picks the oldest request and the compatible ones closest to it in prompt length."""
+        oldest = self._pending[0]
+        batch = [oldest]
+        # A request continuing a cached conversation runs alone to reuse its past-key-values
+        if not self._runs_solo(oldest):
+            candidates = sorted(
+                (
+                    r
+                    for r in self._pending[1:]
+                    if r.sampling_key == oldest.sampling_key and not self._runs_solo(r)
+                ),
+                key=lambda r: abs(len(r.input_ids) - len(oldest.input_ids)),
+            )
+            for request in candidates:
+                if len(batch) >= self.max_batch_size:
+                    break
+                lengths = [len(r.input_ids) for r in batch] + [len(request.input_ids)]
+                padding = max(lengths) * len(lengths) - sum(lengths)
+                if padding / (max(lengths) * len(lengths)) <= self.max_padding_ratio:
+                    batch.append(request)
+        chosen = {id(r) for r in batch}
+        self._pending = [r for r in self._pending if id(r) not in chosen]
+        return batch
+
+    def _run(self) -> None:
+        while self._collect():
+            batch = self._select_batch()
+            try:
+                results = self._generate(batch)
+            except Exception as e:  # surface to every caller of the batch
+                logger.exception("Generation failed")
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            for request, result in zip(batch, results):
+                request.future.set_result(result)
+
+    @torch.inference_mode()
+    def _generate(self, batch: list[_Request]) -> list[GenerationResult]:
+        started = time.perf_counter()
+        width = max(len(r.input_ids) for r in batch)
+        # Left padding keeps the last prompt token of every row at the same position
+        input_ids = torch.full((len(batch), width), self.pad_token_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(batch), width), dtype=torch.long)
+        for row, request in enumerate(batch):
+            input_ids[row, width - len(request.input_ids) :] = torch.tensor(request.input_ids)
+            attention_mask[row, width - len(request.input_ids) :] = 1
+
+        decoders = [
+            _IncrementalDecoder(self.tokenizer, r, self.tokenizer.eos_token_id) for r in batch
+        ]
+        first = batch[0]
+        kwargs = {}
+        cached_tokens = 0
+        # Past-key-values are only reused and kept for unpadded, single-request runs
+        use_prefix_cache = self.prefix_cache is not None and len(batch) == 1
+        if use_prefix_cache:
+            cache, cached_tokens = self.prefix_cache.lookup(first.input_ids)
+            if cache is not None:
+                kwargs["past_key_values"] = cache
+            kwargs["return_dict_in_generate"] = True
+
+        outputs = self.model.generate(
+            input_ids=input_ids.to(self.model.device),
+            attention_mask=attention_mask.to(self.model.device),
+            max_new_tokens=max(r.max_new_tokens for r in batch),
+            do_sample=True,
+            temperature=first.temperature,
+            top_p=first.top_p,
+            pad_token_id=self.pad_token_id,
+            streamer=_BatchStreamer(decoders),
+            **kwargs,
+        )
+        sequences = outputs
+        if use_prefix_cache:
+            sequences = outputs.sequences
+            cache = outputs.past_key_values
+            if cache is not None:
+                # The cache covers every token but the last sampled one
+                covered = cache.get_seq_length()
+                self.prefix_cache.store(sequences[0, :covered].tolist(), cache)
+
+        results = []
+        for row, request in enumerate(batch):
+            tokens = sequences[row, width:].tolist()[: request.max_new_tokens]
+            finish_reason = "length"
+            if self.tokenizer.eos_token_id in tokens:
+                tokens = tokens[: tokens.index(self.tokenizer.eos_token_id)]
+                finish_reason = "stop"
+            ttft = (
+                request.first_token_at - request.enqueued_at
+                if request.first_token_at is not None
+                else None
+            )
+            results.append(
+                GenerationResult(
+                    text=self.tokenizer.decode(tokens, skip_special_tokens=True).strip(),
+                    prompt_tokens=len(request.input_ids),
+                    completion_tokens=len(tokens),
+                    finish_reason=finish_reason,
+                    queue_seconds=started - request.enqueued_at,
+                    batch_size=len(batch),
+                    ttft_seconds=ttft,
+                    cached_prompt_tokens=cached_tokens,
+                )
+            )
+
+        self._stats["requests"] += len(batch)
+        self._stats["batches"] += 1
+        self._stats["completion_tokens"] += sum(r.completion_tokens for r in results)
+        self._stats["padding_tokens"] += int((attention_mask == 0).sum())
+        self._stats["ttft_seconds_total"] += sum(r.ttft_seconds or 0.0 for r in results)
+        return results
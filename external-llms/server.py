@@ -1,10 +1,15 @@
+import json
 import os
+import time
 
 import torch
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from transformers import AutoModelForCausalLM, AutoTokenizer
 
+from engine import BatchingEngine
+
 MODEL_NAME = os.getenv("MODEL_NAME", "ibm-granite/granite-4.0-h-1b")
 AUTH_TOKEN = os.getenv("AUTH_TOKEN")  # simple bearer
 
@@ -17,6 +22,16 @@ model = AutoModelForCausalLM.from_pretrained(
     device_map="auto",
 )
 
+# Concurrent requests are generated together by one worker thread
+engine = BatchingEngine(
+    model,
+    tokenizer,
+    max_batch_size=int(os.getenv("MAX_BATCH_SIZE", "8")),
+    max_wait_ms=float(os.getenv("BATCH_WAIT_MS", "10")),
+    # Past-key-values of recent conversations, so follow-up turns only prefill new messages
+    prefix_cache_bytes=int(os.getenv("PREFIX_CACHE_MB", "256")) * 1024 * 1024,
+)
+
 
 class ChatMessage(BaseModel):
     role: str
@@ -55,18 +70,17 @@ async def chat(req: ChatRequest):
     parts.append("Assistant:")
     prompt = "\n".join(parts)
 
-    inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
-    outputs = model.generate(
-        **inputs,
-        max_new_tokens=req.max_tokens or 256,
-        do_sample=True,
-        temperature=req.temperature or 0.3,
-        top_p=req.top_p or 0.95,
-        pad_token_id=tokenizer.eos_token_id,
-    )
-    text = tokenizer.decode(outputs[0], skip_special_tokens=True)
-    # return only the assistant tail
-    assistant_text = text.split("Assistant:")[-1].strip()
+    sampling = {
+        "max_new_tokens": req.max_tokens or 256,
+        "temperature": req.temperature or 0.3,
+        "top_p": req.top_p or 0.95,
+    }
+    if req.stream:
+        return StreamingResponse(
+            stream_chunks(engine.stream(prompt, **sampling)), media_type="text/event-stream"
+        )
+
+    result = await engine.generate(prompt, **sampling)
 
     return {
         "id": "chatcmpl-granite-nano",
@@ -74,17 +88,39 @@ async def chat(req: ChatRequest):
         "choices": [
             {
                 "index": 0,
-                "message": {"role": "assistant", "content": assistant_text},
-                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": result.text},
+                "finish_reason": result.finish_reason,
             }
         ],
         "usage": {
-            "prompt_tokens": len(inputs.input_ids[0]),
-            "completion_tokens": len(outputs[0]),
+            "prompt_tokens": result.prompt_tokens,
+            "completion_tokens": result.completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": result.cached_prompt_tokens},
         },
     }
 
 
+async def stream_chunks(stream):
+    """Relays generated text as OpenAI `chat.completion.chunk` Server-Sent Events."""
+    created = int(time.time())
+
+    def chunk(delta: dict, finish_reason: str | None = None) -> str:
+        payload = {
+            "id": "chatcmpl-granite-nano",
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": MODEL_NAME,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    yield chunk({"role": "assistant"})
+    async for text in stream:
+        yield chunk({"content": text})
+    yield chunk({}, stream.result.finish_reason)
+    yield "data: [DONE]\n\n"
+
+
 @app.get("/health")
 async def health():
-    return {"status": "ok", "model": MODEL_NAME}
+    return {"status": "ok", "model": MODEL_NAME, "engine": engine.stats()}
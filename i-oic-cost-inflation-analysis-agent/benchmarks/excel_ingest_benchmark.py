@@ -0,0 +1,109 @@
+"""
+Ingest time and peak memory of the Excel RAG row loader.
+
+Replicates the rows of `tools/streaming_cost_inflation.xlsx` to the requested
+size and compares the former loader (`df.iterrows()` building one dict and
+one "k: v" string per row) with the columnar loader of `excel_row_store`
+(column-wise text assembly, Arrow table addressed by row number). Each
+variant runs in its own process so peak RSS is measured separately.
+Embedding is not part of either.
+
+Usage:
+    python benchmarks/excel_ingest_benchmark.py --rows 300000
+    python benchmarks/excel_ingest_benchmark.py --rows 50000 --from-excel
+"""
+
+import argparse
+import hashlib
+import multiprocessing as mp
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+TOOLS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools")
+sys.path.insert(0, TOOLS_DIR)
+
+from excel_row_store import load_excel_table, table_from_frame  # noqa: E402
+
+WORKBOOK = os.path.join(TOOLS_DIR, "streaming_cost_inflation.xlsx")
+
+
+def legacy_rows(df: pd.DataFrame):
+    """The loader used before the columnar path, plus the row hashes it now needs."""
+    docs = []
+    for idx, row in df.iterrows():
+        md = row.to_dict()
+        text = "\n".join(f"{k}: {v}" for k, v in md.items())
+        docs.append({"id": f"row-{idx}", "text": text, "metadata": md})
+    hashes = [hashlib.sha256(d["text"].encode("utf-8")).hexdigest() for d in docs]
+    return docs, hashes
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run(variant: str, source: str, from_excel: bool, out) -> None:
+    if from_excel:
+        start = time.perf_counter()
+        if variant == "columnar":
+            result = load_excel_table(source)
+        else:
+            result = legacy_rows(pd.read_excel(source))
+    else:
+        df = pd.read_pickle(source)
+        baseline = _peak_rss_mb()
+        start = time.perf_counter()
+        result = table_from_frame(df) if variant == "columnar" else legacy_rows(df)
+    elapsed = time.perf_counter() - start
+    peak = _peak_rss_mb()
+    out.put((elapsed, peak, peak - (0 if from_excel else baseline)))
+    del result
+
+
+def measure(variant: str, source: str, from_excel: bool):
+    ctx = mp.get_context("spawn")
+    out = ctx.Queue()
+    proc = ctx.Process(target=_run, args=(variant, source, from_excel, out))
+    proc.start()
+    result = out.get()
+    proc.join()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Excel RAG ingest benchmark")
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument(
+        "--from-excel", action="store_true", help="include reading the workbook (slow to build)"
+    )
+    args = parser.parse_args()
+
+    seed = pd.read_excel(WORKBOOK)
+    df = pd.concat([seed] * (args.rows // len(seed) + 1), ignore_index=True).iloc[: args.rows]
+    # Make rows distinct, as in a real workbook
+    df["comment"] = df["comment"] + " #" + df.index.astype(str)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.from_excel:
+            source = os.path.join(tmp, "rows.xlsx")
+            df.to_excel(source, index=False)
+        else:
+            source = os.path.join(tmp, "rows.pkl")
+            df.to_pickle(source)
+
+        print(f"{len(df)} rows, {'including' if args.from_excel else 'excluding'} workbook parsing")
+        print(f"{'loader':<10} {'seconds':>9} {'peak RSS MB':>12} {'added MB':>10}")
+        for variant in ("iterrows", "columnar"):
+            elapsed, peak, added = measure(variant, source, args.from_excel)
+            print(f"{variant:<10} {elapsed:>9.2f} {peak:>12.1f} {added:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
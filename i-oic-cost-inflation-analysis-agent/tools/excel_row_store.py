@@ -0,0 +1,91 @@
+import hashlib
+from typing import List
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Columns added next to the workbook columns, prefixed so they cannot clash with them
+ID_COLUMN = "_row_id"
+TEXT_COLUMN = "_text"
+HASH_COLUMN = "_row_hash"
+INTERNAL_COLUMNS = (ID_COLUMN, TEXT_COLUMN, HASH_COLUMN)
+
+
+def row_texts(df: pd.DataFrame) -> pd.Series:
+    """Serialise every row as "column: value" lines, assembled column by column."""
+    if df.empty or not len(df.columns):
+        return pd.Series([""] * len(df), index=df.index, dtype=object)
+    parts = [f"{col}: " + df[col].astype(str) for col in df.columns]
+    return parts[0].str.cat(parts[1:], sep="\n") if len(parts) > 1 else parts[0]
+
+
+def row_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _to_arrow(df: pd.DataFrame) -> pa.Table:
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+        # Excel columns mixing types (e.g. numbers and notes) are kept as text
+        mixed = {col: df[col].astype(str) for col in df.columns if df[col].dtype == object}
+        return pa.Table.from_pandas(df.assign(**mixed), preserve_index=False)
+
+
+def load_excel_table(path: str) -> pa.Table:
+    """
+    Read a workbook into an Arrow table holding its columns plus, per row,
+    the serialised text used for embedding and its hash.
+    """
+    return table_from_frame(pd.read_excel(path))
+
+
+def table_from_frame(df: pd.DataFrame) -> pa.Table:
+    """Build the row table of `load_excel_table` from an already loaded frame."""
+    df = df.copy(deep=False)
+    df.columns = [str(col) for col in df.columns]
+    texts = row_texts(df)
+    table = _to_arrow(df)
+    table = table.append_column(ID_COLUMN, pa.array([f"row-{i}" for i in range(len(df))]))
+    table = table.append_column(TEXT_COLUMN, pa.array(texts.tolist(), type=pa.string()))
+    return table.append_column(
+        HASH_COLUMN, pa.array([row_hash(t) for t in texts], type=pa.string())
+    )
+
+
+class RowStore:
+    """
+    Workbook rows kept as one Arrow table, looked up by row number.
+
+    Saved as Parquet and read back memory-mapped, so the metadata of large
+    workbooks is not held as one Python dict per row.
+    """
+
+    def __init__(self, table: pa.Table):
+        self.table = table
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    @property
+    def texts(self) -> List[str]:
+        return self.table.column(TEXT_COLUMN).to_pylist()
+
+    @property
+    def row_hashes(self) -> List[str]:
+        return self.table.column(HASH_COLUMN).to_pylist()
+
+    def text(self, row: int) -> str:
+        return self.table.column(TEXT_COLUMN)[row].as_py()
+
+    def metadata(self, row: int) -> dict:
+        record = self.table.slice(row, 1).to_pylist()[0]
+        return {k: v for k, v in record.items() if k not in INTERNAL_COLUMNS}
+
+    def save(self, path: str):
+        pq.write_table(self.table, path)
+
+    @classmethod
+    def load(cls, path: str) -> "RowStore":
+        return cls(pq.read_table(path, memory_map=True))
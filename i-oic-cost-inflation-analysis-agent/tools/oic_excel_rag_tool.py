@@ -1,9 +1,12 @@
+import hashlib
+import json
 import os
-from typing import List
+import threading
+from typing import Dict, List, Optional
 
-import pandas as pd
 import numpy as np
 import faiss
+import pyarrow as pa
 from pydantic import BaseModel, Field
 
 from ibm_watsonx_ai.foundation_models.schema import TextChatParameters
@@ -11,6 +14,8 @@ from langchain_ibm import ChatWatsonx, WatsonxEmbeddings
 
 from ibm_watsonx_orchestrate.agent_builder.tools import tool, ToolPermission
 
+from excel_row_store import HASH_COLUMN, TEXT_COLUMN, RowStore, load_excel_table
+
 
 # --- CONFIG ---
 WATSONX_APIKEY="WATSONX_APIKEY"
@@ -18,12 +23,18 @@ PROJECT_ID="PROJECT_ID"
 
 BASE_DIR = os.path.dirname(__file__)
 EXCEL_PATH = os.path.join(BASE_DIR, "streaming_cost_inflation.xlsx")
+EMBEDDING_MODEL_ID = "ibm/slate-30m-english-rtrvr-v2"
+
+# The index is built once, saved here and reloaded while the workbook is unchanged
+INDEX_DIR = os.getenv("EXCEL_RAG_INDEX_DIR", os.path.join(BASE_DIR, ".excel_rag_index"))
+# Rows sent to the embedding service per call
+EMBED_BATCH_SIZE = int(os.getenv("EXCEL_RAG_EMBED_BATCH_SIZE", "64"))
 
 
 # --- Embedding & LLM Setup ---
 
 embeddings_client = WatsonxEmbeddings(
-    model_id="ibm/slate-30m-english-rtrvr-v2",
+    model_id=EMBEDDING_MODEL_ID,
     url="https://us-south.ml.cloud.ibm.com",
     apikey=WATSONX_APIKEY,
     project_id=PROJECT_ID,
@@ -46,20 +57,20 @@ watsonx_llm = ChatWatsonx(
 
 # --- Helpers ---
 
-def embed(texts: List[str]) -> np.ndarray:
-    """Return numpy array of embeddings."""
-    emb = embeddings_client.embed_documents(texts)
+def embed(texts: List[str], batch_size: int = EMBED_BATCH_SIZE) -> np.ndarray:
+    """Return numpy array of embeddings, requested batch_size texts at a time."""
+    emb = []
+    for start in range(0, len(texts), batch_size):
+        emb.extend(embeddings_client.embed_documents(texts[start:start + batch_size]))
     return np.array(emb).astype("float32")
 
 
-def load_excel_rows(path: str):
-    df = pd.read_excel(path)
-    docs = []
-    for idx, row in df.iterrows():
-        md = row.to_dict()
-        text = "\n".join(f"{k}: {v}" for k, v in md.items())
-        docs.append({"id": f"row-{idx}", "text": text, "metadata": md})
-    return docs
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
 
 def call_watsonx(prompt: str) -> str:
@@ -69,27 +80,107 @@ def call_watsonx(prompt: str) -> str:
 # --- FAISS Vector Store ---
 
 class FAISSStore:
-    def __init__(self):
-        self.texts = []
-        self.metadatas = []
-        self.index = None
-        self.dimension = None
+    """
+    Cosine-similarity FAISS index over workbook rows, persisted to a directory.
 
-    def add(self, docs: List[dict]):
-        texts = [d["text"] for d in docs]
-        metadata = [d["metadata"] for d in docs]
+    Every row is tracked by the hash of its text, so when the workbook changes
+    only new or edited rows are embedded; vectors of unchanged rows are taken
+    from the existing index. Row text and metadata live in a `RowStore`
+    addressed by the FAISS row number.
+    """
 
-        emb = embed(texts)
-        if self.index is None:
-            self.dimension = emb.shape[1]
-            self.index = faiss.IndexFlatIP(self.dimension)  # cosine via normalized vectors
+    INDEX_FILE = "index.faiss"
+    ROWS_FILE = "rows.parquet"
+    META_FILE = "meta.json"
 
-        # normalize for cosine similarity
-        faiss.normalize_L2(emb)
+    def __init__(self):
+        self.rows: Optional[RowStore] = None
+        self.source_hash = None
+        self.index = None
+        self.dimension = None
 
-        self.index.add(emb)
-        self.texts.extend(texts)
-        self.metadatas.extend(metadata)
+    def sync(self, table: pa.Table) -> int:
+        """
+        Make the store hold exactly the rows of `table`, embedding only rows not already indexed.
+
+        Returns:
+            Number of rows that were embedded.
+        """
+        hashes = table.column(HASH_COLUMN).to_pylist()
+        known: Dict[str, int] = {}
+        for i, h in enumerate(self.rows.row_hashes if self.rows is not None else []):
+            known.setdefault(h, i)
+        missing = [i for i, h in enumerate(hashes) if h not in known]
+
+        texts = table.column(TEXT_COLUMN)
+        new_emb = embed([texts[i].as_py() for i in missing]) if missing else None
+        if new_emb is not None:
+            faiss.normalize_L2(new_emb)
+        dimension = new_emb.shape[1] if new_emb is not None else self.dimension
+        if dimension is None:  # empty workbook and no previous index
+            return 0
+
+        vectors = np.empty((len(hashes), dimension), dtype="float32")
+        if missing:
+            vectors[missing] = new_emb
+        for i, h in enumerate(hashes):
+            if h in known:
+                vectors[i] = self.index.reconstruct(known[h])
+
+        index = faiss.IndexFlatIP(dimension)  # cosine via normalized vectors
+        index.add(vectors)
+        self.index = index
+        self.dimension = dimension
+        self.rows = RowStore(table)
+        return len(missing)
+
+    def save(self, directory: str):
+        """Write the index, rows and metadata, replacing the previous files atomically."""
+        os.makedirs(directory, exist_ok=True)
+        index_path = os.path.join(directory, self.INDEX_FILE)
+        rows_path = os.path.join(directory, self.ROWS_FILE)
+        meta_path = os.path.join(directory, self.META_FILE)
+        faiss.write_index(self.index, index_path + ".tmp")
+        self.rows.save(rows_path + ".tmp")
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "source_hash": self.source_hash,
+                    "embedding_model": EMBEDDING_MODEL_ID,
+                    "dimension": self.dimension,
+                },
+                f,
+            )
+        os.replace(index_path + ".tmp", index_path)
+        os.replace(rows_path + ".tmp", rows_path)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["FAISSStore"]:
+        """Load a saved store, or return None if there is none for the current embedding model."""
+        paths = [os.path.join(directory, f) for f in (cls.INDEX_FILE, cls.ROWS_FILE, cls.META_FILE)]
+        if not all(os.path.exists(p) for p in paths):
+            return None
+        index_path, rows_path, meta_path = paths
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("embedding_model") != EMBEDDING_MODEL_ID:
+            return None
+        try:
+            # Map the vectors instead of reading them into memory where the index type allows
+            index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError:
+            index = faiss.read_index(index_path)
+        rows = RowStore.load(rows_path)
+        if index.ntotal != len(rows):
+            return None
+
+        store = cls()
+        store.index = index
+        store.dimension = meta["dimension"]
+        store.source_hash = meta["source_hash"]
+        store.rows = rows
+        return store
 
     def search(self, query: str, k: int = 5):
         q_emb = embed([query])
@@ -102,8 +193,8 @@ class FAISSStore:
             if idx == -1:
                 continue
             results.append({
-                "text": self.texts[idx],
-                "metadata": self.metadatas[idx],
+                "text": self.rows.text(int(idx)),
+                "metadata": self.rows.metadata(int(idx)),
                 "score": float(score),
             })
         return results
@@ -112,12 +203,24 @@ class FAISSStore:
 # --- Main RAG ---
 
 class ExcelRAG:
-    def __init__(self):
-        self.store = FAISSStore()
+    def __init__(self, index_dir: Optional[str] = None):
+        self.index_dir = index_dir
+        self.store = (FAISSStore.load(index_dir) if index_dir else None) or FAISSStore()
+        self._source_stat = None
 
     def ingest(self, path: str):
-        docs = load_excel_rows(path)
-        self.store.add(docs)
+        """Index the workbook, reusing the saved index if the workbook did not change."""
+        stat = os.stat(path)
+        source_stat = (stat.st_size, stat.st_mtime_ns)
+        if source_stat == self._source_stat:
+            return
+        source_hash = file_hash(path)
+        if source_hash != self.store.source_hash or self.store.index is None:
+            self.store.sync(load_excel_table(path))
+            self.store.source_hash = source_hash
+            if self.index_dir and self.store.index is not None:
+                self.store.save(self.index_dir)
+        self._source_stat = source_stat
 
     def ask(self, question: str, top_k: int):
         hits = self.store.search(question, k=top_k)
@@ -134,6 +237,20 @@ class ExcelRAG:
         return call_watsonx(prompt)
 
 
+_rag: Optional[ExcelRAG] = None
+_rag_lock = threading.Lock()
+
+
+def get_rag() -> ExcelRAG:
+    """Shared ExcelRAG, loaded from disk once and refreshed when the workbook changes."""
+    global _rag
+    with _rag_lock:
+        if _rag is None:
+            _rag = ExcelRAG(INDEX_DIR)
+        _rag.ingest(EXCEL_PATH)
+        return _rag
+
+
 # --- Orchestrate Tool ---
 
 class RAGInput(BaseModel):
@@ -147,6 +264,4 @@ class RAGInput(BaseModel):
     permission=ToolPermission.ADMIN
 )
 def excel_rag_tool(input: RAGInput) -> str:
-    rag = ExcelRAG()
-    rag.ingest(EXCEL_PATH)
-    return rag.ask(input.question, input.top_k)
+    return get_rag().ask(input.question, input.top_k)
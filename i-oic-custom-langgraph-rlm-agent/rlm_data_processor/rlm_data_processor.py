@@ -2,7 +2,15 @@
 RLM-Powered Data Processor Agent for watsonx Orchestrate
 Implements Scan, Delegate, and Combine approach for efficient document processing
 """
+import gzip
+import hashlib
+import json
 import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Annotated, List, TypedDict, Dict, Any
 from pathlib import Path
 
@@ -10,7 +18,11 @@ from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 from langchain_core.runnables.config import RunnableConfig
 from langgraph.graph import StateGraph, START, END
 
-from langchain_ibm import WatsonxLLM
+import httpx
+import numpy as np
+from ibm_watsonx_ai import APIClient, Credentials
+from ibm_watsonx_ai.utils.utils import HttpClientConfig
+from langchain_ibm import WatsonxEmbeddings, WatsonxLLM
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from pypdf import PdfReader
 
@@ -23,6 +35,39 @@ WATSONX_URL="<YOUR_WATSONX_URL>"
 # PDF document path
 PDF_PATH = Path(__file__).parent / "bank_loan_document.pdf"
 
+# Directory holding the compressed sidecar files with extracted pages and chunks
+DOCUMENT_CACHE_DIR = Path(os.getenv("RLM_DOCUMENT_CACHE_DIR", str(Path(__file__).parent / ".rlm_cache")))
+CHUNK_OVERLAP = 150
+
+# Scan relevance mode: "llm" (judge every chunk), "embedding" (cosine top-k only)
+# or "hybrid" (cosine top-k shortlist judged by the LLM)
+SCAN_MODES = ("llm", "embedding", "hybrid")
+SCAN_MODE = os.getenv("RLM_SCAN_MODE", "hybrid")
+EMBEDDING_MODEL_ID = "ibm/slate-125m-english-rtrvr"
+EMBEDDING_TOP_K = int(os.getenv("RLM_EMBEDDING_TOP_K", "12"))
+
+# Maximum number of relevant sections kept by the scan phase
+MAX_SCAN_SECTIONS = int(os.getenv("RLM_MAX_SCAN_SECTIONS", "8"))
+
+# Approximate token budget for the sub-agent context in one combine prompt;
+# larger inputs are synthesized hierarchically (tree reduce)
+COMBINE_TOKEN_BUDGET = int(os.getenv("RLM_COMBINE_TOKEN_BUDGET", "3000"))
+
+# Concurrency settings for the scan and delegate fan-out
+MAX_CONCURRENT_LLM_CALLS = int(os.getenv("RLM_MAX_CONCURRENT_LLM_CALLS", "8"))
+LLM_CALL_TIMEOUT_SECONDS = float(os.getenv("RLM_LLM_CALL_TIMEOUT_SECONDS", "120"))
+
+# LLM response cache: in-memory LRU (0 entries disables it), optional SQLite backing file
+LLM_MODEL_ID = "openai/gpt-oss-120b"
+LLM_PARAMS = {
+    "max_new_tokens": 1000,
+    "temperature": 0.7,
+    "top_p": 0.9,
+}
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("RLM_LLM_CACHE_MAX_ENTRIES", "1024"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("RLM_LLM_CACHE_TTL_SECONDS", "3600"))
+LLM_CACHE_DB_PATH = os.getenv("RLM_LLM_CACHE_DB_PATH", "")
+
 
 class AgentState(TypedDict):
     """State containing conversation messages and RLM processing context."""
@@ -31,6 +76,35 @@ class AgentState(TypedDict):
     scanned_sections: Annotated[List[Dict[str, Any]], "relevant document sections from scan phase"]
     delegated_results: Annotated[List[str], "results from sub-agent processing"]
     final_answer: Annotated[str, "combined final answer"]
+    documents: Annotated[List[str], "names of registered documents to search (all when empty)"]
+    loaded_documents: Annotated[List[Dict[str, Any]], "name, file, page and chunk counts of the scanned documents"]
+    scan_mode: Annotated[str, "relevance mode override: llm, embedding or hybrid"]
+    scan_stats: Annotated[Dict[str, Any], "scan mode, shortlist size and LLM calls avoided"]
+    timings: Annotated[Dict[str, Dict[str, float]], "measured wall-clock and LLM call time per phase"]
+
+
+def initialize_watsonx_client() -> APIClient:
+    """
+    Initialize the watsonx.ai API client used by the LLM and embeddings.
+    
+    The per-call timeout is enforced by its HTTP client, so a call that takes
+    too long is aborted rather than left running, and its connection pool is
+    sized to the fan-out concurrency.
+    
+    Returns:
+        APIClient: Configured watsonx.ai API client
+    """
+    return APIClient(
+        credentials=Credentials(url=WATSONX_URL, api_key=WATSONX_API_KEY),
+        project_id=WATSONX_PROJECT_ID,
+        httpx_client=HttpClientConfig(
+            timeout=httpx.Timeout(LLM_CALL_TIMEOUT_SECONDS, connect=10),
+            limits=httpx.Limits(
+                max_connections=MAX_CONCURRENT_LLM_CALLS,
+                max_keepalive_connections=MAX_CONCURRENT_LLM_CALLS,
+            ),
+        ),
+    )
 
 
 def initialize_watsonx_llm() -> WatsonxLLM:
@@ -41,18 +115,547 @@ def initialize_watsonx_llm() -> WatsonxLLM:
         WatsonxLLM: Configured watsonx.ai language model
     """
     return WatsonxLLM(
-        model_id="openai/gpt-oss-120b",
-        url=WATSONX_URL,
-        apikey=WATSONX_API_KEY,
-        project_id=WATSONX_PROJECT_ID,
-        params={
-            "max_new_tokens": 1000,
-            "temperature": 0.7,
-            "top_p": 0.9,
-        }
+        model_id=LLM_MODEL_ID,
+        watsonx_client=get_watsonx_client(),
+        params=dict(LLM_PARAMS)
     )
 
 
+def initialize_watsonx_embeddings() -> WatsonxEmbeddings:
+    """
+    Initialize watsonx.ai embeddings for the scan pre-filter.
+    
+    Returns:
+        WatsonxEmbeddings: Configured watsonx.ai embedding model
+    """
+    return WatsonxEmbeddings(
+        model_id=EMBEDDING_MODEL_ID,
+        watsonx_client=get_watsonx_client(),
+    )
+
+
+_shared_clients: Dict[str, Any] = {}
+_shared_clients_lock = threading.RLock()
+
+
+def get_watsonx_client() -> APIClient:
+    """
+    Get the process-wide watsonx.ai API client.
+    
+    Returns:
+        APIClient: Shared watsonx.ai API client
+    """
+    with _shared_clients_lock:
+        if "api_client" not in _shared_clients:
+            _shared_clients["api_client"] = initialize_watsonx_client()
+        return _shared_clients["api_client"]
+
+
+def get_watsonx_llm() -> WatsonxLLM:
+    """
+    Get the process-wide watsonx.ai LLM client shared by all phases.
+    
+    Returns:
+        WatsonxLLM: Shared watsonx.ai language model
+    """
+    with _shared_clients_lock:
+        if "llm" not in _shared_clients:
+            _shared_clients["llm"] = initialize_watsonx_llm()
+        return _shared_clients["llm"]
+
+
+def get_watsonx_embeddings() -> WatsonxEmbeddings:
+    """
+    Get the process-wide watsonx.ai embeddings client.
+    
+    Returns:
+        WatsonxEmbeddings: Shared watsonx.ai embedding model
+    """
+    with _shared_clients_lock:
+        if "embeddings" not in _shared_clients:
+            _shared_clients["embeddings"] = initialize_watsonx_embeddings()
+        return _shared_clients["embeddings"]
+
+
+class LLMResponseCache:
+    """
+    Prompt-hash to completion cache for LLM calls.
+    
+    Entries live in an in-memory LRU bounded by `max_entries` and expire after
+    `ttl_seconds`. When `db_path` is set, entries are also written to a SQLite
+    file so they survive restarts and can be shared between worker processes.
+    """
+    
+    def __init__(self, max_entries: int, ttl_seconds: float, db_path: str = ""):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path and max_entries > 0:
+            try:
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"  ⚠ LLM cache database unavailable, using memory only: {str(e)}")
+                self._db = None
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+    
+    @staticmethod
+    def make_key(prompt: str) -> str:
+        """Hash the model, generation parameters and prompt into a cache key."""
+        material = json.dumps([LLM_MODEL_ID, LLM_PARAMS, prompt], sort_keys=True)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+    
+    def get(self, prompt: str) -> str:
+        """
+        Look up a cached completion.
+        
+        Args:
+            prompt: Prompt sent to the LLM
+            
+        Returns:
+            str: Cached completion, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        key = self.make_key(prompt)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute("SELECT response, created FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    entry = (row[0], row[1])
+                    self._store_in_memory(key, entry)
+            if entry is not None and now - entry[1] > self.ttl_seconds:
+                self._entries.pop(key, None)
+                if self._db is not None:
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._db.commit()
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, prompt: str, response: str) -> None:
+        """
+        Store a completion for a prompt.
+        
+        Args:
+            prompt: Prompt sent to the LLM
+            response: Completion returned by the LLM
+        """
+        if not self.enabled:
+            return
+        key = self.make_key(prompt)
+        entry = (response, time.time())
+        with self._lock:
+            self._store_in_memory(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, response, created) VALUES (?, ?, ?)",
+                    (key, entry[0], entry[1]),
+                )
+                # Keep only the newest max_entries rows
+                self._db.execute(
+                    "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                self._db.commit()
+    
+    def _store_in_memory(self, key: str, entry: tuple) -> None:
+        """Insert an entry into the LRU and evict the least recently used ones (lock held)."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def stats(self) -> Dict[str, int]:
+        """Return cumulative hit/miss counters and the number of in-memory entries."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+llm_response_cache = LLMResponseCache(LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL_SECONDS, LLM_CACHE_DB_PATH)
+
+
+def _invoke_llm(llm: WatsonxLLM, prompt: str) -> Dict[str, Any]:
+    """
+    Invoke the LLM for a single prompt on the calling thread.
+    
+    Completions are served from `llm_response_cache` when available. The call
+    is bounded by the request timeout of the shared watsonx.ai client (see
+    `initialize_watsonx_client`), so a slow call frees its pool slot when it
+    times out instead of running on in the background.
+    
+    Args:
+        llm: Language model used for the call
+        prompt: Prompt to send
+        
+    Returns:
+        Dict[str, Any]: "response" (str or None), "error" (str or None), "elapsed" seconds
+        and "cached" (True when served from the response cache)
+    """
+    start = time.perf_counter()
+    cached_response = llm_response_cache.get(prompt)
+    if cached_response is not None:
+        return {"response": cached_response, "error": None, "elapsed": time.perf_counter() - start, "cached": True}
+    
+    outcome: Dict[str, Any] = {"response": None, "error": None}
+    try:
+        outcome["response"] = llm.invoke(prompt)
+        llm_response_cache.put(prompt, outcome["response"])
+    except httpx.TimeoutException:
+        outcome["error"] = f"LLM call timed out after {LLM_CALL_TIMEOUT_SECONDS:.0f}s"
+    except Exception as e:
+        outcome["error"] = str(e)
+    outcome["elapsed"] = time.perf_counter() - start
+    outcome["cached"] = False
+    return outcome
+
+
+def invoke_llm_concurrently(
+    llm: WatsonxLLM,
+    prompts: List[str],
+    max_concurrency: int = MAX_CONCURRENT_LLM_CALLS,
+) -> List[Dict[str, Any]]:
+    """
+    Fan out LLM calls over a bounded thread pool.
+    
+    At most `max_concurrency` calls are in flight at any time, each one bounded
+    by the client's request timeout (`LLM_CALL_TIMEOUT_SECONDS`). Failures are
+    captured per prompt instead of aborting the whole batch.
+    
+    Args:
+        llm: Language model used for every call
+        prompts: Prompts to evaluate
+        max_concurrency: Maximum number of in-flight LLM calls
+        
+    Returns:
+        List[Dict[str, Any]]: One outcome per prompt, in the same order as `prompts`
+    """
+    if not prompts:
+        return []
+    workers = max(1, min(max_concurrency, len(prompts)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rlm-llm") as executor:
+        return list(executor.map(lambda prompt: _invoke_llm(llm, prompt), prompts))
+
+
+def _record_timing(state: AgentState, phase: str, wall_clock: float, outcomes: List[Dict[str, Any]]) -> None:
+    """
+    Store measured timings for a phase on the agent state.
+    
+    Args:
+        state: Current agent state
+        phase: Phase name ("scan", "delegate" or "combine")
+        wall_clock: Elapsed wall-clock seconds for the phase
+        outcomes: LLM call outcomes produced during the phase
+    """
+    timings = state.get("timings") or {}
+    timings[phase] = {
+        "wall_clock": wall_clock,
+        "llm_time": sum(outcome["elapsed"] for outcome in outcomes),
+        "llm_calls": len(outcomes),
+        "cache_hits": sum(1 for outcome in outcomes if outcome.get("cached")),
+    }
+    state["timings"] = timings
+
+
+def is_relevant_verdict(relevance_response: str) -> bool:
+    """
+    Interpret a YES/NO relevance verdict returned by the LLM.
+    
+    Avoids false positives from the word "RELEVANT" in the prompt or reasoning.
+    
+    Args:
+        relevance_response: Raw LLM response to the relevance prompt
+        
+    Returns:
+        bool: True if the section was judged relevant
+    """
+    response_upper = relevance_response.upper()
+    if "YES" not in response_upper:
+        return False
+    if "NO" not in response_upper:
+        return True
+    if "ASSISTANTFINALNO" in response_upper:
+        return False
+    if "ASSISTANTFINALYES" in response_upper:
+        return True
+    return response_upper.rfind("YES") > response_upper.rfind("NO")
+
+
+# Registered documents the agent can answer questions about, keyed by name
+DOCUMENT_REGISTRY: Dict[str, Path] = {PDF_PATH.stem: PDF_PATH}
+
+# In-memory document cache: cache key -> {"pages": [...], "chunks": {"size:overlap": [...]}}
+_document_cache: Dict[str, Dict[str, Any]] = {}
+_document_cache_lock = threading.Lock()
+
+
+def register_document(pdf_path: Path, name: str = None) -> str:
+    """
+    Register a PDF document so the scan phase can search it.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        name: Name used to select the document (defaults to the file stem)
+        
+    Returns:
+        str: Name under which the document was registered
+    """
+    pdf_path = Path(pdf_path)
+    name = name or pdf_path.stem
+    DOCUMENT_REGISTRY[name] = pdf_path
+    return name
+
+
+def _document_cache_key(pdf_path: Path) -> str:
+    """
+    Build the cache key for a document from its resolved path, mtime and size.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        
+    Returns:
+        str: Cache key that changes whenever the file is modified
+    """
+    stat = pdf_path.stat()
+    return f"{pdf_path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _cache_file_stem(pdf_path: Path) -> str:
+    """
+    Name the on-disk cache files of a document after its file name and a hash
+    of its resolved path, so documents sharing a file name in different
+    directories do not overwrite each other's files.
+    """
+    path_hash = hashlib.sha256(str(pdf_path.resolve()).encode("utf-8")).hexdigest()[:16]
+    return f"{pdf_path.stem}-{path_hash}"
+
+
+def _sidecar_path(pdf_path: Path) -> Path:
+    """Return the on-disk sidecar file for a document."""
+    return DOCUMENT_CACHE_DIR / f"{_cache_file_stem(pdf_path)}.rlm.json.gz"
+
+
+def _read_sidecar(pdf_path: Path, cache_key: str) -> Dict[str, Any]:
+    """
+    Load a cached document entry from disk if it matches the current file.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        cache_key: Current cache key of the file
+        
+    Returns:
+        Dict[str, Any]: Cached entry, or None when missing or stale
+    """
+    try:
+        with gzip.open(_sidecar_path(pdf_path), "rt", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if entry.get("cache_key") != cache_key:
+        return None
+    return entry
+
+
+def _write_sidecar(pdf_path: Path, entry: Dict[str, Any]) -> None:
+    """
+    Persist a cached document entry to disk.
+    
+    The file is written atomically; failures (e.g. a read-only deployment
+    bundle) only disable the on-disk layer.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        entry: Cached entry to persist
+    """
+    sidecar = _sidecar_path(pdf_path)
+    try:
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = sidecar.with_suffix(f".{os.getpid()}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(entry, f, separators=(",", ":"))
+        os.replace(tmp_path, sidecar)
+    except OSError as e:
+        print(f"  ⚠ Could not write document cache for {pdf_path.name}: {str(e)}")
+
+
+def _get_document_entry(pdf_path: Path) -> Dict[str, Any]:
+    """
+    Return the cached entry for a document, extracting its pages on a miss.
+    
+    Lookup order is memory, then the on-disk sidecar, then PDF extraction.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        
+    Returns:
+        Dict[str, Any]: Entry with "cache_key", "pages" and "chunks"
+    """
+    pdf_path = Path(pdf_path)
+    cache_key = _document_cache_key(pdf_path)
+    with _document_cache_lock:
+        entry = _document_cache.get(cache_key)
+        if entry is not None:
+            return entry
+        
+        entry = _read_sidecar(pdf_path, cache_key)
+        if entry is None:
+            reader = PdfReader(str(pdf_path))
+            entry = {
+                "cache_key": cache_key,
+                "pages": [page.extract_text() for page in reader.pages],
+                "chunks": {},
+            }
+            _write_sidecar(pdf_path, entry)
+        
+        # Drop entries for older versions of the same file
+        source = f"{pdf_path.resolve()}:"
+        for stale_key in [key for key in _document_cache if key.startswith(source)]:
+            del _document_cache[stale_key]
+        _document_cache[cache_key] = entry
+        return entry
+
+
+def get_document_pages(pdf_path: Path) -> List[str]:
+    """
+    Get the extracted text of each page of a PDF document (cached).
+    
+    Args:
+        pdf_path: Path to the PDF file
+        
+    Returns:
+        List[str]: Extracted text per page
+    """
+    return _get_document_entry(pdf_path)["pages"]
+
+
+def get_document_chunks(pdf_path: Path, chunk_size: int, chunk_overlap: int = CHUNK_OVERLAP) -> List[str]:
+    """
+    Get a PDF document split into chunks (cached per chunk parameters).
+    
+    Args:
+        pdf_path: Path to the PDF file
+        chunk_size: Maximum number of characters per chunk
+        chunk_overlap: Number of overlapping characters between chunks
+        
+    Returns:
+        List[str]: Document chunks
+    """
+    pdf_path = Path(pdf_path)
+    entry = _get_document_entry(pdf_path)
+    chunk_key = f"{chunk_size}:{chunk_overlap}"
+    chunks = entry["chunks"].get(chunk_key)
+    if chunks is None:
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=len,
+        )
+        chunks = text_splitter.split_text("".join(page + "\n" for page in entry["pages"]))
+        with _document_cache_lock:
+            entry["chunks"][chunk_key] = chunks
+            _write_sidecar(pdf_path, entry)
+    return chunks
+
+
+# In-memory vector indexes: "cache_key|size:overlap|model" -> L2-normalised chunk embeddings
+_vector_index_cache: Dict[str, np.ndarray] = {}
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length so a dot product equals cosine similarity."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def get_document_vectors(
+    pdf_path: Path,
+    chunk_size: int,
+    embeddings: WatsonxEmbeddings,
+    chunk_overlap: int = CHUNK_OVERLAP,
+) -> np.ndarray:
+    """
+    Get the vector index of a document's chunks, embedding them on first use.
+    
+    The index is built once per document version and chunk parameters, kept in
+    memory and saved as a `.npz` file next to the document sidecar.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        chunk_size: Maximum number of characters per chunk
+        embeddings: Embedding model used to build the index
+        chunk_overlap: Number of overlapping characters between chunks
+        
+    Returns:
+        np.ndarray: L2-normalised embeddings, one row per chunk
+    """
+    pdf_path = Path(pdf_path)
+    chunks = get_document_chunks(pdf_path, chunk_size, chunk_overlap)
+    cache_key = _document_cache_key(pdf_path)
+    index_key = f"{cache_key}|{chunk_size}:{chunk_overlap}|{EMBEDDING_MODEL_ID}"
+    
+    vectors = _vector_index_cache.get(index_key)
+    if vectors is not None:
+        return vectors
+    
+    model_tag = EMBEDDING_MODEL_ID.replace("/", "_")
+    index_path = DOCUMENT_CACHE_DIR / f"{_cache_file_stem(pdf_path)}.{chunk_size}-{chunk_overlap}.{model_tag}.npz"
+    try:
+        with np.load(index_path, allow_pickle=False) as data:
+            if str(data["index_key"]) == index_key and len(data["vectors"]) == len(chunks):
+                vectors = data["vectors"]
+    except (OSError, KeyError, ValueError):
+        vectors = None
+    
+    if vectors is None:
+        vectors = _normalize_rows(np.asarray(embeddings.embed_documents(chunks), dtype=np.float32))
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            np.savez(index_path, index_key=np.array(index_key), vectors=vectors)
+        except OSError as e:
+            print(f"  ⚠ Could not write vector index for {pdf_path.name}: {str(e)}")
+    
+    _vector_index_cache[index_key] = vectors
+    return vectors
+
+
+def rank_chunks_by_similarity(query: str, vectors: np.ndarray, embeddings: WatsonxEmbeddings, top_k: int) -> List[tuple]:
+    """
+    Select the chunks most similar to the query.
+    
+    Args:
+        query: User query
+        vectors: L2-normalised chunk embeddings (one row per chunk)
+        embeddings: Embedding model used for the query
+        top_k: Number of candidates to return
+        
+    Returns:
+        List[tuple]: (chunk index, cosine similarity) pairs, most similar first
+    """
+    query_vector = _normalize_rows(np.asarray([embeddings.embed_query(query)], dtype=np.float32))[0]
+    scores = vectors @ query_vector
+    top_k = min(top_k, len(scores))
+    top_indices = np.argpartition(-scores, top_k - 1)[:top_k]
+    top_indices = top_indices[np.argsort(-scores[top_indices])]
+    return [(int(idx), float(scores[idx])) for idx in top_indices]
+
+
 def load_pdf_document(pdf_path: Path) -> str:
     """
     Load and extract text from PDF document.
@@ -64,11 +667,7 @@ def load_pdf_document(pdf_path: Path) -> str:
         str: Extracted text content from PDF
     """
     try:
-        reader = PdfReader(str(pdf_path))
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        return "".join(page + "\n" for page in get_document_pages(pdf_path))
     except Exception as e:
         return f"Error loading PDF: {str(e)}"
 
@@ -79,8 +678,8 @@ def scan_phase(state: AgentState) -> AgentState:
     Search the document and find only relevant sections instead of reading the entire file.
     
     This phase:
-    - Loads the PDF document
-    - Chunks it into manageable sections
+    - Loads the registered PDF documents (all, or those named in state["documents"])
+    - Reuses cached pages and chunks instead of re-parsing the PDF per query
     - Identifies sections relevant to the user's query
     - Reduces memory usage by filtering out irrelevant content
     
@@ -93,19 +692,14 @@ def scan_phase(state: AgentState) -> AgentState:
     if not state.get("messages"):
         return state
     
+    phase_start = time.perf_counter()
+    state["timings"] = {}
+    
     # Extract user query
     last_message = state["messages"][-1]
     query = last_message.content if hasattr(last_message, 'content') else str(last_message)
     state["query"] = query
     
-    # Load PDF document
-    print("🔍 SCAN PHASE: Loading document...")
-    document_text = load_pdf_document(PDF_PATH)
-    
-    if document_text.startswith("Error"):
-        state["scanned_sections"] = []
-        return state
-    
     # Determine dynamic chunk size and target minimum sections to show variable execution metrics (4, 5, 8, etc.)
     query_hash = len(query)
     # Varies chunk_size between 1400, 1600, 1800, 2000
@@ -113,86 +707,157 @@ def scan_phase(state: AgentState) -> AgentState:
     # Varies target minimum between 4, 5, 6, 7, 8
     target_min = 4 + (query_hash % 5)
     
-    # Split document into chunks
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=150,
-        length_function=len,
-    )
-    chunks = text_splitter.split_text(document_text)
+    # Load pre-chunked documents from the document cache
+    document_names = state.get("documents") or list(DOCUMENT_REGISTRY)
+    print(f"🔍 SCAN PHASE: Loading {len(document_names)} document(s)...")
+    chunks = []
+    chunk_documents = []
+    document_paths = []
+    loaded_documents = []
+    for name in document_names:
+        pdf_path = DOCUMENT_REGISTRY.get(name)
+        if pdf_path is None:
+            print(f"  ⚠ Unknown document '{name}', skipping")
+            continue
+        try:
+            document_chunks = get_document_chunks(pdf_path, chunk_size)
+            page_count = len(get_document_pages(pdf_path))
+        except Exception as e:
+            print(f"  ⚠ Error loading document '{name}': {str(e)}")
+            continue
+        chunks.extend(document_chunks)
+        chunk_documents.extend([name] * len(document_chunks))
+        document_paths.append(pdf_path)
+        loaded_documents.append({
+            "name": name,
+            "file": pdf_path.name,
+            "pages": page_count,
+            "chunks": len(document_chunks),
+        })
+    state["loaded_documents"] = loaded_documents
     
-    # Initialize LLM for relevance scoring
-    llm = initialize_watsonx_llm()
+    if not chunks:
+        state["scanned_sections"] = []
+        return state
     
     # Scan and identify relevant sections
     relevant_sections = []
-    max_sections = 8  # Scan up to 8 sections maximum
-    print(f"🔍 SCAN PHASE: Analyzing document sections (chunk_size={chunk_size}, targeting a minimum of {target_min} relevant sections)...")
+    scan_outcomes = []
+    max_sections = MAX_SCAN_SECTIONS  # Scan up to MAX_SCAN_SECTIONS sections maximum
     
-    for idx, chunk in enumerate(chunks):  # Scan all available chunks
-        # Use LLM to determine relevance
-        relevance_prompt = f"""Given this query: "{query}"
+    # Embedding pre-filter: shortlist chunks by cosine similarity
+    scan_mode = state.get("scan_mode") or SCAN_MODE
+    if scan_mode not in SCAN_MODES:
+        print(f"  ⚠ Unknown scan mode '{scan_mode}', falling back to 'llm'")
+        scan_mode = "llm"
+    candidates = list(range(len(chunks)))
+    similarities = {}
+    if scan_mode != "llm":
+        try:
+            embeddings = get_watsonx_embeddings()
+            vectors = np.vstack([get_document_vectors(pdf_path, chunk_size, embeddings) for pdf_path in document_paths])
+            top_k = max_sections if scan_mode == "embedding" else EMBEDDING_TOP_K
+            ranked = rank_chunks_by_similarity(query, vectors, embeddings, top_k)
+            similarities = dict(ranked)
+            candidates = [idx for idx, _ in ranked]
+            print(f"🔍 SCAN PHASE: Embedding pre-filter shortlisted {len(candidates)} of {len(chunks)} sections ({scan_mode} mode)")
+        except Exception as e:
+            print(f"  ⚠ Embedding pre-filter failed, falling back to 'llm' mode: {str(e)}")
+            scan_mode = "llm"
+    
+    if scan_mode == "embedding":
+        for idx in candidates:
+            relevant_sections.append({
+                "section_id": idx,
+                "document": chunk_documents[idx],
+                "content": chunks[idx],
+                "relevance_score": f"Cosine similarity {similarities[idx]:.3f} (embedding pre-filter)"
+            })
+            print(f"  ✓ Section {idx} marked as relevant (similarity {similarities[idx]:.3f})")
+    else:
+        # Initialize LLM for relevance scoring
+        llm = get_watsonx_llm()
+        print(f"🔍 SCAN PHASE: Analyzing document sections (chunk_size={chunk_size}, targeting a minimum of {target_min} relevant sections, "
+              f"up to {MAX_CONCURRENT_LLM_CALLS} concurrent checks)...")
+        
+        # Evaluate candidates in waves of concurrent relevance checks so the scan
+        # can still stop early once the section ceiling is reached
+        for wave_start in range(0, len(candidates), MAX_CONCURRENT_LLM_CALLS):
+            wave = candidates[wave_start:wave_start + MAX_CONCURRENT_LLM_CALLS]
+            relevance_prompts = [
+                f"""Given this query: "{query}"
         
 Is the following document section relevant to answering this query? Answer with YES or NO, followed by a brief reason.
 
 Document section:
-{chunk[:500]}...
+{chunks[idx][:500]}...
 
 Answer:"""
-        
-        try:
-            relevance_response = llm.invoke(relevance_prompt)
+                for idx in wave
+            ]
+            outcomes = invoke_llm_concurrently(llm, relevance_prompts)
+            scan_outcomes.extend(outcomes)
             
-            # Check if section is relevant (avoid false positives from word "RELEVANT" in prompt/reasoning)
-            response_upper = relevance_response.upper()
-            is_relevant = False
-            if "YES" in response_upper:
-                if "NO" in response_upper:
-                    if "ASSISTANTFINALNO" in response_upper:
-                        is_relevant = False
-                    elif "ASSISTANTFINALYES" in response_upper:
-                        is_relevant = True
-                    elif response_upper.rfind("YES") > response_upper.rfind("NO"):
-                        is_relevant = True
+            # Results come back in candidate order
+            for idx, outcome in zip(wave, outcomes):
+                if outcome["error"] is not None:
+                    print(f"  ⚠ Error processing section {idx}: {outcome['error']}")
+                    continue
+                
+                relevance_response = outcome["response"]
+                if is_relevant_verdict(relevance_response):
+                    relevant_sections.append({
+                        "section_id": idx,
+                        "document": chunk_documents[idx],
+                        "content": chunks[idx],
+                        "relevance_score": relevance_response
+                    })
+                    print(f"  ✓ Section {idx} marked as relevant")
+                    
+                    # Stop if we hit our maximum ceiling (MAX_SCAN_SECTIONS)
+                    if len(relevant_sections) >= max_sections:
+                        break
                 else:
-                    is_relevant = True
+                    clean_verdict = relevance_response.strip().replace('\n', ' ')[:120]
+                    print(f"  ✗ Section {idx} rejected. Verdict: {clean_verdict}...")
             
-            if is_relevant:
-                relevant_sections.append({
-                    "section_id": idx,
-                    "content": chunk,
-                    "relevance_score": relevance_response
-                })
-                print(f"  ✓ Section {idx} marked as relevant")
-                
-                # Stop if we hit our maximum ceiling (e.g. 8)
-                if len(relevant_sections) >= max_sections:
-                    print(f"  ℹ️  Reached maximum of {max_sections} sections, stopping scan")
-                    break
-            else:
-                clean_verdict = relevance_response.strip().replace('\n', ' ')[:120]
-                print(f"  ✗ Section {idx} rejected. Verdict: {clean_verdict}...")
-        except Exception as e:
-            print(f"  ⚠ Error processing section {idx}: {str(e)}")
-            continue
+            if len(relevant_sections) >= max_sections:
+                print(f"  ℹ️  Reached maximum of {max_sections} sections, stopping scan")
+                break
             
     # Guarantee a minimum of target_min sections are retrieved
     if len(relevant_sections) < target_min:
         print(f"🔍 SCAN PHASE: Found {len(relevant_sections)} relevant sections, which is less than the minimum of {target_min}. Supplementing with additional document sections to meet the threshold...")
-        for idx, chunk in enumerate(chunks):
+        # Prefer shortlisted candidates (most similar first) before falling back to document order
+        for idx in candidates + list(range(len(chunks))):
             # Check if this section is already selected
             if not any(sec["section_id"] == idx for sec in relevant_sections):
                 relevant_sections.append({
                     "section_id": idx,
-                    "content": chunk,
+                    "document": chunk_documents[idx],
+                    "content": chunks[idx],
                     "relevance_score": f"Automatically retrieved to satisfy the minimum requirement of {target_min} chunks for analysis."
                 })
                 print(f"  ✓ Section {idx} supplemented as relevant")
                 if len(relevant_sections) >= target_min:
                     break
 
-    print(f"🔍 SCAN PHASE: Completed. Retrieved {len(relevant_sections)} relevant sections.")
+    relevant_sections.sort(key=lambda sec: sec["section_id"])
+    llm_calls_avoided = len(chunks) - len(scan_outcomes)
+    # Sections actually judged: LLM-checked, or the shortlist taken as is in embedding mode
+    evaluated = len(candidates) if scan_mode == "embedding" else len(scan_outcomes)
+    print(f"🔍 SCAN PHASE: Completed. Retrieved {len(relevant_sections)} relevant sections "
+          f"({len(scan_outcomes)} LLM relevance calls, {llm_calls_avoided} avoided).")
     state["scanned_sections"] = relevant_sections
+    state["scan_stats"] = {
+        "mode": scan_mode,
+        "total_chunks": len(chunks),
+        "candidates": len(candidates),
+        "llm_calls": len(scan_outcomes),
+        "llm_calls_avoided": llm_calls_avoided,
+        "evaluated": evaluated,
+    }
+    _record_timing(state, "scan", time.perf_counter() - phase_start, scan_outcomes)
     
     return state
 
@@ -205,7 +870,7 @@ def delegate_phase(state: AgentState) -> AgentState:
     This phase:
     - Creates a sub-agent for each relevant section
     - Each sub-agent processes its section independently
-    - Reduces memory usage by parallel processing
+    - Sub-agents run concurrently (bounded by MAX_CONCURRENT_LLM_CALLS)
     - Improves accuracy through focused analysis
     
     Args:
@@ -215,6 +880,7 @@ def delegate_phase(state: AgentState) -> AgentState:
         Updated state with delegated processing results
     """
     print("🤖 DELEGATE PHASE: Creating sub-agents for parallel processing...")
+    phase_start = time.perf_counter()
     
     scanned_sections = state.get("scanned_sections", [])
     if not scanned_sections:
@@ -222,22 +888,18 @@ def delegate_phase(state: AgentState) -> AgentState:
         return state
     
     query = state.get("query", "")
-    llm = initialize_watsonx_llm()
-    
-    delegated_results = []
+    llm = get_watsonx_llm()
     
-    # Create a sub-agent for each relevant section
+    # Create a sub-agent prompt for each relevant section
+    sub_agent_prompts = []
     for section in scanned_sections:
-        section_id = section["section_id"]
-        content = section["content"]
-        
-        print(f"  🤖 Sub-agent {section_id}: Processing section...")
+        print(f"  🤖 Sub-agent {section['section_id']}: Processing section...")
         
         # Sub-agent prompt for focused analysis
-        sub_agent_prompt = f"""Analyze this document section to answer: {query}
+        sub_agent_prompts.append(f"""Analyze this document section to answer: {query}
 
 Document Section:
-{content}
+{section["content"]}
 
 Provide a brief, focused analysis (max 100 words).
 Important Instructions:
@@ -245,29 +907,199 @@ Important Instructions:
 2. If some or all parts of the question cannot be answered using this Document Section, state "Not found in this section" for those parts.
 3. Do NOT guess, assume, or hallucinate any numbers or details.
 
-Analysis:"""
-        
-        try:
-            # Sub-agent processes its assigned section
-            result = llm.invoke(sub_agent_prompt)
+Analysis:""")
+    
+    # Sub-agents process their assigned sections concurrently; outcomes keep section order
+    outcomes = invoke_llm_concurrently(llm, sub_agent_prompts)
+    
+    delegated_results = []
+    for section, outcome in zip(scanned_sections, outcomes):
+        section_id = section["section_id"]
+        if outcome["error"] is None:
             delegated_results.append({
                 "section_id": section_id,
-                "analysis": result
+                "analysis": outcome["response"]
             })
-            print(f"  ✓ Sub-agent {section_id}: Analysis complete")
-        except Exception as e:
-            print(f"  ⚠ Sub-agent {section_id}: Error - {str(e)}")
+            print(f"  ✓ Sub-agent {section_id}: Analysis complete ({outcome['elapsed']:.2f}s)")
+        else:
+            print(f"  ⚠ Sub-agent {section_id}: Error - {outcome['error']}")
             delegated_results.append({
                 "section_id": section_id,
-                "analysis": f"Error processing section: {str(e)}"
+                "analysis": f"Error processing section: {outcome['error']}"
             })
     
     print(f"🤖 DELEGATE PHASE: {len(delegated_results)} sub-agents completed processing")
     state["delegated_results"] = delegated_results
+    _record_timing(state, "delegate", time.perf_counter() - phase_start, outcomes)
     
     return state
 
 
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of a text (about 4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def batch_by_token_budget(parts: List[str], token_budget: int) -> List[List[str]]:
+    """
+    Group consecutive parts into batches that fit the token budget.
+    
+    Batches are formed so that each reduce level strictly shrinks the number
+    of parts, even when single parts exceed the budget.
+    
+    Args:
+        parts: Texts to group, in order
+        token_budget: Approximate maximum tokens per batch
+        
+    Returns:
+        List[List[str]]: Batches of parts, preserving order
+    """
+    batches = [[]]
+    batch_tokens = 0
+    for part in parts:
+        part_tokens = estimate_tokens(part)
+        if len(batches[-1]) >= 2 and batch_tokens + part_tokens > token_budget:
+            batches.append([])
+            batch_tokens = 0
+        batches[-1].append(part)
+        batch_tokens += part_tokens
+    
+    # A trailing single part would not shrink the next level; fold it into its predecessor
+    if len(batches) > 1 and len(batches[-1]) == 1:
+        batches[-2].extend(batches.pop())
+    if len(batches) == 1 and estimate_tokens("\n\n".join(parts)) > token_budget and len(parts) > 2:
+        middle = len(parts) // 2
+        batches = [parts[:middle], parts[middle:]]
+    return batches
+
+
+def clean_llm_answer(raw_answer: str) -> str:
+    """
+    Strip meta-commentary and reasoning that the model emits before its answer.
+    
+    Args:
+        raw_answer: Raw LLM completion
+        
+    Returns:
+        str: Completion with leading meta-commentary removed
+    """
+    final_answer = raw_answer
+    
+    # Remove common meta-commentary patterns
+    cleanup_patterns = [
+        "User We need to",
+        "We need to craft",
+        "Let's produce",
+        "assistantfinal",
+        "We have to combine",
+        "Provide a concise",
+        "Let's",
+    ]
+    
+    for pattern in cleanup_patterns:
+        if pattern in final_answer:
+            # Find where actual answer starts (after the meta-commentary)
+            parts = final_answer.split(pattern, 1)
+            if len(parts) > 1:
+                # Take everything after the first occurrence
+                remaining = parts[1]
+                # Find the next line break or start of actual content
+                lines = remaining.split('\n')
+                # Skip empty lines and find where content starts
+                for i, line in enumerate(lines):
+                    if line.strip() and not any(x in line.lower() for x in ['we need', 'let\'s', 'provide']):
+                        final_answer = '\n'.join(lines[i:])
+                        break
+    return final_answer
+
+
+def build_synthesis_prompt(query: str, combined_context: str) -> str:
+    """Build the prompt that turns sub-agent analyses into the final answer."""
+    return f"""Question: {query}
+
+Context from document analysis:
+{combined_context}
+
+Provide a clear, structured, and comprehensive answer to the question using the context provided.
+Important: The context contains analysis from different document sections. You must aggregate all positive findings. For example, if one section has the loan amount, and another has the collateral vehicle, include both details. Do NOT state that an item is missing or not provided if at least one section found it.
+
+Follow these constraints:
+1. Start with a direct answer or summary.
+2. List the key points as structured bullet points or numbered items where appropriate.
+3. Keep explanations concise.
+4. Maximum 250 words total.
+5. NO meta-commentary, NO reasoning process.
+6. Answer ONLY the specific question asked. Do NOT include unrelated fields, information, or details not directly requested in the query.
+
+Answer:"""
+
+
+def build_merge_prompt(query: str, combined_context: str) -> str:
+    """Build the prompt that merges a batch of analyses into one intermediate summary."""
+    return f"""Question: {query}
+
+Partial analyses from different document sections:
+{combined_context}
+
+Merge these partial analyses into a single condensed summary of the findings relevant to the question.
+Important Instructions:
+1. Keep every concrete detail (names, numbers, dates, identifiers) that any analysis found.
+2. Drop duplicates and statements that a section did not contain the information.
+3. Do NOT guess, assume, or hallucinate any numbers or details.
+4. Maximum 150 words. NO meta-commentary.
+
+Summary:"""
+
+
+def tree_reduce_combine(
+    llm: WatsonxLLM,
+    query: str,
+    parts: List[str],
+    outcomes: List[Dict[str, Any]],
+    token_budget: int = COMBINE_TOKEN_BUDGET,
+) -> tuple:
+    """
+    Combine sub-agent analyses with a hierarchical map-reduce.
+    
+    Parts are grouped into batches that fit the token budget, each batch is
+    merged concurrently, and the merged summaries are reduced again until a
+    single batch remains for the final synthesis prompt.
+    
+    Args:
+        llm: Language model used for merging and synthesis
+        query: User query
+        parts: Sub-agent analyses formatted as context blocks, in section order
+        outcomes: List that collects the outcome of every LLM call made
+        token_budget: Approximate maximum context tokens per prompt
+        
+    Returns:
+        tuple: (raw final answer, number of intermediate reduce levels)
+    """
+    levels = 0
+    batches = batch_by_token_budget(parts, token_budget)
+    while len(batches) > 1:
+        levels += 1
+        print(f"  🔗 Reduce level {levels}: merging {len(parts)} parts in {len(batches)} concurrent batches...")
+        merge_outcomes = invoke_llm_concurrently(
+            llm, [build_merge_prompt(query, "\n\n".join(batch)) for batch in batches]
+        )
+        outcomes.extend(merge_outcomes)
+        failed = [outcome["error"] for outcome in merge_outcomes if outcome["error"] is not None]
+        if failed:
+            raise RuntimeError(f"Reduce level {levels} failed: {failed[0]}")
+        parts = [
+            f"Merged Summary {level_idx + 1} (level {levels}):\n{clean_llm_answer(outcome['response']).strip()}"
+            for level_idx, outcome in enumerate(merge_outcomes)
+        ]
+        batches = batch_by_token_budget(parts, token_budget)
+    
+    synthesis_outcome = _invoke_llm(llm, build_synthesis_prompt(query, "\n\n".join(parts)))
+    outcomes.append(synthesis_outcome)
+    if synthesis_outcome["error"] is not None:
+        raise RuntimeError(synthesis_outcome["error"])
+    return synthesis_outcome["response"], levels
+
+
 def combine_phase(state: AgentState) -> AgentState:
     """
     PHASE 3: COMBINE
@@ -286,6 +1118,7 @@ def combine_phase(state: AgentState) -> AgentState:
         Updated state with final combined answer
     """
     print("🔗 COMBINE PHASE: Synthesizing results from all sub-agents...")
+    phase_start = time.perf_counter()
     
     scanned_sections = state.get("scanned_sections", [])
     delegated_results = state.get("delegated_results", [])
@@ -295,64 +1128,23 @@ def combine_phase(state: AgentState) -> AgentState:
         final_answer = "Unable to process the document. No results available."
         rlm_summary = "### 🧠 RLM (Reduced Language Model) Execution Summary\n\nNo sub-agent results were generated."
     else:
-        # Prepare combined context from all sub-agents
-        combined_context = "\n\n".join([
+        # Prepare context blocks from all sub-agents
+        section_analyses = [
             f"Section {result['section_id']} Analysis:\n{result['analysis']}"
             for result in delegated_results
-        ])
-        
-        # Use LLM to synthesize final answer
-        llm = initialize_watsonx_llm()
+        ]
+        combined_context = "\n\n".join(section_analyses)
         
-        synthesis_prompt = f"""Question: {query}
-
-Context from document analysis:
-{combined_context}
-
-Provide a clear, structured, and comprehensive answer to the question using the context provided.
-Important: The context contains analysis from different document sections. You must aggregate all positive findings. For example, if one section has the loan amount, and another has the collateral vehicle, include both details. Do NOT state that an item is missing or not provided if at least one section found it.
-
-Follow these constraints:
-1. Start with a direct answer or summary.
-2. List the key points as structured bullet points or numbered items where appropriate.
-3. Keep explanations concise.
-4. Maximum 250 words total.
-5. NO meta-commentary, NO reasoning process.
-6. Answer ONLY the specific question asked. Do NOT include unrelated fields, information, or details not directly requested in the query.
-
-Answer:"""
+        # Use LLM to synthesize final answer, reducing hierarchically when the context exceeds the budget
+        llm = get_watsonx_llm()
+        combine_outcomes = []
+        reduce_levels = 0
         
         try:
-            raw_answer = llm.invoke(synthesis_prompt)
+            raw_answer, reduce_levels = tree_reduce_combine(llm, query, section_analyses, combine_outcomes)
             
             # Clean up meta-commentary and reasoning
-            final_answer = raw_answer
-            
-            # Remove common meta-commentary patterns
-            cleanup_patterns = [
-                "User We need to",
-                "We need to craft",
-                "Let's produce",
-                "assistantfinal",
-                "We have to combine",
-                "Provide a concise",
-                "Let's",
-            ]
-            
-            for pattern in cleanup_patterns:
-                if pattern in final_answer:
-                    # Find where actual answer starts (after the meta-commentary)
-                    parts = final_answer.split(pattern, 1)
-                    if len(parts) > 1:
-                        # Take everything after the first occurrence
-                        remaining = parts[1]
-                        # Find the next line break or start of actual content
-                        lines = remaining.split('\n')
-                        # Skip empty lines and find where content starts
-                        for i, line in enumerate(lines):
-                            if line.strip() and not any(x in line.lower() for x in ['we need', 'let\'s', 'provide']):
-                                final_answer = '\n'.join(lines[i:])
-                                break
+            final_answer = clean_llm_answer(raw_answer)
             
             print("✓ COMBINE PHASE: Final answer generated successfully")
         except Exception as e:
@@ -377,22 +1169,30 @@ Answer:"""
             sub_agents_details += f"    * *Scanner Verdict & Reason*: {relevance_reason}\n"
             sub_agents_details += f"    * *Sub-agent Analysis Snippet*: \"{analysis_preview}\"\n"
 
-        # Dynamically calculate document stats to prevent hardcoding
-        try:
-            document_text = load_pdf_document(PDF_PATH)
-            query_hash = len(query)
-            chunk_size = 1400 + ((query_hash % 4) * 200)
-            temp_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=chunk_size,
-                chunk_overlap=150,
-                length_function=len,
-            )
-            temp_chunks = temp_splitter.split_text(document_text)
-            total_chunks = len(temp_chunks)
-        except Exception:
-            total_chunks = 6 # fallback value
+        # Document stats recorded by the scan phase
+        loaded_documents = state.get("loaded_documents") or []
+        total_chunks = sum(doc["chunks"] for doc in loaded_documents) or len(scanned_sections)
+        documents_loaded = ", ".join(f"`{doc['file']}` ({doc['pages']} pages)" for doc in loaded_documents)
             
-        scanned_chunks = total_chunks
+        scan_stats = state.get("scan_stats") or {"mode": "llm", "candidates": total_chunks, "llm_calls_avoided": 0}
+        relevance_filtering = {
+            "llm": "Chunked document and analyzed each section using watsonx.ai LLM.",
+            "embedding": f"Ranked all {total_chunks} sections by embedding cosine similarity (`{EMBEDDING_MODEL_ID}`); no LLM relevance calls.",
+            "hybrid": f"Shortlisted {scan_stats['candidates']} of {total_chunks} sections by embedding cosine similarity (`{EMBEDDING_MODEL_ID}`), then judged the shortlist with watsonx.ai LLM.",
+        }[scan_stats["mode"]]
+        
+        _record_timing(state, "combine", time.perf_counter() - phase_start, combine_outcomes)
+        timings = state["timings"]
+        scan_timing = timings.get("scan", {"wall_clock": 0.0, "llm_time": 0.0, "llm_calls": 0, "cache_hits": 0})
+        delegate_timing = timings.get("delegate", {"wall_clock": 0.0, "llm_time": 0.0, "llm_calls": 0, "cache_hits": 0})
+        combine_timing = timings["combine"]
+        
+        # Response cache hits/misses for this query and cumulatively for the process
+        query_llm_calls = sum(timing["llm_calls"] for timing in timings.values())
+        query_cache_hits = sum(timing.get("cache_hits", 0) for timing in timings.values())
+        cache_stats = llm_response_cache.stats()
+        
+        scanned_chunks = scan_timing["llm_calls"]
         num_subagents = len(delegated_results)
         num_iterations = scanned_chunks
         
@@ -403,17 +1203,23 @@ Answer:"""
         total_tokens = scan_tokens + delegate_tokens + combine_tokens
         
         # 5 Other Metrics:
-        doc_coverage = "100.0%"
+        evaluated_chunks = scan_stats.get("evaluated", scanned_chunks)
+        doc_coverage = f"{min(evaluated_chunks / total_chunks, 1.0) * 100:.1f}%" if total_chunks else "n/a"
         context_compression = f"{(1 - (len(scanned_sections) / total_chunks)) * 100:.1f}%"
-        latency_speedup = f"{num_subagents:.1f}x"
+        # Measured speedup: summed LLM call time vs. wall-clock of the concurrent phases
+        total_wall_clock = sum(timing["wall_clock"] for timing in timings.values())
+        total_llm_time = sum(timing["llm_time"] for timing in timings.values())
+        parallel_wall_clock = scan_timing["wall_clock"] + delegate_timing["wall_clock"]
+        parallel_llm_time = scan_timing["llm_time"] + delegate_timing["llm_time"]
+        latency_speedup = f"{parallel_llm_time / parallel_wall_clock:.1f}x" if parallel_wall_clock > 0 else "n/a"
         mem_savings = f"{(total_chunks - len(scanned_sections)) * 2.0:.1f} KB"
         api_cost = f"${total_tokens * 0.0000025:.6f}"
 
         rlm_summary = f"""### 🧠 RLM (Reduced Language Model) Execution Summary
 
 #### 🔍 1. SCAN Phase
-* **Document Loaded**: `bank_loan_document.pdf` (10 pages)
-* **Relevance Filtering**: Chunked document and analyzed each section using watsonx.ai LLM.
+* **Documents Loaded**: {documents_loaded}
+* **Relevance Filtering**: {relevance_filtering}
 * **Scan Result**: Identified **{len(scanned_sections)}** relevant section(s) matching the query.
 
 #### 🤖 2. DELEGATE Phase
@@ -423,17 +1229,25 @@ Answer:"""
 
 #### 🔗 3. COMBINE Phase
 * **Action**: Synthesized and de-duplicated information from all active sub-agents into a final response.
-* **LLM Engine**: watsonx.ai (`openai/gpt-oss-120b`)
+* **Hierarchical Reduce**: {reduce_levels} intermediate level(s), {combine_timing["llm_calls"]} synthesis call(s) (context budget ~{COMBINE_TOKEN_BUDGET:,} tokens per prompt).
+* **LLM Engine**: watsonx.ai (`{LLM_MODEL_ID}`), shared client with prompt-hash response cache
 
 #### 📊 RLM Model Execution Metrics
 | Metric | Value | Description |
 | :--- | :--- | :--- |
-| **Scanning Iterations** | {num_iterations} | Number of sequential evaluations performed in the Scan Phase |
-| **Active Sub-Agents** | {num_subagents} | Parallel workers spawned to analyze relevant sections |
+| **Scanning Iterations** | {num_iterations} | Number of relevance evaluations performed in the Scan Phase |
+| **Active Sub-Agents** | {num_subagents} | Concurrent workers spawned to analyze relevant sections (max {MAX_CONCURRENT_LLM_CALLS} in flight) |
 | **Total Processed Tokens** | {total_tokens:,} | Total token throughput across scan, delegate, and combine phases |
-| **Document Coverage** | {doc_coverage} | Proportion of the PDF scanned and evaluated |
+| **LLM Cache Hits** | {query_cache_hits} / {query_llm_calls} | Calls served from the prompt-hash response cache for this query (misses: {query_llm_calls - query_cache_hits}) |
+| **LLM Cache Totals** | {cache_stats["hits"]} hits / {cache_stats["misses"]} misses | Cumulative response cache counters for this process ({cache_stats["entries"]} entries cached) |
+| **LLM Calls Avoided** | {scan_stats["llm_calls_avoided"]} | Relevance checks skipped by the `{scan_stats["mode"]}` scan mode and early stop |
+| **Document Coverage** | {doc_coverage} | Proportion of the document's sections judged for relevance ({evaluated_chunks} of {total_chunks}) |
 | **Context Compression** | {context_compression} | Irrelevant context filtered out before the Delegate Phase |
-| **Latency Speedup (Est.)** | {latency_speedup} | Ideal execution speed multiplier from parallel sub-agents |
+| **Scan Phase Time** | {scan_timing["wall_clock"]:.2f}s | Wall-clock time of the Scan Phase ({scan_timing["llm_time"]:.2f}s of LLM calls) |
+| **Delegate Phase Time** | {delegate_timing["wall_clock"]:.2f}s | Wall-clock time of the Delegate Phase ({delegate_timing["llm_time"]:.2f}s of LLM calls) |
+| **Combine Phase Time** | {combine_timing["wall_clock"]:.2f}s | Wall-clock time of the Combine Phase ({combine_timing["llm_time"]:.2f}s of LLM calls) |
+| **Total Wall-Clock Time** | {total_wall_clock:.2f}s | End-to-end time across all three phases ({total_llm_time:.2f}s of LLM calls) |
+| **Latency Speedup** | {latency_speedup} | Measured LLM call time divided by wall-clock time in the concurrent Scan and Delegate phases |
 | **Memory Savings** | {mem_savings} | Memory saved by excluding non-relevant document chunks |
 | **Estimated API Cost** | {api_cost} | Approximate watsonx.ai token usage cost |
 """
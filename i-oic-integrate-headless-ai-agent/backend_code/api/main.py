@@ -2,15 +2,16 @@
 FastAPI proxy for a threaded, streaming chat backend.
 
 - Provides a Server-Sent Events (SSE) endpoint: /chat
-- Provides a non-streaming convenience endpoint: /chat/v2
+- Provides a non-streaming convenience endpoint: /chat/v2 (pass stream=1 to relay the
+  upstream stream as SSE instead of polling for the result)
 """
 
 import asyncio
 import json
 import os
-import time
+import random
 from time import monotonic
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from dotenv import find_dotenv, load_dotenv
 from fastapi import FastAPI, HTTPException
@@ -48,9 +49,22 @@ app.add_middleware(
 
 # --- Shared HTTP client + token cache ---
 TOKEN_TTL_SECONDS = int(os.getenv("TOKEN_TTL_SECONDS", str(50 * 60)))  # match provider
+# Renew the token this long before it expires, so requests never wait on an expired token
+TOKEN_REFRESH_MARGIN_SECONDS = int(os.getenv("TOKEN_REFRESH_MARGIN_SECONDS", "120"))
 app.state.client = None
 app.state.token = None
 app.state.token_exp = 0.0
+app.state.token_lock = asyncio.Lock()
+
+# --- Run result polling ---
+# Polls start fast and back off exponentially (with jitter, so many waiting clients do not
+# poll in lockstep) until the run finishes or the deadline passes.
+POLL_INITIAL_INTERVAL_S = float(os.getenv("POLL_INITIAL_INTERVAL_S", "0.25"))
+POLL_MAX_INTERVAL_S = float(os.getenv("POLL_MAX_INTERVAL_S", "5"))
+POLL_BACKOFF_FACTOR = float(os.getenv("POLL_BACKOFF_FACTOR", "2"))
+POLL_TIMEOUT_S = float(os.getenv("POLL_TIMEOUT_S", "60"))
+# Concurrent waits on the same run share one poller
+app.state.run_waits = {}
 
 
 @app.on_event("startup")
@@ -69,10 +83,27 @@ async def _shutdown():
 
 
 async def get_token() -> str:
-    """Fetches and caches a short-lived token."""
+    """
+    Fetches and caches a short-lived token.
+
+    The token is renewed TOKEN_REFRESH_MARGIN_SECONDS before it expires; concurrent callers
+    share a single refresh, and callers arriving while it runs keep using the still-valid token.
+    """
     now = monotonic()
-    if app.state.token and now < app.state.token_exp:
+    if app.state.token and now < app.state.token_exp - TOKEN_REFRESH_MARGIN_SECONDS:
         return app.state.token
+    if app.state.token and now < app.state.token_exp and app.state.token_lock.locked():
+        return app.state.token
+    async with app.state.token_lock:
+        # Another request may have refreshed the token while this one waited
+        if app.state.token and monotonic() < app.state.token_exp - TOKEN_REFRESH_MARGIN_SECONDS:
+            return app.state.token
+        return await _fetch_token()
+
+
+async def _fetch_token() -> str:
+    """Requests a new token from TOKEN_ENDPOINT and caches it."""
+    now = monotonic()
     # Choose headers based on endpoint
     if "iam.cloud.ibm.com" in TOKEN_ENDPOINT:
         headers = {
@@ -95,7 +126,12 @@ async def get_token() -> str:
             status_code=502, detail="Auth server did not return a token."
         )
     app.state.token = tok
-    app.state.token_exp = now + TOKEN_TTL_SECONDS
+    # Prefer the lifetime reported by the provider over the configured default
+    expires_in = data.get("expires_in")
+    if isinstance(expires_in, (int, float)) and expires_in > 0:
+        app.state.token_exp = now + expires_in
+    else:
+        app.state.token_exp = now + TOKEN_TTL_SECONDS
     return tok
 
 
@@ -126,8 +162,14 @@ async def chat_non_stream(
     agent_id: str,
     thread_id: Optional[str] = None,
     include_raw: int = 0,  # <-- made plain int
+    stream: int = 0,
 ):
-    """Non-streaming convenience endpoint. Tries inline result; if needed, polls by run_id."""
+    """
+    Non-streaming convenience endpoint. Tries inline result; if needed, polls by run_id.
+
+    With stream=1 the upstream run is streamed instead and relayed as Server-Sent Events,
+    without any polling.
+    """
     try:
         token = await get_token()
         headers = {
@@ -137,6 +179,13 @@ async def chat_non_stream(
         body = {"message": {"role": "user", "content": query}, "agent_id": agent_id}
         if thread_id:
             body["thread_id"] = thread_id
+
+        if stream:
+            return StreamingResponse(
+                _relay_run_stream(headers, body, thread_id),
+                media_type="text/event-stream",
+            )
+
         params = {"stream": "false", "multiple_content": "true"}
 
         trig = await app.state.client.post(
@@ -170,7 +219,7 @@ async def chat_non_stream(
                 out["raw"] = trig_data
             return JSONResponse(out)
 
-        final_data = await _poll_run_result(run_id, headers)
+        final_data = await _wait_for_run(run_id, headers)
         final_text = _extract_final_text(final_data) or ""
         returned_thread = final_data.get("thread_id") or returned_thread
         status = final_data.get("status") or "completed"
@@ -200,28 +249,114 @@ async def chat_non_stream(
 # ---------------- Helpers ----------------
 
 
+async def _wait_for_run(run_id: str, headers: dict) -> dict:
+    """Waits for a run, joining the poller of another request waiting on the same run."""
+    task = app.state.run_waits.get(run_id)
+    if task is None:
+        task = asyncio.ensure_future(_poll_run_result(run_id, headers))
+        app.state.run_waits[run_id] = task
+        task.add_done_callback(lambda _: app.state.run_waits.pop(run_id, None))
+    # A client disconnecting must not cancel the poll other requests are waiting on
+    return await asyncio.shield(task)
+
+
 async def _poll_run_result(
-    run_id: str, headers: dict, timeout_s: int = 60, interval_s: float = 0.7
+    run_id: str,
+    headers: dict,
+    timeout_s: float = POLL_TIMEOUT_S,
+    initial_interval_s: float = POLL_INITIAL_INTERVAL_S,
+    max_interval_s: float = POLL_MAX_INTERVAL_S,
 ):
-    """Polls <RUN_RESULT_URL>/<run_id> until completed or failed or timeout."""
+    """
+    Polls <RUN_RESULT_URL>/<run_id> until completed or failed or timeout.
+
+    The interval grows by POLL_BACKOFF_FACTOR up to max_interval_s, with jitter, and a
+    Retry-After sent by the upstream is honoured.
+    """
     url = f"{RUN_RESULT_URL.rstrip('/')}/{run_id}"
-    start = time.time()
+    deadline = monotonic() + timeout_s
+    interval_s = initial_interval_s
     while True:
         r = await app.state.client.get(url, headers=headers)
-        r.raise_for_status()
-        data = r.json()
-        status = (
-            data.get("status") or data.get("state") or data.get("run_status") or ""
-        ).lower()
-        if status in {"completed", "succeeded", "success", "done"}:
-            return data
-        if status in {"failed", "error", "cancelled"}:
-            raise HTTPException(
-                status_code=400, detail=f"Run failed: {json.dumps(data)}"
-            )
-        if time.time() - start > timeout_s:
+        retry_after = None
+        if r.status_code == 429:
+            retry_after = _retry_after_seconds(r)
+        else:
+            r.raise_for_status()
+            data = r.json()
+            status = (
+                data.get("status") or data.get("state") or data.get("run_status") or ""
+            ).lower()
+            if status in {"completed", "succeeded", "success", "done"}:
+                return data
+            if status in {"failed", "error", "cancelled"}:
+                raise HTTPException(
+                    status_code=400, detail=f"Run failed: {json.dumps(data)}"
+                )
+        remaining = deadline - monotonic()
+        if remaining <= 0:
             raise HTTPException(status_code=408, detail="Polling timed out.")
-        await asyncio.sleep(interval_s)
+        if retry_after is None:
+            retry_after = random.uniform(interval_s / 2, interval_s)
+        await asyncio.sleep(min(retry_after, remaining))
+        interval_s = min(interval_s * POLL_BACKOFF_FACTOR, max_interval_s)
+
+
+def _retry_after_seconds(response: httpx.Response) -> float:
+    """Reads the Retry-After header of a throttled response, defaulting to one second."""
+    try:
+        return max(float(response.headers.get("Retry-After", "1")), 0.0)
+    except ValueError:
+        return 1.0
+
+
+async def _relay_run_stream(
+    headers: dict, body: dict, thread_id: Optional[str]
+) -> AsyncIterator[str]:
+    """Starts a streamed run and relays its text deltas as Server-Sent Events."""
+    params = {"stream": "true", "stream_timeout": "120000", "multiple_content": "true"}
+    try:
+        async with app.state.client.stream(
+            "POST", THREAD_ENDPOINT, headers=headers, params=params, json=body, timeout=None
+        ) as response:
+            if response.status_code != 200:
+                error_text = (await response.aread()).decode(errors="replace")
+                yield _sse({"error_message": True, "response": f"Upstream error: {error_text}"})
+                return
+
+            async for line in response.aiter_lines():
+                line = line.strip()
+                if line.startswith("data:"):
+                    line = line[5:].strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(event, dict):
+                    continue
+                data = event.get("data") or {}
+                thread_id = data.get("thread_id") or thread_id
+                if event.get("event") == "message.delta":
+                    for part in (data.get("delta") or {}).get("content", []):
+                        if part.get("response_type") == "text" and part.get("text"):
+                            yield _sse(
+                                {
+                                    "error_message": False,
+                                    "response": part["text"],
+                                    "thread_id": thread_id,
+                                }
+                            )
+        yield _sse(
+            {"error_message": False, "status": "completed", "response": "", "thread_id": thread_id}
+        )
+    except httpx.HTTPError as e:
+        yield _sse({"error_message": True, "response": f"Upstream error: {e}"})
+
+
+def _sse(payload: dict) -> str:
+    return f"data: {json.dumps(payload)}\n\n"
 
 
 def _extract_final_text(payload: dict) -> str:
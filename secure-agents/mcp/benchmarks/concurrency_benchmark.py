@@ -0,0 +1,116 @@
+"""
+Concurrency benchmark for the ProductService data path.
+
+Runs N parallel callers of `ProductService.list_all_products` against a
+mongomock stand-in for MongoDB and compares:
+
+- blocking: the service methods run directly on the event loop (the
+  previous behaviour)
+- offloaded: the service methods run on the database executor
+
+A simulated round-trip latency is added to every connection lookup, standing
+in for the Vault login and the `ping` done per request. The benchmark also
+reports the worst event loop lag seen by a ticker task, which is what every
+other connected user experiences while a call blocks the loop.
+
+Usage:
+    PYTHONPATH=src python benchmarks/concurrency_benchmark.py --callers 50
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import List, Tuple
+
+import mongomock
+
+import product_service
+from config import get_config
+from product_service import ProductService
+
+
+class FakeDatabaseManager:
+    """DatabaseManager stand-in serving one mongomock client with a simulated latency."""
+
+    def __init__(self, latency_seconds: float, documents: int):
+        self.latency_seconds = latency_seconds
+        self.client = mongomock.MongoClient()
+        config = get_config()
+        collection = self.client[config.db_name][config.collection_name]
+        collection.insert_many(
+            [{"name": f"Product {i}", "price": 1.0 + i} for i in range(documents)]
+        )
+
+    def get_mongo_client(self, jwt_token, x_correlation_id, operation="read"):
+        time.sleep(self.latency_seconds)
+        return self.client
+
+
+async def _measure_loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """Return the worst delay of a periodic ticker while the benchmark runs."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def _run(mode: str, callers: int, limit: int) -> Tuple[List[float], float, float]:
+    """Run the callers concurrently and return their latencies, wall time and loop lag."""
+    blocking_list = ProductService.list_all_products.__wrapped__
+
+    async def call(index: int) -> float:
+        service = ProductService(jwt_token="token", x_correlation_id=f"bench-{index}")
+        start = time.perf_counter()
+        if mode == "blocking":
+            blocking_list(service, limit)
+        else:
+            await service.list_all_products(limit)
+        return time.perf_counter() - start
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_loop_lag(stop))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(call(i) for i in range(callers)))
+    wall = time.perf_counter() - start
+    stop.set()
+    return list(latencies), wall, await lag_task
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--callers", type=int, default=50, help="Parallel callers")
+    parser.add_argument(
+        "--latency-ms", type=float, default=20.0, help="Simulated round trip per call"
+    )
+    parser.add_argument("--documents", type=int, default=1000, help="Products in the collection")
+    parser.add_argument("--limit", type=int, default=10, help="Products returned per call")
+    args = parser.parse_args()
+
+    # Per-call INFO logs would dominate the measurement
+    logging.disable(logging.INFO)
+
+    fake_manager = FakeDatabaseManager(args.latency_ms / 1000, args.documents)
+    product_service.get_db_manager = lambda: fake_manager
+
+    print(
+        f"{args.callers} parallel callers, {args.latency_ms:.0f} ms simulated latency, "
+        f"{args.documents} products"
+    )
+    print(f"{'mode':<10} {'wall s':>8} {'p50 ms':>8} {'p95 ms':>8} {'max loop lag ms':>16}")
+    for mode in ("blocking", "offloaded"):
+        latencies, wall, lag = asyncio.run(_run(mode, args.callers, args.limit))
+        latencies.sort()
+        p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+        print(
+            f"{mode:<10} {wall:>8.2f} {statistics.median(latencies) * 1000:>8.1f} "
+            f"{p95 * 1000:>8.1f} {lag * 1000:>16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
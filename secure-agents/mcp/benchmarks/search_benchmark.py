@@ -0,0 +1,114 @@
+"""
+Query plan benchmark for product name search.
+
+Seeds a local MongoDB with generated products (1M by default) and compares
+the previous unanchored case-insensitive regex on `name` with the indexed
+queries of `product_search`, using `explain("executionStats")`.
+
+Requires a MongoDB server; the seeded database is dropped when done unless
+`--keep` is given.
+
+Usage:
+    PYTHONPATH=src python benchmarks/search_benchmark.py --uri mongodb://localhost:27017
+"""
+
+import argparse
+import logging
+import random
+import time
+from typing import Any, Dict, List
+
+from pymongo import ASCENDING, MongoClient
+from pymongo.collection import Collection
+
+from product_search import (
+    PRODUCT_PROJECTION,
+    build_legacy_name_query,
+    build_name_query,
+    ensure_search_indexes,
+    search_fields,
+)
+
+ADJECTIVES = ["Ultra", "Comfort", "Classic", "Pro", "Eco", "Smart", "Compact", "Deluxe"]
+NOUNS = ["Running Shoes", "Laptop", "Backpack", "Headphones", "Desk Lamp", "Water Bottle"]
+
+# (search term, exact match) pairs measured with both query shapes
+QUERIES = [
+    ("running", False),
+    ("ultra comfort", False),
+    ("lamp", False),
+    ("Eco Laptop 123456", True),
+]
+
+
+def _seed(collection: Collection, products: int, batch_size: int = 10000) -> None:
+    """Insert generated products carrying the search fields."""
+    rng = random.Random(42)
+    batch: List[Dict[str, Any]] = []
+    for i in range(products):
+        name = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}"
+        batch.append({"name": name, "price": round(rng.uniform(1, 500), 2), **search_fields(name)})
+        if len(batch) == batch_size:
+            collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+
+
+def _explain(collection: Collection, query: Dict[str, Any], limit: int) -> Dict[str, Any]:
+    """Run a search query through explain and return its execution statistics."""
+    cursor = collection.find(query, PRODUCT_PROJECTION).sort("_id", ASCENDING).limit(limit)
+    start = time.perf_counter()
+    stats = cursor.explain()["executionStats"]
+    return {
+        "docs": stats["totalDocsExamined"],
+        "keys": stats["totalKeysExamined"],
+        "returned": stats["nReturned"],
+        "ms": (time.perf_counter() - start) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--uri", default="mongodb://localhost:27017", help="MongoDB URI")
+    parser.add_argument("--db", default="products_search_benchmark", help="Scratch database")
+    parser.add_argument("--products", type=int, default=1_000_000, help="Products to seed")
+    parser.add_argument("--limit", type=int, default=100, help="Products returned per query")
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded database")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    client = MongoClient(args.uri)
+    collection = client[args.db]["products"]
+    try:
+        if collection.estimated_document_count() != args.products:
+            collection.drop()
+            print(f"Seeding {args.products} products...")
+            start = time.perf_counter()
+            _seed(collection, args.products)
+            print(f"Seeded in {time.perf_counter() - start:.1f} s")
+        ensure_search_indexes(collection)
+
+        print(
+            f"{'query':<28} {'plan':<8} {'docs examined':>14} {'keys examined':>14} "
+            f"{'returned':>9} {'ms':>9}"
+        )
+        for term, exact_match in QUERIES:
+            label = f"{term!r}{' (exact)' if exact_match else ''}"
+            for plan, query in (
+                ("regex", build_legacy_name_query(term, exact_match)),
+                ("indexed", build_name_query(term, exact_match)),
+            ):
+                stats = _explain(collection, query, args.limit)
+                print(
+                    f"{label:<28} {plan:<8} {stats['docs']:>14} {stats['keys']:>14} "
+                    f"{stats['returned']:>9} {stats['ms']:>9.1f}"
+                )
+    finally:
+        if not args.keep:
+            client.drop_database(args.db)
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -39,6 +39,23 @@ class Config(BaseSettings):
         default=100, description="Maximum number of results to return"
     )
 
+    db_executor_max_workers: int = Field(
+        default=32, description="Threads running blocking database calls"
+    )
+    db_health_check_interval_seconds: float = Field(
+        default=30, description="Seconds a successful connection health check is trusted"
+    )
+    db_max_clients: int = Field(
+        default=100, description="Maximum number of pooled per-user MongoDB clients"
+    )
+    db_reap_interval_seconds: float = Field(
+        default=30, description="Interval of the background closing of expired clients"
+    )
+
+    stream_batch_size: int = Field(
+        default=500, description="Products read per round trip when streaming the catalog"
+    )
+
     # JWT validation  settings
     jwt_issuer: str = Field(default=None, description="JWT issuer")
     jwt_audience: str = Field(default=None, description="JWT audience")
@@ -50,6 +67,18 @@ class Config(BaseSettings):
     vault_cache_enabled: bool = Field(
         default=False, description="Enable caching of Vault credentials (default: disabled for security)"
     )
+    vault_cache_max_entries: int = Field(
+        default=256, description="Maximum number of users with cached Vault credentials"
+    )
+    vault_cache_renew_before_seconds: float = Field(
+        default=60, description="Renew cached credentials this many seconds before they expire"
+    )
+    vault_cache_renew_interval_seconds: float = Field(
+        default=15, description="Interval of the background credential renewal loop"
+    )
+    vault_cache_idle_seconds: float = Field(
+        default=900, description="Evict cached credentials of users idle for this many seconds"
+    )
 
     # Log level
     log_level: str = Field(default="INFO", description="Logging level")
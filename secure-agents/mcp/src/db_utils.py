@@ -1,20 +1,26 @@
 """
 Database utilities for MongoDB connection management.
 
-This module provides a MongoDB connection manager with connection pooling,
-error handling, and MongoDB specific configurations.
+This module provides a MongoDB connection manager with a bounded per-user
+client pool, error handling, and MongoDB specific configurations.
 """
 
+import asyncio
+import functools
 import logging
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
 
 from pymongo import MongoClient
 
 from config import Config, get_config
 from jwt_verifier import decode_jwt_token
-from vault_client import get_mongodb_credentials
+from vault_client import get_credential_cache, get_mongodb_credentials
 
 # Configure logging level from .env (default to INFO)
 LOG_LEVEL = get_config().log_level.upper()
@@ -23,6 +29,264 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.getLevelNamesMapping().get(LOG_LEVEL))
 
 
+# Pooled clients are treated as expired this many seconds before their credentials
+CLIENT_EXPIRY_MARGIN_SECONDS = 10
+
+
+@dataclass
+class PooledClient:
+    """A MongoDB client bound to the credentials of one user and operation."""
+
+    client: MongoClient
+    created_at: float
+    valid_until: float
+    last_checked: float
+
+
+class MongoClientPool:
+    """
+    Bounded, thread-safe pool of per-user MongoDB clients keyed by `sub:operation`.
+
+    - Clients are reused until their credentials expire; a background thread
+      closes clients whose lease has ended.
+    - When more than `max_clients` users are connected, the least recently used
+      client is closed.
+    - Concurrent first accesses for the same key share a single connection
+      attempt (single-flight).
+    """
+
+    def __init__(
+        self,
+        max_clients: int = 100,
+        health_check_interval_seconds: float = 30,
+        reap_interval_seconds: float = 30,
+    ):
+        """
+        Initialize the client pool.
+
+        Args:
+            max_clients: Maximum number of open clients
+            health_check_interval_seconds: Seconds a successful health check is trusted
+            reap_interval_seconds: Interval of the background reaper closing expired clients
+        """
+        self.max_clients = max_clients
+        self.health_check_interval_seconds = health_check_interval_seconds
+        self.reap_interval_seconds = reap_interval_seconds
+        self._clients: "OrderedDict[str, PooledClient]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stats = {
+            "created": 0,
+            "reused": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "unhealthy": 0,
+            "waits": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    def _record_wait(self, started: float) -> None:
+        """Account for the time a caller waited on another caller's connection attempt."""
+        waited = time.perf_counter() - started
+        with self._lock:
+            self._stats["waits"] += 1
+            self._stats["wait_seconds_total"] += waited
+            self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], waited)
+
+    def _is_healthy(self, pooled: PooledClient) -> bool:
+        """
+        Check a pooled client without a round trip on every call.
+
+        A recent check is trusted for `health_check_interval_seconds`; after that the
+        topology tracked by the driver's monitor threads is consulted, and a `ping` is only
+        sent when the driver does not know of a reachable server.
+        """
+        now = time.time()
+        if now - pooled.last_checked < self.health_check_interval_seconds:
+            return True
+        try:
+            if not pooled.client.topology_description.has_readable_server():
+                pooled.client.admin.command("ping")
+        except Exception as e:
+            logger.warning(f"✗ Pooled connection is no longer active: {e}")
+            return False
+        pooled.last_checked = now
+        return True
+
+    def get_or_create(
+        self, cache_key: str, connect: Callable[[], Tuple[MongoClient, float]]
+    ) -> MongoClient:
+        """
+        Return the pooled client of a key, connecting once for all concurrent callers on a miss.
+
+        Args:
+            cache_key: The `sub:operation` key
+            connect: Creates a client and returns it with the expiry of its credentials
+
+        Returns:
+            MongoClient: Connected MongoDB client
+        """
+        while True:
+            started = time.perf_counter()
+            with self._lock:
+                pooled = self._clients.get(cache_key)
+                if (
+                    pooled is not None
+                    and time.time() + CLIENT_EXPIRY_MARGIN_SECONDS < pooled.valid_until
+                ):
+                    self._clients.move_to_end(cache_key)
+                else:
+                    pooled = None
+                    future = self._inflight.get(cache_key)
+                    owner = future is None
+                    if owner:
+                        future = Future()
+                        self._inflight[cache_key] = future
+
+            if pooled is not None:
+                if self._is_healthy(pooled):
+                    with self._lock:
+                        self._stats["reused"] += 1
+                    return pooled.client
+                with self._lock:
+                    self._stats["unhealthy"] += 1
+                self._close_if_current(cache_key, pooled)
+                continue
+
+            if not owner:
+                client = future.result()
+                self._record_wait(started)
+                return client
+
+            try:
+                client, valid_until = connect()
+            except BaseException as e:
+                with self._lock:
+                    self._inflight.pop(cache_key, None)
+                future.set_exception(e)
+                raise
+
+            now = time.time()
+            with self._lock:
+                replaced = self._clients.pop(cache_key, None)
+                self._clients[cache_key] = PooledClient(client, now, valid_until, now)
+                self._inflight.pop(cache_key, None)
+                self._stats["created"] += 1
+                evicted = []
+                while len(self._clients) > self.max_clients:
+                    evicted_key, evicted_client = self._clients.popitem(last=False)
+                    evicted.append((evicted_key, evicted_client))
+                    self._stats["evictions"] += 1
+            future.set_result(client)
+
+            if replaced is not None:
+                replaced.client.close()
+            for evicted_key, evicted_client in evicted:
+                logger.info(f"Closing least recently used connection for {evicted_key}")
+                evicted_client.client.close()
+            self._ensure_reaper()
+            return client
+
+    def extend(self, cache_key: str, valid_until: float) -> None:
+        """Extend the validity of a pooled client after its credentials lease was renewed"""
+        with self._lock:
+            pooled = self._clients.get(cache_key)
+            if pooled is not None:
+                pooled.valid_until = valid_until
+
+    def _close_if_current(self, cache_key: str, pooled: PooledClient) -> None:
+        """Close a pooled client unless it was replaced in the meantime"""
+        with self._lock:
+            if self._clients.get(cache_key) is not pooled:
+                return
+            del self._clients[cache_key]
+        pooled.client.close()
+
+    def close(self, cache_key: str) -> bool:
+        """
+        Close and remove the client of a key.
+
+        Args:
+            cache_key: The `sub:operation` key
+
+        Returns:
+            bool: True if a client was open for the key
+        """
+        with self._lock:
+            pooled = self._clients.pop(cache_key, None)
+        if pooled is None:
+            return False
+        pooled.client.close()
+        return True
+
+    def close_all(self) -> None:
+        """Close all clients and stop the reaper"""
+        self._stop.set()
+        with self._lock:
+            pooled_clients = list(self._clients.values())
+            self._clients.clear()
+            self._reaper = None
+        for pooled in pooled_clients:
+            pooled.client.close()
+
+    def reap_expired(self) -> int:
+        """
+        Close clients whose credentials have expired.
+
+        Returns:
+            int: Number of closed clients
+        """
+        deadline = time.time() + CLIENT_EXPIRY_MARGIN_SECONDS
+        with self._lock:
+            expired = [
+                (cache_key, pooled)
+                for cache_key, pooled in self._clients.items()
+                if pooled.valid_until <= deadline
+            ]
+            for cache_key, _ in expired:
+                del self._clients[cache_key]
+            self._stats["expirations"] += len(expired)
+        for cache_key, pooled in expired:
+            logger.info(f"Closing expired connection for {cache_key}")
+            pooled.client.close()
+        return len(expired)
+
+    def _ensure_reaper(self) -> None:
+        """Start the background reaper if it is not running"""
+        with self._lock:
+            if self._reaper is not None and self._reaper.is_alive():
+                return
+            self._stop = threading.Event()
+            self._reaper = threading.Thread(
+                target=self._reap_loop,
+                args=(self._stop,),
+                name="mongo-client-reaper",
+                daemon=True,
+            )
+            self._reaper.start()
+
+    def _reap_loop(self, stop: threading.Event) -> None:
+        while not stop.wait(self.reap_interval_seconds):
+            self.reap_expired()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the pool metrics.
+
+        Returns:
+            Dict[str, Any]: Open and pending clients, lifecycle counters and pool wait times
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["open_clients"] = len(self._clients)
+            stats["pending_connections"] = len(self._inflight)
+            stats["max_clients"] = self.max_clients
+        return stats
+
+
 class DatabaseManager:
     """
     MongoDB connection manager.
@@ -39,7 +303,21 @@ class DatabaseManager:
             config: Configuration object with database settings
         """
         self.config = config or Config()
-        self._connections: Dict[str, Tuple[MongoClient, float, float]] = {}
+        self._pool = MongoClientPool(
+            max_clients=self.config.db_max_clients,
+            health_check_interval_seconds=self.config.db_health_check_interval_seconds,
+            reap_interval_seconds=self.config.db_reap_interval_seconds,
+        )
+
+        if self.config.vault_cache_enabled:
+            # Keep pooled connections in step with the cached Vault credentials they use
+            credential_cache = get_credential_cache()
+            credential_cache.add_eviction_listener(self.close_connection)
+            credential_cache.add_renewal_listener(self._extend_connection)
+
+    def _extend_connection(self, cache_key: str, credentials: Dict) -> None:
+        """Extend the validity of a pooled connection after its credentials lease was renewed"""
+        self._pool.extend(cache_key, credentials["credentials_ttl"])
 
     def get_mongo_client(
         self, jwt_token: str, x_correlation_id: str, operation: str = "read"
@@ -64,137 +342,31 @@ class DatabaseManager:
             raise ValueError(
                 f"Invalid operation: {operation}. Must be 'read' or 'write'"
             )
-        logger.info("=" * 60)
-        logger.info("=== GETTING MONGODB CONNECTION ===")
-        logger.info("=" * 60)
 
         try:
             # Decode JWT to get subject claim
-            logger.info("Step 1: Decoding JWT token to extract 'sub' claim...")
-            logger.info(f"  JWT token length: {len(jwt_token)}")
-            logger.info(
-                f"  JWT token preview: {jwt_token[:20]}...{jwt_token[-10:]}")
-
             token_data = decode_jwt_token(jwt_token)
             sub = token_data.get("sub")
             if not sub:
                 logger.error("✗ JWT token does not contain 'sub' claim")
                 raise ValueError("JWT token does not contain 'sub' claim")
 
-            logger.info(f"✓ Extracted 'sub' claim: {sub}")
-
             # Create cache key with operation to separate read/write connections
             cache_key = f"{sub}:{operation}"
 
-            # Check if we have a cached connection (only if caching is enabled)
-            logger.info(
-                f"Step 2: Checking for cached MongoDB connection (operation: {operation})..."
-            )
-            logger.info(f"  Cache enabled: {self.config.vault_cache_enabled}")
-
-            if self.config.vault_cache_enabled and cache_key in self._connections:
-                client, creation_time, valid_until = self._connections[cache_key]
-                logger.info(
-                    f"  Found cached connection for user: {sub} (operation: {operation})"
-                )
-                logger.info(
-                    f"  Connection created at: {datetime.fromtimestamp(creation_time).strftime('%Y-%m-%d %H:%M:%S')}"
-                )
-                logger.info(
-                    f"  Valid until: {datetime.fromtimestamp(valid_until).strftime('%Y-%m-%d %H:%M:%S')}"
-                )
-
-                # Check if connection has expired is about to expire
-                if time.time() + 10 < valid_until:
-                    logger.info(
-                        "  Connection still valid, checking if active...")
-
-                    # Check if the client is still connected
-                    try:
-                        # The 'ping' command is a lightweight way to check connection health
-                        client.admin.command("ping")
-                        logger.info(
-                            "✓ Cached connection is active and healthy")
-                        logger.info("=" * 60)
-                        return client
-                    except Exception as e:
-                        logger.warning(
-                            f"✗ Cached connection is no longer active: {e}")
-                        logger.info(
-                            "  Closing stale connection and reconnecting...")
-                        self.close_connection(cache_key)
-                else:
-                    # Connection expired, clean up
-                    logger.info("✗ Connection expired, cleaning up...")
-                    self.close_connection(cache_key)
-            else:
-                logger.info(
-                    f"  No cached connection found for user: {sub} (operation: {operation})"
-                )
-
-            # Get fresh credentials from Vault with explicit operation
-            logger.info(
-                f"Step 3: Getting fresh credentials from Vault for '{operation}' operation..."
-            )
-            credentials = get_mongodb_credentials(
-                jwt_token, x_correlation_id, operation
-            )
-            config = get_config()
-            logger.info("✓ Received credentials from Vault")
-            logger.info(f"  Correlation ID: {x_correlation_id}")
-            logger.info(f"  Dynamic username: {credentials['username']}")
-            logger.debug(
-                f"  Dynamic password: {credentials['password'][:5]}...{credentials['password'][-5:]}"
-            )
-            logger.info(
-                f"  Database role: {credentials['user_metadata']['database_role']}"
-            )
-            ttl_timestamp = datetime.fromtimestamp(
-                credentials["credentials_ttl"]
-            ).strftime("%Y-%m-%d %H:%M:%S")
-            logger.info(
-                f"  Credentials valid until: {ttl_timestamp} ({credentials['credentials_ttl']} epoch)"
-            )
-
-            connection_string = (
-                f"mongodb://{credentials['username']}:{credentials['password']}"
-                f"@{config.db_host}:{config.db_port}"
-                f"/{config.db_name}?authSource=admin&retryWrites=false"
-            )
-
-            client_options = {
-                "maxIdleTimeMS": 30000,  # 30 seconds
-                "waitQueueTimeoutMS": 10000,  # 10 seconds
-                "directConnection": True,
-            }
-
-            # # Configure SSL for MongoDB if enabled
-            # if self.config.use_ssl:
-            #     client_options["tls"] = True
-            #     client_options["tlsCAFile"] = self.config.ssl_ca_cert_path
-
-            logger.info("Step 4: Creating MongoDB connection...")
-            client = MongoClient(connection_string, **client_options)
-            logger.info("✓ MongoDB connection established")
+            def connect() -> Tuple[MongoClient, float]:
+                return self._connect(jwt_token, x_correlation_id, operation)
 
-            # Cache the connection with its creation time and TTL (only if caching is enabled)
+            # Reuse the pooled connection of the user (only if caching is enabled). The `sub`
+            # above is unverified, so the token is first checked against the credentials the
+            # pooled client was built with: a different token logs in to Vault itself, and
+            # replacing the cached credentials closes the pooled client.
             if self.config.vault_cache_enabled:
-                self._connections[cache_key] = (
-                    client,
-                    time.time(),
-                    credentials["credentials_ttl"],
-                )
-                logger.info(
-                    f"✓ Cached connection for user: {sub} (operation: {operation})"
-                )
-                logger.info(
-                    f"  Total cached connections: {len(self._connections)}")
-            else:
-                logger.info(
-                    "✓ Connection caching is disabled (vault_cache_enabled=False)"
-                )
-
-            logger.info("=" * 60)
+                get_mongodb_credentials(jwt_token, x_correlation_id, operation)
+                return self._pool.get_or_create(cache_key, connect)
+
+            client, _ = connect()
+            logger.info("✓ Connection caching is disabled (vault_cache_enabled=False)")
             return client
 
         except Exception as e:
@@ -204,31 +376,142 @@ class DatabaseManager:
             logger.error("=" * 60)
             raise RuntimeError(f"Failed to get MongoDB connection: {str(e)}")
 
+    def _connect(
+        self, jwt_token: str, x_correlation_id: str, operation: str
+    ) -> Tuple[MongoClient, float]:
+        """
+        Create a MongoDB client with fresh credentials from Vault.
+
+        Args:
+            jwt_token: JWT token for authentication
+            x_correlation_id: Correlation ID for tracking
+            operation: Type of operation ("read" or "write")
+
+        Returns:
+            Tuple[MongoClient, float]: The client and the expiry of its credentials
+        """
+        logger.info(
+            f"Getting fresh credentials from Vault for '{operation}' operation..."
+        )
+        credentials = get_mongodb_credentials(
+            jwt_token, x_correlation_id, operation
+        )
+        config = get_config()
+        logger.info("✓ Received credentials from Vault")
+        logger.info(f"  Correlation ID: {x_correlation_id}")
+        logger.info(f"  Dynamic username: {credentials['username']}")
+        logger.info(
+            f"  Database role: {credentials['user_metadata']['database_role']}"
+        )
+        ttl_timestamp = datetime.fromtimestamp(
+            credentials["credentials_ttl"]
+        ).strftime("%Y-%m-%d %H:%M:%S")
+        logger.info(
+            f"  Credentials valid until: {ttl_timestamp} ({credentials['credentials_ttl']} epoch)"
+        )
+
+        connection_string = (
+            f"mongodb://{credentials['username']}:{credentials['password']}"
+            f"@{config.db_host}:{config.db_port}"
+            f"/{config.db_name}?authSource=admin&retryWrites=false"
+        )
+
+        client_options = {
+            "maxIdleTimeMS": 30000,  # 30 seconds
+            "waitQueueTimeoutMS": 10000,  # 10 seconds
+            "directConnection": True,
+        }
+
+        # # Configure SSL for MongoDB if enabled
+        # if self.config.use_ssl:
+        #     client_options["tls"] = True
+        #     client_options["tlsCAFile"] = self.config.ssl_ca_cert_path
+
+        client = MongoClient(connection_string, **client_options)
+        logger.info("✓ MongoDB connection established")
+        return client, credentials["credentials_ttl"]
+
     def close_connection(self, cache_key: str) -> None:
         """Close and remove a specific connection"""
-        if cache_key in self._connections:
-            client, _, _ = self._connections[cache_key]
-            client.close()
-            del self._connections[cache_key]
+        self._pool.close(cache_key)
 
     def close_all_connections(self) -> None:
         """Close all connections"""
-        for cache_key in list(self._connections.keys()):
-            self.close_connection(cache_key)
+        self._pool.close_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the connection pool metrics.
+
+        Returns:
+            Dict[str, Any]: Open clients, evictions, expirations and pool wait times
+        """
+        return self._pool.stats()
 
 
 # Global database manager instance
 _db_manager: Optional[DatabaseManager] = None
+_db_manager_lock = threading.Lock()
 
 
 def get_db_manager() -> DatabaseManager:
     """
     Get global database manager instance.
 
+    The first call may come from several executor threads at once; the lock
+    makes sure only one manager, client pool and set of listeners is created.
+
     Returns:
         DatabaseManager: Global database manager instance
     """
     global _db_manager
     if _db_manager is None:
-        _db_manager = DatabaseManager()
+        with _db_manager_lock:
+            if _db_manager is None:
+                _db_manager = DatabaseManager()
     return _db_manager
+
+
+# Dedicated pool for blocking pymongo and Vault calls, so they never run on the event loop
+_db_executor: Optional[ThreadPoolExecutor] = None
+_db_executor_lock = threading.Lock()
+
+T = TypeVar("T")
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool running blocking database calls.
+
+    Returns:
+        ThreadPoolExecutor: Global database executor
+    """
+    global _db_executor
+    with _db_executor_lock:
+        if _db_executor is None:
+            _db_executor = ThreadPoolExecutor(
+                max_workers=get_config().db_executor_max_workers,
+                thread_name_prefix="db",
+            )
+        return _db_executor
+
+
+def offload_to_db_executor(func: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    """
+    Turn a blocking function into a coroutine function running it on the database executor.
+
+    Args:
+        func: Blocking function doing database or Vault I/O
+
+    Returns:
+        Coroutine function with the same signature
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_db_executor(), functools.partial(func, *args, **kwargs)
+        )
+
+    return wrapper
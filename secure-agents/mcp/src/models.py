@@ -44,6 +44,20 @@ class ProductListResponse(BaseModel):
         default_factory=list, description="List of products"
     )
     count: int = Field(0, description="Number of products returned")
+    next_cursor: Optional[str] = Field(
+        None, description="Continuation token of the next page, if any"
+    )
+
+
+class ProductPage(BaseModel):
+    """A page of products with the continuation token of the next page."""
+
+    products: list[Product] = Field(
+        default_factory=list, description="List of products"
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Continuation token of the next page, if any"
+    )
 
 
 class ErrorResponse(BaseModel):
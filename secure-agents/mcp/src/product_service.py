@@ -6,7 +6,7 @@ product-related operations against MongoDB.
 """
 
 import logging
-from typing import List, Optional
+from typing import AsyncIterator, Callable, List, Optional
 
 from bson import ObjectId
 from pymongo import ASCENDING, DESCENDING
@@ -17,8 +17,17 @@ from pymongo.errors import (
 )
 
 from config import get_config
-from db_utils import get_db_manager
-from models import Product, SuccessResponse
+from db_utils import get_db_manager, offload_to_db_executor
+from models import Product, ProductPage, SuccessResponse
+from product_search import (
+    PRODUCT_PROJECTION,
+    build_legacy_name_query,
+    build_name_query,
+    decode_cursor,
+    encode_cursor,
+    search_fields,
+    search_indexes,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -29,7 +38,9 @@ class ProductService:
     Product service class for managing product operations.
 
     This class provides methods to perform CRUD operations on products
-    stored in MongoDB with proper error handling and validation.
+    stored in MongoDB with proper error handling and validation. The
+    operations are coroutines whose blocking pymongo and Vault calls run on
+    the database executor, so concurrent tool calls do not stall the event loop.
     """
 
     def __init__(self, jwt_token: str = None, x_correlation_id: str = None):
@@ -66,50 +77,154 @@ class ProductService:
         # to avoid potential issues with database name resolution
         return client[self.config.db_name][self.config.collection_name]
 
-    async def list_all_products(self, limit: Optional[int] = None) -> List[Product]:
+    def _search_indexes_ready(
+        self, get_collection: Optional[Callable[[], Collection]] = None
+    ) -> bool:
         """
-        List all products from the database.
+        Check whether the name search indexes are ready, without creating them.
 
         Args:
-            limit: Maximum number of products to return
+            get_collection: Returns the products collection used for the check,
+                the one with read access by default
 
         Returns:
-            List[Product]: List of all products
+            bool: True if the indexed search fields can be queried
+        """
+        return search_indexes.check(get_collection or self._get_collection_for_read)
+
+    def _read_page(
+        self,
+        sort_by: str,
+        ascending: bool,
+        limit: Optional[int],
+        cursor: Optional[str],
+        batch_size: Optional[int] = None,
+    ) -> ProductPage:
+        """
+        Read one page of products ordered by ID or by price, continuing after a cursor.
+
+        Pages are walked with a keyset on the sort key and the ID, so later
+        pages cost the same as the first one.
+
+        Args:
+            sort_by: "id" or "price"
+            ascending: If True, sort ascending; otherwise, descending
+            limit: Maximum number of products to return, capped at `max_results`
+                unless a batch size is given
+            cursor: Continuation token returned with the previous page
+            batch_size: Page size used when streaming, bypassing the `max_results` cap
+
+        Returns:
+            ProductPage: The products and the continuation token of the next page
 
         Raises:
-            OperationFailure: If database operation fails
+            ValueError: If the cursor is invalid or belongs to another ordering
         """
-        try:
-            collection = self._get_collection_for_read()
+        if batch_size is not None:
+            query_limit = batch_size
+        else:
             query_limit = min(limit or self.config.max_results,
                               self.config.max_results)
+        direction = ASCENDING if ascending else DESCENDING
+        comparison = "$gt" if ascending else "$lt"
+
+        query = {}
+        if cursor:
+            position = decode_cursor(cursor)
+            after_id = position.get("id")
+            if (
+                position.get("sort") != sort_by
+                or position.get("asc") != ascending
+                or not isinstance(after_id, str)
+                or not ObjectId.is_valid(after_id)
+            ):
+                raise ValueError(f"Invalid cursor for this ordering: {cursor}")
+            if sort_by == "price":
+                query = {
+                    "$or": [
+                        {"price": {comparison: position.get("price")}},
+                        {
+                            "price": position.get("price"),
+                            "_id": {comparison: ObjectId(after_id)},
+                        },
+                    ]
+                }
+            else:
+                query = {"_id": {comparison: ObjectId(after_id)}}
+
+        sort = [("_id", direction)]
+        if sort_by == "price":
+            sort.insert(0, ("price", direction))
+
+        collection = self._get_collection_for_read()
+        # One extra document tells whether there is a next page, and a batch
+        # size covering the page fetches it in a single round trip
+        docs = list(
+            collection.find(query, dict(PRODUCT_PROJECTION))
+            .sort(sort)
+            .limit(query_limit + 1)
+            .batch_size(query_limit + 1)
+        )
+        has_more = len(docs) > query_limit
+        docs = docs[:query_limit]
+
+        next_cursor = None
+        if has_more:
+            position = {"sort": sort_by, "asc": ascending, "id": str(docs[-1]["_id"])}
+            if sort_by == "price":
+                position["price"] = docs[-1].get("price")
+            next_cursor = encode_cursor(position)
+        return ProductPage(
+            products=self._products_from_docs(docs), next_cursor=next_cursor
+        )
+
+    def _products_from_docs(self, docs: List[dict]) -> List[Product]:
+        """Convert product documents to models, skipping invalid documents."""
+        products = []
+        for doc in docs:
+            try:
+                product = Product(
+                    id=str(doc["_id"]),
+                    name=doc.get("name"),
+                    price=doc.get("price"),
+                )
+                products.append(product)
+            except Exception as e:
+                logger.error(
+                    f"{self.x_correlation_id} - Error parsing product document {doc.get('_id', 'unknown')}: {e}"
+                )
+        return products
+
+    @offload_to_db_executor
+    def list_all_products(
+        self, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> ProductPage:
+        """
+        List products from the database, ordered by ID.
+
+        Args:
+            limit: Maximum number of products to return
+            cursor: Continuation token returned with the previous page
+
+        Returns:
+            ProductPage: The products and the continuation token of the next page
 
+        Raises:
+            OperationFailure: If database operation fails
+            ValueError: If the cursor is invalid
+        """
+        try:
             logger.info(
-                f"{self.x_correlation_id} - Fetching products with limit: {query_limit}"
+                f"{self.x_correlation_id} - Fetching products with limit: {limit}"
             )
 
-            cursor = collection.find({}).limit(query_limit)
-            products = []
-
-            for doc in cursor:
-                try:
-                    product = Product(
-                        id=str(doc["_id"]),
-                        name=doc.get("name"),
-                        price=doc.get("price"),
-                    )
-                    products.append(product)
-                except Exception as e:
-                    logger.error(
-                        f"{self.x_correlation_id} - Error parsing product document {doc.get('_id', 'unknown')}: {e}"
-                    )
-                    continue
+            page = self._read_page("id", True, limit, cursor)
 
             logger.info(
-                f"{self.x_correlation_id} - Retrieved {len(products)} products")
-            return products
+                f"{self.x_correlation_id} - Retrieved {len(page.products)} products")
+            return page
 
-        except OperationFailure as e:
+        except (OperationFailure, ValueError) as e:
             logger.error(
                 f"{self.x_correlation_id} - Database operation failed while listing products: {e}"
             )
@@ -120,47 +235,113 @@ class ProductService:
             )
             raise OperationFailure(f"Failed to list products: {e}")
 
-    async def search_by_name(
-        self, name: str, exact_match: bool = False
-    ) -> List[Product]:
+    async def stream_products(
+        self,
+        sort_by: str = "id",
+        ascending: bool = True,
+        batch_size: Optional[int] = None,
+        max_items: Optional[int] = None,
+    ) -> AsyncIterator[Product]:
+        """
+        Walk the catalog lazily, one batch in memory at a time.
+
+        Each batch is a keyset page read on the database executor, so large
+        catalogs can be consumed without skip/limit costs or loading them whole.
+
+        Args:
+            sort_by: "id" or "price"
+            ascending: If True, sort ascending; otherwise, descending
+            batch_size: Products read per round trip, defaults to `stream_batch_size`
+            max_items: Maximum number of products to yield, all products when None
+
+        Returns:
+            AsyncIterator[Product]: The products in the requested order
+        """
+        if sort_by not in ("id", "price"):
+            raise ValueError(f"Invalid sort field: {sort_by}. Must be 'id' or 'price'")
+        batch_size = batch_size or self.config.stream_batch_size
+        read_page = offload_to_db_executor(self._read_page)
+
+        yielded = 0
+        cursor = None
+        while max_items is None or yielded < max_items:
+            if max_items is not None:
+                batch_size = min(batch_size, max_items - yielded)
+            page = await read_page(sort_by, ascending, None, cursor, batch_size)
+            for product in page.products:
+                yield product
+            yielded += len(page.products)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+    @offload_to_db_executor
+    def search_by_name(
+        self,
+        name: str,
+        exact_match: bool = False,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> ProductPage:
         """
         Search products by name.
 
+        The search term is matched literally and case-insensitively. Exact
+        matches compare the whole name; partial matches find names containing
+        the term at the start of a word. Results are ordered by ID and returned
+        one page at a time.
+
         Args:
             name: Product name to search for
             exact_match: If True, search for exact match; otherwise, partial match
+            limit: Maximum number of products to return
+            cursor: Continuation token returned with the previous page
 
         Returns:
-            List[Product]: List of matching products
+            ProductPage: Matching products and the continuation token of the next page
 
         Raises:
             OperationFailure: If database operation fails
-            ValueError: If name is empty
+            ValueError: If name is empty or the cursor is invalid
         """
         if not name or not name.strip():
             raise ValueError("Search name cannot be empty")
 
+        after_id = None
+        if cursor:
+            after_id = decode_cursor(cursor).get("id")
+            if not isinstance(after_id, str) or not ObjectId.is_valid(after_id):
+                raise ValueError(f"Invalid cursor: {cursor}")
+
         try:
-            collection = self._get_collection_for_read()
             name = name.strip()
+            query_limit = min(limit or self.config.max_results,
+                              self.config.max_results)
 
-            if exact_match:
-                # Case-insensitive exact match
-                query = {"name": {"$regex": f"^{name}$", "$options": "i"}}
-                logger.info(
-                    f"{self.x_correlation_id} - Searching for exact match: {name}"
-                )
+            if self._search_indexes_ready():
+                query = build_name_query(name, exact_match)
             else:
-                # Case-insensitive partial match
-                query = {"name": {"$regex": name, "$options": "i"}}
-                logger.info(
-                    f"{self.x_correlation_id} - Searching for partial match: {name}"
-                )
+                query = build_legacy_name_query(name, exact_match)
+            if after_id is not None:
+                query["_id"] = {"$gt": ObjectId(after_id)}
+
+            match_type = "exact" if exact_match else "partial"
+            logger.info(
+                f"{self.x_correlation_id} - Searching for {match_type} match: {name}"
+            )
 
-            cursor = collection.find(query).limit(self.config.max_results)
+            collection = self._get_collection_for_read()
+            # One extra document tells whether there is a next page
+            docs = list(
+                collection.find(query, dict(PRODUCT_PROJECTION))
+                .sort("_id", ASCENDING)
+                .limit(query_limit + 1)
+            )
+            has_more = len(docs) > query_limit
+            docs = docs[:query_limit]
             products = []
 
-            for doc in cursor:
+            for doc in docs:
                 try:
                     product = Product(
                         id=str(doc["_id"]),
@@ -177,7 +358,10 @@ class ProductService:
             logger.info(
                 f"{self.x_correlation_id} - Found {len(products)} products matching '{name}'"
             )
-            return products
+            next_cursor = (
+                encode_cursor({"id": str(docs[-1]["_id"])}) if has_more else None
+            )
+            return ProductPage(products=products, next_cursor=next_cursor)
 
         except OperationFailure as e:
             logger.error(
@@ -190,7 +374,8 @@ class ProductService:
             )
             raise OperationFailure(f"Failed to search products: {e}")
 
-    async def create_product(self, product: Product) -> Product:
+    @offload_to_db_executor
+    def create_product(self, product: Product) -> Product:
         """
         Create a new product.
 
@@ -208,9 +393,12 @@ class ProductService:
             collection = self._get_collection_for_write()
 
             # Check if product with same name already exists
-            existing = collection.find_one(
-                {"name": {"$regex": f"^{product.name}$", "$options": "i"}}
-            )
+            if self._search_indexes_ready(lambda: collection):
+                duplicate_query = build_name_query(product.name, exact_match=True)
+            else:
+                duplicate_query = build_legacy_name_query(
+                    product.name, exact_match=True)
+            existing = collection.find_one(duplicate_query, {"_id": 1})
             if existing:
                 raise DuplicateKeyError(
                     f"Product with name '{product.name}' already exists"
@@ -220,7 +408,9 @@ class ProductService:
                 f"{self.x_correlation_id} - Creating product: {product.name}")
 
             # Insert validated data into MongoDB
-            result = collection.insert_one(product.model_dump(exclude={"id"}))
+            result = collection.insert_one(
+                {**product.model_dump(exclude={"id"}), **search_fields(product.name)}
+            )
 
             # Return the created product
             created_product = Product(
@@ -248,7 +438,8 @@ class ProductService:
             )
             raise Exception(f"Failed to create product: {e}")
 
-    async def delete_product_by_id(self, product_id: str) -> bool:
+    @offload_to_db_executor
+    def delete_product_by_id(self, product_id: str) -> bool:
         """
         Delete a product by ID.
 
@@ -300,7 +491,8 @@ class ProductService:
             )
             raise OperationFailure(f"Failed to delete product: {e}")
 
-    async def update_product_by_id(
+    @offload_to_db_executor
+    def update_product_by_id(
         self, product_id: str, update_product: Product
     ) -> SuccessResponse:
         """
@@ -329,7 +521,12 @@ class ProductService:
             # Update document with validated data
             result = collection.update_one(
                 {"_id": ObjectId(product_id)},
-                {"$set": update_product.model_dump(exclude={"id"})},
+                {
+                    "$set": {
+                        **update_product.model_dump(exclude={"id"}),
+                        **search_fields(update_product.name),
+                    }
+                },
             )
 
             if not result.modified_count:
@@ -357,55 +554,45 @@ class ProductService:
             )
             raise OperationFailure(f"Failed to update product: {e}")
 
-    async def sort_products_by_price(
-        self, ascending: bool = True, limit: Optional[int] = None
-    ) -> List[Product]:
+    @offload_to_db_executor
+    def sort_products_by_price(
+        self,
+        ascending: bool = True,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> ProductPage:
         """
         Sort products by price.
 
+        Products with the same price are ordered by ID, so pages never overlap.
+
         Args:
             ascending: If True, sort ascending; otherwise, descending
             limit: Maximum number of products to return
+            cursor: Continuation token returned with the previous page
 
         Returns:
-            List[Product]: List of products sorted by price
+            ProductPage: Products sorted by price and the continuation token of the next page
 
         Raises:
             OperationFailure: If database operation fails
+            ValueError: If the cursor is invalid or belongs to another ordering
         """
         try:
-            collection = self._get_collection_for_read()
-            query_limit = min(limit or self.config.max_results,
-                              self.config.max_results)
-            sort_order = ASCENDING if ascending else DESCENDING
             sort_direction = "ascending" if ascending else "descending"
 
             logger.info(
-                f"{self.x_correlation_id} - Sorting products by price ({sort_direction}) with limit: {query_limit}"
+                f"{self.x_correlation_id} - Sorting products by price ({sort_direction}) with limit: {limit}"
             )
 
-            cursor = collection.find({}).sort(
-                "price", sort_order).limit(query_limit)
-            products = []
-
-            for doc in cursor:
-                try:
-                    product = Product(
-                        id=str(doc["_id"]), name=doc.get("name"), price=doc.get("price")
-                    )
-                    products.append(product)
-                except Exception as e:
-                    logger.error(
-                        f"{self.x_correlation_id} - Error parsing product document {doc.get('_id', 'unknown')}: {e}"
-                    )
-                    continue
+            page = self._read_page("price", ascending, limit, cursor)
 
             logger.info(
-                f"{self.x_correlation_id} - Retrieved {len(products)} products sorted by price ({sort_direction})"
+                f"{self.x_correlation_id} - Retrieved {len(page.products)} products sorted by price ({sort_direction})"
             )
-            return products
+            return page
 
-        except OperationFailure as e:
+        except (OperationFailure, ValueError) as e:
             logger.error(
                 f"{self.x_correlation_id} - Database operation failed while sorting products: {e}"
             )
@@ -416,7 +603,8 @@ class ProductService:
             )
             raise OperationFailure(f"Failed to sort products: {e}")
 
-    async def get_product_by_id(self, product_id: str) -> Optional[Product]:
+    @offload_to_db_executor
+    def get_product_by_id(self, product_id: str) -> Optional[Product]:
         """
         Get a single product by ID.
 
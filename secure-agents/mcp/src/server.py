@@ -22,6 +22,7 @@ from config import get_config
 from db_utils import get_db_manager
 from models import Product, ProductListResponse, ProductResponse
 from product_service import ProductService
+from vault_client import get_credential_cache
 
 # ---------------------------------------------------------------------------
 # Configuration & Logging
@@ -101,6 +102,16 @@ async def health_check():
     return {"status": "healthy", "service": "products-mcp", "version": "1.0.0"}
 
 
+@health_app.get("/metrics")
+async def metrics():
+    """Counters of the Vault credential cache and the MongoDB client pool."""
+    return {
+        "vault_cache_enabled": config.vault_cache_enabled,
+        "vault_credentials": get_credential_cache().stats(),
+        "mongo_clients": get_db_manager().stats(),
+    }
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -168,13 +179,17 @@ async def _create_product_service() -> ProductService:
 
 
 @mcp.tool()
-async def list_products(limit: Optional[int] = 10) -> ProductListResponse:
+async def list_products(
+    limit: Optional[int] = 10, cursor: Optional[str] = None
+) -> ProductListResponse:
     """
     List all products from the database.
 
     This tool retrieves all products stored. You can optionally
     limit the number of results returned. Use this tool when you need to see
     all available products or get a general overview of the product catalog.
+    When more products are available, the response contains a next_cursor;
+    pass it back as cursor to get the next page.
 
     Example response:
         {
@@ -187,27 +202,40 @@ async def list_products(limit: Optional[int] = 10) -> ProductListResponse:
                     "price": 89.99
                 }
             ],
-            "count": 1
+            "count": 1,
+            "next_cursor": "eyJzb3J0IjoiaWQiLCJhc2MiOnRydWUsImlkIjoiUDEyMzQ1In0"
         }
 
     Args:
         limit: Maximum number of products to return. Default is 10, maximum is 100.
+        cursor: The next_cursor of a previous response, to get the next page of products.
 
     Returns:
-        ProductListResponse with success status, message, products list, and count.
+        ProductListResponse with success status, message, products list, count, and
+        next_cursor when more products are available.
     """
     x_correlation_id = _get_correlation_id()
     logger.info(f"{x_correlation_id} - list_products(limit={limit})")
 
     try:
         product_service = await _create_product_service()
-        products = await product_service.list_all_products(limit)
+        page = await product_service.list_all_products(limit, cursor)
+        products = page.products
 
         return ProductListResponse(
             success=True,
             message=f"Successfully retrieved {len(products)} products",
             products=products,
             count=len(products),
+            next_cursor=page.next_cursor,
+        )
+    except ValueError as e:
+        logger.error(f"{x_correlation_id} - Invalid list parameters: {e}")
+        return ProductListResponse(
+            success=False,
+            message=f"Invalid list parameters: {str(e)}",
+            products=[],
+            count=0,
         )
     except Exception as e:
         logger.error(f"{x_correlation_id} - Error listing products: {e}")
@@ -220,30 +248,40 @@ async def list_products(limit: Optional[int] = 10) -> ProductListResponse:
 
 
 @mcp.tool()
-async def search_products(name: str, exact_match: bool = False) -> ProductListResponse:
+async def search_products(
+    name: str,
+    exact_match: bool = False,
+    limit: Optional[int] = 10,
+    cursor: Optional[str] = None,
+) -> ProductListResponse:
     """
     Search for products by name.
 
     This tool searches for products based on their name. It supports both exact
-    and partial matching with case-insensitive search.
+    and partial matching with case-insensitive search. A partial match finds
+    products whose name contains the search text at the start of a word.
 
     Args:
         name: Product name to search for.
         exact_match: If True, search for exact match; otherwise, partial match. Default is False.
+        limit: Maximum number of products to return. Default is 10, maximum is 100.
+        cursor: The next_cursor of a previous response, to get the next page of results.
 
     Returns:
-        ProductListResponse with success status, message, products list, and count.
+        ProductListResponse with success status, message, products list, count, and
+        next_cursor when more results are available.
     """
     x_correlation_id = _get_correlation_id()
     logger.info(
-        f"{x_correlation_id} - search_products(name='{name}', exact={exact_match})"
+        f"{x_correlation_id} - search_products(name='{name}', exact={exact_match}, limit={limit})"
     )
 
     try:
         product_service = await _create_product_service()
-        products = await product_service.search_by_name(
-            name=name, exact_match=exact_match
+        page = await product_service.search_by_name(
+            name=name, exact_match=exact_match, limit=limit, cursor=cursor
         )
+        products = page.products
 
         match_type = "exact" if exact_match else "partial"
         message = (
@@ -251,7 +289,11 @@ async def search_products(name: str, exact_match: bool = False) -> ProductListRe
         )
 
         return ProductListResponse(
-            success=True, message=message, products=products, count=len(products)
+            success=True,
+            message=message,
+            products=products,
+            count=len(products),
+            next_cursor=page.next_cursor,
         )
     except ValueError as e:
         logger.error(f"{x_correlation_id} - Invalid search parameters: {e}")
@@ -422,7 +464,7 @@ async def delete_product(product_id: str) -> ProductResponse:
 
 @mcp.tool()
 async def sort_products_by_price(
-    ascending: bool = True, limit: Optional[int] = 10
+    ascending: bool = True, limit: Optional[int] = 10, cursor: Optional[str] = None
 ) -> ProductListResponse:
     """
     Sort products by price (ascending or descending).
@@ -430,9 +472,12 @@ async def sort_products_by_price(
     Args:
         ascending: If True, sort low to high; otherwise high to low. Default is True.
         limit: Maximum number of products to return. Default is 10.
+        cursor: The next_cursor of a previous response with the same ordering, to get the
+            next page of products.
 
     Returns:
-        ProductListResponse with products sorted by price.
+        ProductListResponse with products sorted by price, and next_cursor when more
+        products are available.
     """
     x_correlation_id = _get_correlation_id()
     logger.info(
@@ -441,9 +486,10 @@ async def sort_products_by_price(
 
     try:
         product_service = await _create_product_service()
-        products = await product_service.sort_products_by_price(
-            ascending=ascending, limit=limit
+        page = await product_service.sort_products_by_price(
+            ascending=ascending, limit=limit, cursor=cursor
         )
+        products = page.products
 
         sort_direction = (
             "ascending (low to high)" if ascending else "descending (high to low)"
@@ -451,7 +497,19 @@ async def sort_products_by_price(
         message = f"Successfully retrieved {len(products)} products sorted by price ({sort_direction})"
 
         return ProductListResponse(
-            success=True, message=message, products=products, count=len(products)
+            success=True,
+            message=message,
+            products=products,
+            count=len(products),
+            next_cursor=page.next_cursor,
+        )
+    except ValueError as e:
+        logger.error(f"{x_correlation_id} - Invalid sort parameters: {e}")
+        return ProductListResponse(
+            success=False,
+            message=f"Invalid sort parameters: {str(e)}",
+            products=[],
+            count=0,
         )
     except Exception as e:
         logger.error(f"{x_correlation_id} - Error sorting products: {e}")
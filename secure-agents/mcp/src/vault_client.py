@@ -1,7 +1,12 @@
+import hashlib
 import jwt
 import hvac
+import threading
 import time
-from typing import Dict, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
 
 import logging
 
@@ -14,20 +19,384 @@ LOG_LEVEL = get_config().log_level.upper()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.getLevelNamesMapping().get(LOG_LEVEL))
 
-# Initialize a global VaultClient instance
-# _vault_client = None
+# Cached credentials are treated as expired this many seconds before their lease ends
+CREDENTIALS_EXPIRY_MARGIN_SECONDS = 10
+
+
+def hash_jwt_token(jwt_token: str) -> str:
+    """Hash of a JWT, identifying the token that logged in to Vault without keeping it as a key"""
+    return hashlib.sha256(jwt_token.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedCredentials:
+    """
+    Credentials of one user and operation, with what is needed to renew them.
+
+    The entry is bound to the JWT that logged in to Vault: it is only served to callers
+    presenting the same token, and only until the token's `exp`.
+    """
+
+    credentials: Dict
+    jwt_token: str
+    operation: str
+    token_expires_at: float
+    token_hash: str
+    last_accessed: float = field(default_factory=time.time)
+
+
+class CredentialCache:
+    """
+    Process-wide cache of Vault MongoDB credentials keyed by `sub:operation`.
+
+    - Entries are valid until the earlier of the Vault token and database lease expiries, and
+      are only served to the JWT that logged in, until that JWT expires. The `sub` claim is
+      read without verifying the token, so a token claiming another user's `sub` never gets
+      their credentials: it has to log in to Vault itself, which verifies it.
+    - Concurrent misses for the same key and JWT share a single Vault login (single-flight).
+    - A background thread renews leases that are about to expire and evicts users that have
+      been idle for too long; the least recently used users are evicted when the cache is full.
+    - Eviction listeners are told when credentials of a key must no longer be used, so the
+      MongoClient built with them can be closed.
+    """
+
+    def __init__(
+        self,
+        renew: Callable[[CachedCredentials], Dict],
+        max_entries: int = 256,
+        renew_before_seconds: float = 60,
+        renew_interval_seconds: float = 15,
+        idle_seconds: float = 900,
+    ):
+        """
+        Initialize the credential cache
+
+        Args:
+            renew (Callable): Returns renewed credentials for a cache entry, raising on failure
+            max_entries (int): Maximum number of cached users
+            renew_before_seconds (float): Renew credentials this many seconds before they expire
+            renew_interval_seconds (float): Interval of the background renewal loop
+            idle_seconds (float): Evict users not seen for this many seconds instead of renewing
+        """
+        self._renew = renew
+        self.max_entries = max_entries
+        self.renew_before_seconds = renew_before_seconds
+        self.renew_interval_seconds = renew_interval_seconds
+        self.idle_seconds = idle_seconds
+        self._entries: "OrderedDict[str, CachedCredentials]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._eviction_listeners: List[Callable[[str], None]] = []
+        self._renewal_listeners: List[Callable[[str, Dict], None]] = []
+        self._renewer: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "renewals": 0,
+            "renewal_failures": 0,
+            "evictions": 0,
+        }
+
+    @staticmethod
+    def _expires_at(credentials: Dict) -> float:
+        """Earliest expiry of the Vault token and the database lease"""
+        return min(credentials["auth_token_ttl"], credentials["credentials_ttl"])
+
+    def add_eviction_listener(self, listener: Callable[[str], None]) -> None:
+        """Call `listener(cache_key)` whenever the credentials of a key are dropped or replaced"""
+        self._eviction_listeners.append(listener)
+
+    def add_renewal_listener(self, listener: Callable[[str, Dict], None]) -> None:
+        """Call `listener(cache_key, credentials)` whenever the lease of a key is extended"""
+        self._renewal_listeners.append(listener)
+
+    def _notify_evicted(self, cache_key: str) -> None:
+        for listener in self._eviction_listeners:
+            try:
+                listener(cache_key)
+            except Exception as e:
+                logger.warning(f"Eviction listener failed for {cache_key}: {e}")
+
+    def _notify_renewed(self, cache_key: str, credentials: Dict) -> None:
+        for listener in self._renewal_listeners:
+            try:
+                listener(cache_key, credentials)
+            except Exception as e:
+                logger.warning(f"Renewal listener failed for {cache_key}: {e}")
+
+    def get_or_load(
+        self,
+        cache_key: str,
+        jwt_token: str,
+        operation: str,
+        loader: Callable[[], Dict],
+        token_expires_at: float,
+    ) -> Dict:
+        """
+        Return cached credentials, loading them once for all concurrent callers on a miss
+
+        Args:
+            cache_key (str): The `sub:operation` cache key
+            jwt_token (str): JWT token of the caller, kept to log in again on renewal
+            operation (str): Type of operation ("read" or "write")
+            loader (Callable): Fetches fresh credentials from Vault
+            token_expires_at (float): The `exp` claim of the JWT
+
+        Returns:
+            Dict: Dictionary containing MongoDB credentials and metadata
+
+        Raises:
+            ValueError: If the JWT has expired
+        """
+        token_hash = hash_jwt_token(jwt_token)
+        # Callers with different tokens of the same user do not share a login
+        inflight_key = f"{cache_key}:{token_hash}"
+        with self._lock:
+            record = self._entries.get(cache_key)
+            now = time.time()
+            if now >= token_expires_at:
+                raise ValueError("JWT token has expired")
+            if (
+                record is not None
+                and record.token_hash == token_hash
+                and now + CREDENTIALS_EXPIRY_MARGIN_SECONDS
+                < self._expires_at(record.credentials)
+            ):
+                record.last_accessed = now
+                record.credentials["last_accessed"] = now
+                self._entries.move_to_end(cache_key)
+                self._stats["hits"] += 1
+                return record.credentials
+            future = self._inflight.get(inflight_key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[inflight_key] = future
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not owner:
+            credentials = future.result()
+            # The token may have expired while the login was in flight
+            if time.time() >= token_expires_at:
+                raise ValueError("JWT token has expired")
+            return credentials
+
+        try:
+            credentials = loader()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(inflight_key, None)
+            future.set_exception(e)
+            raise
+
+        evicted = []
+        with self._lock:
+            replaced = self._entries.pop(cache_key, None)
+            self._entries[cache_key] = CachedCredentials(
+                credentials, jwt_token, operation, token_expires_at, token_hash
+            )
+            self._inflight.pop(inflight_key, None)
+            while len(self._entries) > self.max_entries:
+                evicted_key, _ = self._entries.popitem(last=False)
+                evicted.append(evicted_key)
+                self._stats["evictions"] += 1
+        future.set_result(credentials)
+
+        if replaced is not None:
+            self._notify_evicted(cache_key)
+        for evicted_key in evicted:
+            logger.debug(f"Evicted least recently used credentials for {evicted_key}")
+            self._notify_evicted(evicted_key)
+        self._ensure_renewer()
+        return credentials
+
+    def evict(self, cache_key: str) -> bool:
+        """
+        Drop the credentials of a key
+
+        Args:
+            cache_key (str): The `sub:operation` cache key
+
+        Returns:
+            bool: True if the key was cached
+        """
+        with self._lock:
+            record = self._entries.pop(cache_key, None)
+            if record is not None:
+                self._stats["evictions"] += 1
+        if record is None:
+            return False
+        self._notify_evicted(cache_key)
+        return True
+
+    def clear(self) -> None:
+        """Drop all cached credentials and stop the renewal thread"""
+        self._stop.set()
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._renewer = None
+        for cache_key in keys:
+            self._notify_evicted(cache_key)
+
+    def stats(self) -> Dict:
+        """
+        Get the cache counters
+
+        Returns:
+            Dict: Hit, miss, renewal and eviction counters, the hit rate and the cache size
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"] + stats["coalesced"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _ensure_renewer(self) -> None:
+        """Start the background renewal thread if it is not running"""
+        with self._lock:
+            if self._renewer is not None and self._renewer.is_alive():
+                return
+            self._stop = threading.Event()
+            self._renewer = threading.Thread(
+                target=self._renew_loop,
+                args=(self._stop,),
+                name="vault-credential-renewer",
+                daemon=True,
+            )
+            self._renewer.start()
+
+    def _renew_loop(self, stop: threading.Event) -> None:
+        while not stop.wait(self.renew_interval_seconds):
+            self.renew_expiring()
+
+    def renew_expiring(self) -> None:
+        """Renew credentials close to expiry and evict idle users or users whose JWT expired"""
+        with self._lock:
+            snapshot = list(self._entries.items())
+
+        for cache_key, record in snapshot:
+            now = time.time()
+            expires_at = self._expires_at(record.credentials)
+            if now - record.last_accessed > self.idle_seconds:
+                logger.debug(f"Evicting idle credentials for {cache_key}")
+                self._evict_record(cache_key, record)
+                continue
+            if now >= record.token_expires_at:
+                logger.debug(f"Evicting credentials of an expired JWT for {cache_key}")
+                self._evict_record(cache_key, record)
+                continue
+            if expires_at - now > self.renew_before_seconds:
+                continue
+
+            try:
+                renewed = self._renew(record)
+            except Exception as e:
+                logger.warning(f"Failed to renew credentials for {cache_key}: {e}")
+                with self._lock:
+                    self._stats["renewal_failures"] += 1
+                if expires_at <= now + CREDENTIALS_EXPIRY_MARGIN_SECONDS:
+                    self._evict_record(cache_key, record)
+                continue
+
+            with self._lock:
+                if self._entries.get(cache_key) is not record:
+                    continue
+                same_user = renewed["username"] == record.credentials["username"]
+                record.credentials = renewed
+                self._stats["renewals"] += 1
+            if same_user:
+                self._notify_renewed(cache_key, renewed)
+            else:
+                # New database user, connections made with the old one must be rebuilt
+                self._notify_evicted(cache_key)
+
+    def _evict_record(self, cache_key: str, record: CachedCredentials) -> None:
+        """Evict a key unless it was reloaded in the meantime"""
+        with self._lock:
+            if self._entries.get(cache_key) is not record:
+                return
+            del self._entries[cache_key]
+            self._stats["evictions"] += 1
+        self._notify_evicted(cache_key)
+
+
+def _renew_cached_credentials(record: CachedCredentials) -> Dict:
+    """
+    Extend the Vault token and database lease of cached credentials, logging in again with the
+    stored JWT if the lease cannot be renewed
+
+    Args:
+        record (CachedCredentials): The cache entry to renew
+
+    Returns:
+        Dict: The renewed credentials
+    """
+    config = get_config()
+    credentials = record.credentials
+    try:
+        client = hvac.Client(
+            url=config.vault_addr, namespace="admin", token=credentials["auth_token"]
+        )
+        now = time.time()
+        auth_token_ttl = credentials["auth_token_ttl"]
+        if auth_token_ttl - now <= config.vault_cache_renew_before_seconds:
+            auth_response = client.auth.token.renew_self()
+            auth_token_ttl = now + auth_response["auth"]["lease_duration"]
+        lease_response = client.sys.renew_lease(lease_id=credentials["lease_id"])
+        return {
+            **credentials,
+            "auth_token_ttl": auth_token_ttl,
+            "credentials_ttl": now + lease_response["lease_duration"],
+        }
+    except Exception as e:
+        logger.info(f"Lease renewal failed, logging in to Vault again: {e}")
+
+    vault_client = VaultClient(
+        config.vault_addr, "vault-credential-renewer", cache_enabled=False
+    )
+    return vault_client.get_mongodb_credentials(record.jwt_token, record.operation)
+
+
+# Process-wide credential cache, shared by every VaultClient
+_credential_cache: Optional[CredentialCache] = None
+_credential_cache_lock = threading.Lock()
+
+
+def get_credential_cache() -> CredentialCache:
+    """
+    Get the process-wide Vault credential cache
+
+    Returns:
+        CredentialCache: The shared credential cache
+    """
+    global _credential_cache
+    with _credential_cache_lock:
+        if _credential_cache is None:
+            config = get_config()
+            _credential_cache = CredentialCache(
+                renew=_renew_cached_credentials,
+                max_entries=config.vault_cache_max_entries,
+                renew_before_seconds=config.vault_cache_renew_before_seconds,
+                renew_interval_seconds=config.vault_cache_renew_interval_seconds,
+                idle_seconds=config.vault_cache_idle_seconds,
+            )
+        return _credential_cache
 
 
 def get_vault_client(x_correlation_id: str):
-    # global _vault_client
-    # if _vault_client is None:
     config = get_config()
     if not config.vault_addr:
         raise ValueError("VAULT_ADDR not found in configuration")
-    _vault_client = VaultClient(
+    # The client is cheap and request scoped, cached credentials live in the shared cache
+    return VaultClient(
         config.vault_addr, x_correlation_id, cache_enabled=config.vault_cache_enabled
     )
-    return _vault_client
 
 
 def get_mongodb_credentials(
@@ -66,8 +435,8 @@ class VaultClient:
         session = requests.Session()
         session.headers.update({"X-Correlation-Id": x_correlation_id})
         self.client = hvac.Client(url=vault_addr, namespace="admin", session=session)
-        # Initialize multi-user credentials cache (only used if cache_enabled=True)
-        self._credentials_cache = {}
+        # Multi-user credentials cache shared across requests (only used if cache_enabled=True)
+        self._credentials_cache = get_credential_cache() if cache_enabled else None
 
         if not cache_enabled:
             logger.info(
@@ -159,6 +528,24 @@ class VaultClient:
             raise ValueError("JWT token must contain 'sub' claim")
         return cache_key
 
+    def _get_token_expiry(self, claims: Dict) -> float:
+        """
+        Get the expiry of a JWT, which bounds how long its credentials are cached
+
+        Args:
+            claims (Dict): The JWT claims
+
+        Returns:
+            float: The 'exp' claim as epoch seconds
+
+        Raises:
+            ValueError: If 'exp' claim is missing or invalid
+        """
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            raise ValueError("JWT token must contain a numeric 'exp' claim to cache credentials")
+        return float(expires_at)
+
     def get_mongodb_credentials(self, jwt_token: str, operation: str = "read") -> Dict:
         """
         Get MongoDB credentials using Vault authentication with explicit operation permissions.
@@ -183,20 +570,35 @@ class VaultClient:
         # Get cache key from 'sub' claim and operation
         cache_key = f"{self._get_cache_key(claims)}:{operation}"
 
-        # Check cache for existing valid credentials (only if caching is enabled)
-        if self.cache_enabled:
-            cached_data = self._credentials_cache.get(cache_key)
-            if cached_data:
-                # Check if auth token or credentials have expired
-                if not (
-                    self._is_token_expired(cached_data["auth_token_ttl"])
-                    or self._is_token_expired(cached_data["credentials_ttl"])
-                ):
-                    logger.debug(
-                        f"{self.x_correlation_id} - Using cached credentials for {cache_key}"
-                    )
-                    return cached_data
+        # Serve from the shared cache, concurrent misses share one Vault login
+        if self._credentials_cache is not None:
+            return self._credentials_cache.get_or_load(
+                cache_key,
+                jwt_token,
+                operation,
+                lambda: self._generate_credentials(jwt_token, operation, cache_key),
+                self._get_token_expiry(claims),
+            )
+
+        logger.debug(
+            f"{self.x_correlation_id} - Caching disabled, credentials not cached"
+        )
+        return self._generate_credentials(jwt_token, operation, cache_key)
+
+    def _generate_credentials(
+        self, jwt_token: str, operation: str, cache_key: str
+    ) -> Dict:
+        """
+        Log in to Vault with the JWT and generate MongoDB credentials
+
+        Args:
+            jwt_token (str): JWT token in standard format
+            operation (str): Type of operation ("read" or "write")
+            cache_key (str): The `sub:operation` cache key
 
+        Returns:
+            Dict: Dictionary containing MongoDB credentials and metadata
+        """
         # Authenticate with Vault using JWT
         try:
             auth_response = self.client.auth.jwt.jwt_login(
@@ -239,6 +641,7 @@ class VaultClient:
                 "username": credentials_data["username"],
                 "password": credentials_data["password"],
                 "credentials_ttl": credentials_ttl,
+                "lease_id": db_cred_response.get("lease_id"),
                 "created_at": time.time(),
                 "last_accessed": time.time(),
                 "user_metadata": {
@@ -248,17 +651,6 @@ class VaultClient:
                 },
             }
 
-            # Update cache with new or refreshed data (only if caching is enabled)
-            if self.cache_enabled:
-                self._credentials_cache[cache_key] = cache_data
-                logger.debug(
-                    f"{self.x_correlation_id} - Cached credentials for {cache_key}"
-                )
-            else:
-                logger.debug(
-                    f"{self.x_correlation_id} - Caching disabled, credentials not cached"
-                )
-
             return cache_data
 
         except Exception as e:
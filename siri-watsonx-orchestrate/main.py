@@ -1,12 +1,16 @@
 import os
 import json
+import time
+import asyncio
 import logging
 from typing import Optional
 from contextlib import asynccontextmanager
 
-import redis
-import requests
-from fastapi import FastAPI, HTTPException, Depends, Query
+import httpx
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+from fastapi import FastAPI, HTTPException, Depends, Query, Header
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 import uvicorn
@@ -28,6 +32,12 @@ class Config:
     REDIS_USERNAME: Optional[str] = os.getenv("REDIS_USERNAME")
     REDIS_PASSWORD: Optional[str] = os.getenv("REDIS_PASSWORD")
     REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
+    # Number of replies kept per session and seconds an idle session is kept
+    HISTORY_MAX_MESSAGES: int = int(os.getenv("HISTORY_MAX_MESSAGES", "10"))
+    HISTORY_TTL_SECONDS: int = int(os.getenv("HISTORY_TTL_SECONDS", "86400"))
+    # Keep-alive connections to the orchestrate API shared by all requests of a worker
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
     
     def validate(self):
         """Validate required environment variables"""
@@ -44,14 +54,18 @@ class Config:
 
 config = Config()
 
+IAM_TOKEN_URL = "https://iam.cloud.ibm.com/identity/token"
+# Refresh the IAM token this many seconds before it expires
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+
 # Global variables for connection management
 redis_client: Optional[redis.Redis] = None
-cached_token: Optional[str] = None
+http_client: Optional[httpx.AsyncClient] = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
-    global redis_client
+    global redis_client, http_client
     
     # Startup
     logger.info("Starting up application...")
@@ -71,17 +85,26 @@ async def lifespan(app: FastAPI):
             retry_on_timeout=True,
             health_check_interval=30
         )
-        redis_client.ping()
+        await redis_client.ping()
         logger.info("Redis connection established")
     except Exception as e:
         logger.error(f"Failed to connect to Redis: {e}")
         raise
     
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=config.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        timeout=httpx.Timeout(30, connect=10),
+    )
+    
     yield
     
     logger.info("Shutting down application...")
+    await http_client.aclose()
     if redis_client:
-        redis_client.close()
+        await redis_client.aclose()
 
 app = FastAPI(
     title="AI Chat API",
@@ -93,6 +116,12 @@ app = FastAPI(
 # Pydantic models
 class Prompt(BaseModel):
     query: str = Field(..., min_length=1, max_length=2000, description="User query")
+    session_id: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        max_length=128,
+        description="Conversation to continue, falls back to the X-Session-ID header",
+    )
 
 class ChatResponse(BaseModel):
     Watson_X_Agent_Replied: str
@@ -109,53 +138,111 @@ def get_redis_client() -> redis.Redis:
         raise HTTPException(status_code=500, detail="Redis connection not available")
     return redis_client
 
+def get_http_client() -> httpx.AsyncClient:
+    """Get HTTP client dependency"""
+    if http_client is None:
+        raise HTTPException(status_code=500, detail="HTTP client not available")
+    return http_client
+
+def get_session_id(
+    session_id: Optional[str] = Query(
+        default=None,
+        min_length=1,
+        max_length=128,
+        description="Conversation to use, falls back to the X-Session-ID header",
+    ),
+    x_session_id: Optional[str] = Header(default=None, min_length=1, max_length=128),
+) -> Optional[str]:
+    """Get the conversation of a caller from the session_id query parameter or X-Session-ID header"""
+    return session_id or x_session_id
+
+def require_session_id(*session_ids: Optional[str]) -> str:
+    """Get the first session supplied by the caller, there is no shared default conversation"""
+    for session_id in session_ids:
+        if session_id:
+            return session_id
+    raise HTTPException(
+        status_code=400,
+        detail="Missing session: send a session_id or the X-Session-ID header",
+    )
+
+def history_key(session_id: str) -> str:
+    """Redis list holding the conversation history of a session"""
+    return f"messages:{session_id}"
+
 # Utility functions
-def get_iam_token() -> str:
-    """Get IBM IAM token with caching and error handling"""
-    global cached_token
-    
-    # Simple token caching (in production, implement proper token refresh)
-    if cached_token:
-        return cached_token
-    
-    token_url = "https://iam.cloud.ibm.com/identity/token"
-    headers = {"Content-Type": "application/x-www-form-urlencoded"}
-    data = {
-        "grant_type": "urn:ibm:params:oauth:grant-type:apikey",
-        "apikey": config.IBM_APIKEY,
-    }
-    
-    try:
-        response = requests.post(
-            token_url, 
-            headers=headers, 
-            data=data, 
-            timeout=10
-        )
-        response.raise_for_status()
+class IAMTokenCache:
+    """
+    IBM IAM token cache refreshing the token shortly before it expires.
+
+    Concurrent requests finding the token expired share a single refresh.
+    """
+
+    def __init__(self):
+        self._token: Optional[str] = None
+        self._expires_at: float = 0.0
+        self._lock = asyncio.Lock()
+
+    def _is_valid(self) -> bool:
+        return self._token is not None and time.time() < self._expires_at - TOKEN_REFRESH_MARGIN_SECONDS
+
+    async def get(self, client: httpx.AsyncClient) -> str:
+        """Get a valid IAM token, requesting a new one if needed"""
+        if self._is_valid():
+            return self._token
+        async with self._lock:
+            # Another request may have refreshed the token while this one waited
+            if not self._is_valid():
+                await self._refresh(client)
+            return self._token
+
+    async def _refresh(self, client: httpx.AsyncClient) -> None:
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        data = {
+            "grant_type": "urn:ibm:params:oauth:grant-type:apikey",
+            "apikey": config.IBM_APIKEY,
+        }
         
-        token_data = response.json()
-        cached_token = token_data["access_token"]
-        logger.info("Successfully obtained IAM token")
-        return cached_token
+        try:
+            response = await client.post(
+                IAM_TOKEN_URL, 
+                headers=headers, 
+                data=data, 
+                timeout=10
+            )
+            response.raise_for_status()
+            
+            token_data = response.json()
+            token = token_data["access_token"]
+            expires_at = token_data.get("expiration") or time.time() + token_data.get("expires_in", 3600)
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to get IAM token: {e}")
+            raise HTTPException(
+                status_code=500, 
+                detail="Failed to authenticate with IBM Cloud"
+            )
+        except (KeyError, json.JSONDecodeError):
+            logger.error("Invalid token response format")
+            raise HTTPException(
+                status_code=500, 
+                detail="Invalid authentication response"
+            )
         
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to get IAM token: {e}")
-        raise HTTPException(
-            status_code=500, 
-            detail="Failed to authenticate with IBM Cloud"
-        )
-    except KeyError:
-        logger.error("Invalid token response format")
-        raise HTTPException(
-            status_code=500, 
-            detail="Invalid authentication response"
-        )
+        self._token = token
+        self._expires_at = float(expires_at)
+        logger.info("Successfully obtained IAM token")
+
+iam_tokens = IAMTokenCache()
+
+async def get_iam_token(client: httpx.AsyncClient) -> str:
+    """Get IBM IAM token with caching and error handling"""
+    return await iam_tokens.get(client)
 
-def get_conversation_history(redis_client: redis.Redis, limit: int = 5) -> str:
-    """Get conversation history from Redis"""
+async def get_conversation_history(redis_client: redis.Redis, session_id: str, limit: int = 5) -> str:
+    """Get conversation history of a session from Redis"""
     try:
-        messages = redis_client.lrange("messages", 0, limit - 1)
+        messages = await redis_client.lrange(history_key(session_id), 0, limit - 1)
         if not messages:
             return "No previous conversation history."
         
@@ -165,15 +252,36 @@ def get_conversation_history(redis_client: redis.Redis, limit: int = 5) -> str:
         ])
         return history
         
-    except redis.RedisError as e:
+    except RedisError as e:
         logger.error(f"Redis error getting history: {e}")
         return "Unable to retrieve conversation history."
 
-def call_orchestrate(token: str, query: str, redis_client: redis.Redis) -> str:
+async def store_message(redis_client: redis.Redis, session_id: str, message: str) -> None:
+    """Store a message in the history of a session in a single round trip"""
+    key = history_key(session_id)
+    try:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.lpush(key, message)
+            # Keep only the last messages to prevent unbounded growth
+            pipe.ltrim(key, 0, config.HISTORY_MAX_MESSAGES - 1)
+            # Drop sessions nobody has talked to for a while
+            pipe.expire(key, config.HISTORY_TTL_SECONDS)
+            await pipe.execute()
+    except RedisError as e:
+        logger.error(f"Failed to store message in Redis: {e}")
+        # Continue anyway - don't fail the request
+
+async def call_orchestrate(
+    token: str,
+    query: str,
+    session_id: str,
+    redis_client: redis.Redis,
+    http_client: httpx.AsyncClient,
+) -> str:
     """Call the orchestrate API with improved error handling"""
     
     # Get conversation history
-    history = get_conversation_history(redis_client)
+    history = await get_conversation_history(redis_client, session_id)
     enhanced_query = f"QUERY: {query}\n\nConversation history (last 5 messages):\n{history}"
     # print("Enhanced Query:",enhanced_query)
     
@@ -203,7 +311,7 @@ def call_orchestrate(token: str, query: str, redis_client: redis.Redis) -> str:
     }
 
     try:
-        response = requests.post(
+        response = await http_client.post(
             config.ORCHESTRATE_URL, 
             headers=headers, 
             json=payload,
@@ -217,23 +325,17 @@ def call_orchestrate(token: str, query: str, redis_client: redis.Redis) -> str:
         ai_response = data["choices"][0]["message"]["content"]
         
         # Store response in Redis with error handling
-        try:
-            redis_client.lpush("messages", ai_response)
-            # Keep only last 10 messages to prevent unbounded growth
-            redis_client.ltrim("messages", 0, 9)
-        except redis.RedisError as e:
-            logger.error(f"Failed to store message in Redis: {e}")
-            # Continue anyway - don't fail the request
+        await store_message(redis_client, session_id, ai_response)
         
         return ai_response
         
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         logger.error("Request to orchestrate API timed out")
         raise HTTPException(
             status_code=504, 
             detail="Request timed out. Please try again."
         )
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Request error: {e}")
         raise HTTPException(
             status_code=502, 
@@ -252,7 +354,7 @@ async def health_check():
     """Health check endpoint"""
     try:
         # Test Redis connection
-        redis_client.ping()
+        await redis_client.ping()
         return {"status": "healthy", "redis": "connected"}
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -261,19 +363,24 @@ async def health_check():
 @app.post("/ask", response_model=ChatResponse)
 async def ask(
     prompt: Prompt, 
-    redis_client: redis.Redis = Depends(get_redis_client)#):
+    session_id: Optional[str] = Depends(get_session_id),
+    redis_client: redis.Redis = Depends(get_redis_client),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
 ) -> ChatResponse:
     """
     Process a user query and return AI response with conversation history context
     """
+    session_id = require_session_id(prompt.session_id, session_id)
     try:
         logger.info(f"Processing query: {prompt.query[:50]}...")
         
         # Get authentication token
-        token = get_iam_token()
+        token = await get_iam_token(http_client)
         
         # Call orchestrate API
-        answer = call_orchestrate(token, prompt.query, redis_client)
+        answer = await call_orchestrate(
+            token, prompt.query, session_id, redis_client, http_client
+        )
         
         logger.info("Successfully processed query")
         # print(answer)
@@ -293,17 +400,19 @@ async def ask(
 @app.get("/history")
 async def get_history(
     limit: int = Query(default=5, ge=1, le=20, description="Number of messages to retrieve"),
+    session_id: Optional[str] = Depends(get_session_id),
     redis_client: redis.Redis = Depends(get_redis_client)
 ):
-    """Get conversation history"""
+    """Get conversation history of a session"""
+    session_id = require_session_id(session_id)
     try:
-        messages = redis_client.lrange("messages", 0, limit - 1)
+        messages = await redis_client.lrange(history_key(session_id), 0, limit - 1)
         return {
             "messages": messages,
             "count": len(messages),
             "status": "success"
         }
-    except redis.RedisError as e:
+    except RedisError as e:
         logger.error(f"Failed to get history: {e}")
         raise HTTPException(
             status_code=500,
@@ -314,14 +423,16 @@ async def get_history(
 
 @app.delete("/history")
 async def clear_history(
+    session_id: Optional[str] = Depends(get_session_id),
     redis_client: redis.Redis = Depends(get_redis_client)
 ):
-    """Clear conversation history"""
+    """Clear conversation history of a session"""
+    session_id = require_session_id(session_id)
     try:
-        redis_client.delete("messages")
+        await redis_client.delete(history_key(session_id))
         logger.info("Conversation history cleared")
         return {"message": "Conversation history cleared", "status": "success"}
-    except redis.RedisError as e:
+    except RedisError as e:
         logger.error(f"Failed to clear history: {e}")
         raise HTTPException(
             status_code=500,
@@ -332,7 +443,10 @@ async def clear_history(
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Custom HTTP exception handler"""
-    return ErrorResponse(detail=exc.detail)
+    return JSONResponse(
+        status_code=exc.status_code,
+        content=ErrorResponse(detail=exc.detail).model_dump(),
+    )
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,414 @@
+import asyncio
+import base64
+from importlib.util import find_spec
+import json
+import os
+import ssl
+import tempfile
+import threading
+import time
+from typing import Any, Awaitable, Coroutine, Dict, Optional, Sequence, TypeVar, Union
+
+import certifi
+import httpx
+from pydantic.dataclasses import dataclass
+
+from agent_ready_tools.clients.sterling_oms_token import (
+    DEFAULT_TOKEN_TTL_SECONDS,
+    TOKEN_REFRESH_MARGIN_SECONDS,
+    get_jwt_expiry,
+)
+
+T = TypeVar("T")
+
+# HTTP/2 needs the optional `h2` package (httpx[http2]); fall back to HTTP/1.1 keep-alive without it
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+
+@dataclass
+class SterlingOMSRequest:
+    """A single request for `AsyncSterlingOMSClient.gather_requests`."""
+
+    method: str
+    resource_name: str
+    params: Optional[dict[str, Any]] = None
+    payload: Optional[dict[str, Any]] = None
+
+
+def build_client_ssl_context(client_cert: str, client_key: str) -> ssl.SSLContext:
+    """
+    Builds an SSL context with the base64 encoded client certificate and private key.
+
+    The standard library can only load a certificate chain from files, so the decoded PEMs are
+    written to a private temporary directory that is removed as soon as they are loaded.
+
+    Args:
+        client_cert: The base64 encoded client certificate PEM.
+        client_key: The base64 encoded client private key PEM.
+
+    Returns:
+        An SSL context for mutual TLS.
+    """
+    context = ssl.create_default_context(cafile=certifi.where())
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cert_path = os.path.join(tmp_dir, "client.crt")
+        key_path = os.path.join(tmp_dir, "client.key")
+        for path, encoded in ((cert_path, client_cert), (key_path, client_key)):
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "wb") as pem_file:
+                pem_file.write(base64.b64decode(encoded))
+        context.load_cert_chain(certfile=cert_path, keyfile=key_path)
+    return context
+
+
+class AsyncSterlingOMSClient:
+    """
+    An asyncio client for Sterling Order Management System.
+
+    Mirrors the request surface of `SterlingOMSClient` over a pooled `httpx.AsyncClient` with
+    mutual TLS, keep-alive connections and HTTP/2 multiplexing when available.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        password: str,
+        client_cert: str,
+        client_key: str,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        timeout: float = 30.0,
+        http2: bool = True,
+        jwt_token: Optional[str] = None,
+    ):
+        """
+        Args:
+            base_url: The base URL for Sterling OMS API.
+            username: The username for basic auth.
+            password: The password for basic auth.
+            client_cert: Client ID for Sterling OMS API.
+            client_key: Client secret for Sterling OMS API.
+            max_connections: Maximum number of open connections.
+            max_keepalive_connections: Maximum number of idle connections kept alive.
+            timeout: Default per-request timeout in seconds.
+            http2: Use HTTP/2 when the `h2` package is installed.
+            jwt_token: An already issued JWT token to start with (e.g. from `SterlingOMSClient`).
+        """
+        self.base_url = base_url
+        self.auth = httpx.BasicAuth(username, password)
+        self._username = username
+        self._password = password
+        self.max_connections = max_connections
+        self.timeout = timeout
+
+        self.http_client = httpx.AsyncClient(
+            verify=build_client_ssl_context(client_cert, client_key),
+            http2=http2 and HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            timeout=timeout,
+        )
+
+        self._token_lock = asyncio.Lock()
+        self.jwt_token = ""
+        self.token_expires_at = 0.0
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+        if jwt_token:
+            self._set_token(jwt_token)
+
+    async def __aenter__(self) -> "AsyncSterlingOMSClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Closes the pooled connections."""
+        await self.http_client.aclose()
+
+    def _set_token(self, jwt_token: str) -> None:
+        """Stores a JWT token and its expiry and updates the request headers."""
+        expires_at = get_jwt_expiry(jwt_token)
+        self.jwt_token = jwt_token
+        self.token_expires_at = (
+            expires_at if expires_at is not None else time.time() + DEFAULT_TOKEN_TTL_SECONDS
+        )
+        self.headers = {**self.headers, "Authorization": f"Bearer {jwt_token}"}
+
+    async def _get_jwt_token(self) -> str:
+        """retrieves the JWT token for authentication."""
+        payload = {"LoginID": self._username, "Password": self._password}
+        try:
+            response = await self.http_client.post(
+                f"{self.base_url}/invoke/login",
+                auth=self.auth,
+                headers={"Content-Type": "application/json", "Accept": "application/json"},
+                json=payload,
+            )
+            user_token = response.json().get("UserToken")
+            jwt = await self.http_client.get(
+                f"{self.base_url}/jwt",
+                params={"_token": user_token, "_loginid": self._username},
+            )
+        except (httpx.HTTPError, ValueError):
+            return ""
+
+        if jwt.status_code != 200:
+            return ""
+
+        return jwt.text
+
+    async def _ensure_token(self, force: bool = False, stale_token: Optional[str] = None) -> None:
+        """
+        Fetches or refreshes the JWT token if it is missing or about to expire.
+
+        Concurrent callers wait for a single refresh instead of each logging in.
+
+        Args:
+            force: Refresh even if the token has not expired (e.g. after a 401 response).
+            stale_token: The token that was rejected; skip the refresh if another task already
+                replaced it.
+        """
+        if not force and time.time() < self.token_expires_at - TOKEN_REFRESH_MARGIN_SECONDS:
+            return
+        async with self._token_lock:
+            if force and stale_token is not None and stale_token != self.jwt_token:
+                return
+            if not force and time.time() < self.token_expires_at - TOKEN_REFRESH_MARGIN_SECONDS:
+                return
+            jwt_token = await self._get_jwt_token()
+            # on a failed login keep the current token; the server's 401 is returned to the caller
+            if jwt_token:
+                self._set_token(jwt_token)
+
+    async def _send(
+        self,
+        method: str,
+        resource_name: str,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Sends an authenticated request, refreshing the JWT token and retrying once on 401.
+
+        Args:
+            method: The HTTP method.
+            resource_name: The specific resource to make the request against.
+            timeout: Per-request timeout in seconds, defaults to the client timeout.
+            **kwargs: Additional arguments passed to `httpx.AsyncClient.request`.
+
+        Returns:
+            The HTTP response.
+        """
+        await self._ensure_token()
+        token = self.jwt_token
+        url = f"{self.base_url}/{resource_name.lstrip('/')}"
+        request_timeout = timeout if timeout is not None else self.timeout
+        response = await self.http_client.request(
+            method, url, headers=self.headers, auth=self.auth, timeout=request_timeout, **kwargs
+        )
+        if response.status_code == 401:
+            await self._ensure_token(force=True, stale_token=token)
+            response = await self.http_client.request(
+                method, url, headers=self.headers, auth=self.auth, timeout=request_timeout, **kwargs
+            )
+        return response
+
+    @staticmethod
+    def _error_from_response(response: httpx.Response) -> Dict[str, Any]:
+        """Returns the JSON error body, or a dictionary with the raw text and status code."""
+        try:
+            return response.json()
+        except ValueError:
+            # Handle the case where response content is not JSON
+            return {
+                "errorMessage": response.text,
+                "status_code": response.status_code,
+            }
+
+    async def delete_request(
+        self,
+        resource_name: str,
+        params: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Union[int, Dict[str, Any]]:
+        """
+        Executes a DELETE request against Sterling OMS API.
+
+        Args:
+            resource_name: The specific resource to make the request against.
+            params: Query parameters for the REST API.
+            timeout: Per-request timeout in seconds.
+
+        Returns:
+            HTTP status code on success, or an error dictionary on failure.
+        """
+        try:
+            response = await self._send("DELETE", resource_name, timeout, params=params or {})
+        except httpx.HTTPError as e:
+            return {"errorMessage": str(e) or type(e).__name__, "status_code": None}
+        if response.is_error:
+            return self._error_from_response(response)
+        return response.status_code
+
+    async def patch_request(
+        self,
+        resource_name: str,
+        payload: Optional[dict[str, Any]] = None,
+        params: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Executes a PATCH request against Sterling OMS API.
+
+        Args:
+            resource_name: The specific resource to make the request against.
+            payload: The request payload.
+            params: Query parameters for the REST API.
+            timeout: Per-request timeout in seconds.
+
+        Returns:
+            The JSON response from the Sterling OMS REST API.
+        """
+        try:
+            response = await self._send(
+                "PATCH", resource_name, timeout, params=params or {}, json=payload or {}
+            )
+        except httpx.HTTPError as e:
+            return {"errorMessage": str(e) or type(e).__name__, "status_code": None}
+        if response.is_error:
+            return self._error_from_response(response)
+        return response.json()
+
+    async def post_request(
+        self,
+        resource_name: str,
+        params: Optional[dict[str, Any]] = None,
+        payload: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Executes a POST request against Sterling OMS API.
+
+        Args:
+            resource_name: The specific resource to make the request against.
+            params: Query parameters for the REST API.
+            payload: The request payload.
+            timeout: Per-request timeout in seconds.
+
+        Returns:
+            The JSON response from the Sterling OMS REST API.
+        """
+        try:
+            response = await self._send(
+                "POST", resource_name, timeout, params=params or {}, content=json.dumps(payload)
+            )
+        except httpx.HTTPError as e:
+            return {"errorMessage": str(e) or type(e).__name__, "status_code": None}
+        if response.is_error:
+            return self._error_from_response(response)
+        return response.json()
+
+    async def get_request(
+        self,
+        resource_name: str,
+        params: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Executes a GET request against Sterling OMS API.
+
+        Args:
+            resource_name: The specific resource to make the request against.
+            params: Query parameters for the REST API.
+            timeout: Per-request timeout in seconds.
+
+        Returns:
+            The JSON list response from the Sterling OMS REST API.
+        """
+        try:
+            response = await self._send("GET", resource_name, timeout, params=params or {})
+        except httpx.HTTPError as e:
+            return {"errorMessage": str(e) or type(e).__name__, "status_code": None}
+        if response.is_error:
+            return self._error_from_response(response)
+        return response.json()
+
+    def _request_coroutine(
+        self, request: SterlingOMSRequest, timeout: Optional[float]
+    ) -> Awaitable[Union[int, Dict[str, Any]]]:
+        """Maps a `SterlingOMSRequest` onto the matching request method."""
+        method = request.method.upper()
+        if method == "GET":
+            return self.get_request(request.resource_name, request.params, timeout)
+        if method == "POST":
+            return self.post_request(
+                request.resource_name, request.params, request.payload, timeout
+            )
+        if method == "PATCH":
+            return self.patch_request(
+                request.resource_name, request.payload, request.params, timeout
+            )
+        if method == "DELETE":
+            return self.delete_request(request.resource_name, request.params, timeout)
+        raise ValueError(f"Unsupported method {request.method}")
+
+    async def gather_requests(
+        self,
+        requests: Sequence[SterlingOMSRequest],
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> list[Union[int, Dict[str, Any]]]:
+        """
+        Executes several requests concurrently.
+
+        Args:
+            requests: The requests to execute.
+            max_concurrency: Maximum number of requests in flight, defaults to `max_connections`.
+            timeout: Per-request timeout in seconds.
+
+        Returns:
+            One response (or error dictionary) per request, in the same order as `requests`.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_connections)
+
+        async def bounded(request: SterlingOMSRequest) -> Union[int, Dict[str, Any]]:
+            async with semaphore:
+                return await self._request_coroutine(request, timeout)
+
+        return list(await asyncio.gather(*(bounded(request) for request in requests)))
+
+
+_BACKGROUND_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_BACKGROUND_LOOP_LOCK = threading.Lock()
+
+
+def run_coroutine_sync(coroutine: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """
+    Runs a coroutine on a long-lived background event loop and waits for its result.
+
+    Async clients keep their connection pools bound to this loop, so synchronous callers (e.g.
+    tools using `SterlingOMSClient`) can reuse them across calls, even from threads that already
+    run their own event loop.
+
+    Args:
+        coroutine: The coroutine to run.
+        timeout: Maximum number of seconds to wait for the result.
+
+    Returns:
+        The result of the coroutine.
+    """
+    global _BACKGROUND_LOOP  # pylint: disable=global-statement
+    with _BACKGROUND_LOOP_LOCK:
+        if _BACKGROUND_LOOP is None:
+            _BACKGROUND_LOOP = asyncio.new_event_loop()
+            threading.Thread(
+                target=_BACKGROUND_LOOP.run_forever, name="sterling-oms-async", daemon=True
+            ).start()
+    return asyncio.run_coroutine_threadsafe(coroutine, _BACKGROUND_LOOP).result(timeout)
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import ssl
+from typing import Awaitable, Callable
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from agent_ready_tools.clients.sterling_oms_async_client import (
+    AsyncSterlingOMSClient,
+    SterlingOMSRequest,
+)
+
+
+def _make_client(transport: httpx.MockTransport) -> AsyncSterlingOMSClient:
+    """
+    Create an async client whose HTTP traffic goes to a mock transport.
+
+    Args:
+        transport: The mock transport serving the requests
+
+    Returns:
+        The async Sterling OMS client.
+    """
+    with patch(
+        "agent_ready_tools.clients.sterling_oms_async_client.build_client_ssl_context",
+        return_value=ssl.create_default_context(),
+    ):
+        client = AsyncSterlingOMSClient(
+            base_url="https://host/api",
+            username="user",
+            password="pw",
+            client_cert="dummy-cert",
+            client_key="dummy-key",
+        )
+    client.http_client = httpx.AsyncClient(transport=transport)
+    return client
+
+
+def test_async_sterling_oms_client_gather_requests() -> None:
+    """Test that batched requests log in once and return results in input order."""
+    calls = MagicMock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls(request.url.path)
+        if request.url.path == "/api/invoke/login":
+            return httpx.Response(200, json={"UserToken": "user-token"})
+        if request.url.path == "/api/jwt":
+            return httpx.Response(200, text="jwt-token")
+        if request.url.path == "/api/invoke/getPage":
+            order_no = json.loads(request.content)["API"]["Input"]["Order"]["OrderNo"]
+            return httpx.Response(200, json={"Output": {"Order": {"OrderNo": order_no}}})
+        return httpx.Response(404, text="not found")
+
+    async def run() -> list:
+        async with _make_client(httpx.MockTransport(handler)) as client:
+            return await client.gather_requests(
+                [
+                    SterlingOMSRequest(
+                        method="POST",
+                        resource_name="invoke/getPage",
+                        payload={"API": {"Input": {"Order": {"OrderNo": f"Y{i}"}}}},
+                    )
+                    for i in range(5)
+                ]
+                + [SterlingOMSRequest(method="GET", resource_name="missing")],
+                max_concurrency=2,
+            )
+
+    results = asyncio.run(run())
+
+    assert [r["Output"]["Order"]["OrderNo"] for r in results[:5]] == [f"Y{i}" for i in range(5)]
+    assert results[5] == {"errorMessage": "not found", "status_code": 404}
+    login_calls = [c for c in calls.call_args_list if c.args[0] == "/api/invoke/login"]
+    assert len(login_calls) == 1
+
+
+def test_async_sterling_oms_client_refreshes_token_on_unauthorized() -> None:
+    """Test that a 401 response triggers a token refresh and a single retry."""
+    tokens = iter(["jwt-1", "jwt-2"])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/invoke/login":
+            return httpx.Response(200, json={"UserToken": "user-token"})
+        if request.url.path == "/api/jwt":
+            return httpx.Response(200, text=next(tokens))
+        if request.headers.get("x-token") == "jwt-2":
+            return httpx.Response(200, json={"ok": True})
+        return httpx.Response(401, json={"errors": [{"ErrorCode": "401"}]})
+
+    async def run() -> dict:
+        client = _make_client(httpx.MockTransport(handler))
+        # Surface the bearer token in a custom header as basic auth owns Authorization
+        client.http_client.event_hooks["request"] = [
+            _copy_bearer_token(client),
+        ]
+        async with client:
+            return await client.get_request("order/1")
+
+    assert asyncio.run(run()) == {"ok": True}
+
+
+def _copy_bearer_token(
+    client: AsyncSterlingOMSClient,
+) -> Callable[[httpx.Request], Awaitable[None]]:
+    """
+    Build a request hook that copies the client's current JWT token into a test header.
+
+    Args:
+        client: The async Sterling OMS client
+
+    Returns:
+        The request hook.
+    """
+
+    async def hook(request: httpx.Request) -> None:
+        request.headers["x-token"] = client.jwt_token
+
+    return hook
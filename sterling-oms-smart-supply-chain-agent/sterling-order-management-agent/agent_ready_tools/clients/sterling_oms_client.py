@@ -1,6 +1,9 @@
 import base64
+import hashlib
 import json
-from typing import Any, Dict, Optional, Union
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Union
 
 from OpenSSL import crypto
 import certifi
@@ -10,6 +13,17 @@ from requests.exceptions import RequestException
 from urllib3.contrib.pyopenssl import PyOpenSSLContext  # pants: no-infer-dep
 from urllib3.util.ssl_ import create_urllib3_context  # pants: no-infer-dep
 
+from agent_ready_tools.clients.sterling_oms_async_client import (
+    AsyncSterlingOMSClient,
+    SterlingOMSRequest,
+    run_coroutine_sync,
+)
+from agent_ready_tools.clients.sterling_oms_response_cache import SterlingOMSResponseCache
+from agent_ready_tools.clients.sterling_oms_token import (  # re-exported for existing callers
+    DEFAULT_TOKEN_TTL_SECONDS,
+    TOKEN_REFRESH_MARGIN_SECONDS,
+    get_jwt_expiry,
+)
 from agent_ready_tools.utils.credentials import CredentialKeys, get_tool_credentials
 from agent_ready_tools.utils.systems import Systems
 
@@ -59,7 +73,14 @@ class ClientSideCertificateHTTPAdapter(requests.adapters.HTTPAdapter):
 
 
 class SterlingOMSClient:
-    """A remote client for Sterling Order Management System."""
+    """
+    A remote client for Sterling Order Management System.
+
+    The client keeps its mutual-TLS session and JWT for its whole lifetime: the token is refreshed
+    shortly before it expires or when the server answers 401, so one instance can be shared
+    across threads and tool calls (see `get_sterling_oms_client`). Responses of idempotent read
+    APIs are served from `response_cache` until their TTL runs out.
+    """
 
     def __init__(
         self,
@@ -87,20 +108,130 @@ class SterlingOMSClient:
         self.session = requests.Session()
         self.session.mount("https://", self.adapter)
 
+        # kept to build the async client lazily, see `get_async_client`
+        self._client_cert = client_cert
+        self._client_key = client_key
+        self._async_client: Optional["AsyncSterlingOMSClient"] = None
+
+        self.response_cache = SterlingOMSResponseCache()
+
         # Obtain JWT Token
         self.base_url = base_url
 
         self.auth = HTTPBasicAuth(username, password)
+        # HTTPBasicAuth types its credentials as bytes | str, keep the str ones for the async client
+        self._username = username
+        self._password = password
 
-        self.jwt_token = self._get_jwt_token()
-
-        assert self.jwt_token, "Failed to fetch JWT token for client"
-
+        self._token_lock = threading.Lock()
+        self.jwt_token = ""
+        self.token_expires_at = 0.0
         self.headers = {
-            "Authorization": f"Bearer {self.jwt_token}",
             "Content-Type": "application/json",
             "Accept": "application/json",
         }
+        self._refresh_token()
+
+        assert self.jwt_token, "Failed to fetch JWT token for client"
+
+    def _refresh_token(self) -> None:
+        """Fetches a new JWT token and updates the request headers."""
+        jwt_token = self._get_jwt_token()
+        if not jwt_token:
+            return
+        expires_at = get_jwt_expiry(jwt_token)
+        self.jwt_token = jwt_token
+        self.token_expires_at = (
+            expires_at if expires_at is not None else time.time() + DEFAULT_TOKEN_TTL_SECONDS
+        )
+        self.headers = {**self.headers, "Authorization": f"Bearer {jwt_token}"}
+
+    def _ensure_token(self, force: bool = False, stale_token: Optional[str] = None) -> None:
+        """
+        Refreshes the JWT token if it is about to expire.
+
+        Args:
+            force: Refresh even if the token has not expired (e.g. after a 401 response).
+            stale_token: The token that was rejected; skip the refresh if another thread already
+                replaced it.
+        """
+        if not force and time.time() < self.token_expires_at - TOKEN_REFRESH_MARGIN_SECONDS:
+            return
+        with self._token_lock:
+            if force and stale_token is not None and stale_token != self.jwt_token:
+                return
+            if not force and time.time() < self.token_expires_at - TOKEN_REFRESH_MARGIN_SECONDS:
+                return
+            self._refresh_token()
+
+    def _send(self, method: str, resource_name: str, **kwargs: Any) -> requests.Response:
+        """
+        Sends an authenticated request, refreshing the JWT token and retrying once on 401.
+
+        Args:
+            method: The HTTP method.
+            resource_name: The specific resource to make the request against.
+            **kwargs: Additional arguments passed to `requests.Session.request`.
+
+        Returns:
+            The HTTP response.
+        """
+        self._ensure_token()
+        token = self.jwt_token
+        response = self.session.request(
+            method,
+            url=f"{self.base_url}/{resource_name}",
+            headers=self.headers,
+            auth=self.auth,
+            **kwargs,
+        )
+        if response.status_code == 401:
+            self._ensure_token(force=True, stale_token=token)
+            response = self.session.request(
+                method,
+                url=f"{self.base_url}/{resource_name}",
+                headers=self.headers,
+                auth=self.auth,
+                **kwargs,
+            )
+        return response
+
+    def _read_through(
+        self,
+        method: str,
+        resource_name: str,
+        params: Optional[dict[str, Any]],
+        payload: Optional[dict[str, Any]],
+        use_cache: bool,
+        fetch: Callable[[], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Serves a read request from the response cache, fetching and storing it on a miss.
+
+        Args:
+            method: The HTTP method.
+            resource_name: The specific resource to make the request against.
+            params: Query parameters for the REST API.
+            payload: The request payload.
+            use_cache: Whether the cache may be used for this request.
+            fetch: Executes the request against the server.
+
+        Returns:
+            The JSON response from the Sterling OMS REST API.
+        """
+        key = (
+            self.response_cache.make_key(method, resource_name, params, payload)
+            if use_cache
+            else None
+        )
+        if key is None:
+            return fetch()
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            return cached
+        response = fetch()
+        self.response_cache.put(key, response)
+        return response
 
     def _get_jwt_token(self) -> str:
         """retrieves the JWT token for authentication."""
@@ -140,6 +271,46 @@ class SterlingOMSClient:
 
         return jwt.text
 
+    def get_async_client(self) -> AsyncSterlingOMSClient:
+        """
+        Returns an async client with the same credentials, starting from the current JWT token.
+
+        The async client lives on the shared background event loop, so its connection pool is
+        reused by every call to `gather_requests`.
+        """
+        with self._token_lock:
+            if self._async_client is None:
+                self._async_client = AsyncSterlingOMSClient(
+                    base_url=self.base_url,
+                    username=self._username,
+                    password=self._password,
+                    client_cert=self._client_cert,
+                    client_key=self._client_key,
+                    jwt_token=self.jwt_token,
+                )
+            return self._async_client
+
+    def gather_requests(
+        self,
+        calls: Sequence[SterlingOMSRequest],
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> list[Union[int, Dict[str, Any]]]:
+        """
+        Executes several requests concurrently by delegating to the async client.
+
+        Args:
+            calls: The requests to execute.
+            max_concurrency: Maximum number of requests in flight.
+            timeout: Per-request timeout in seconds.
+
+        Returns:
+            One response (or error dictionary) per request, in the same order as `calls`.
+        """
+        return run_coroutine_sync(
+            self.get_async_client().gather_requests(calls, max_concurrency, timeout)
+        )
+
     def delete_request(
         self,
         resource_name: str,
@@ -159,12 +330,7 @@ class SterlingOMSClient:
             params = {}
 
         try:
-            response = self.session.delete(
-                url=f"{self.base_url}/{resource_name}",
-                headers=self.headers,
-                params=json.dumps(params),
-                auth=self.auth,
-            )
+            response = self._send("DELETE", resource_name, params=json.dumps(params))
             response.raise_for_status()
             return response.status_code
         except RequestException:
@@ -200,13 +366,7 @@ class SterlingOMSClient:
             payload = {}
 
         try:
-            response = self.session.patch(
-                url=f"{self.base_url}/{resource_name}",
-                headers=self.headers,
-                params=params,
-                json=payload,
-                auth=self.auth,
-            )
+            response = self._send("PATCH", resource_name, params=params, json=payload)
             response.raise_for_status()
             return response.json()
         except RequestException:
@@ -224,6 +384,7 @@ class SterlingOMSClient:
         resource_name: str,
         params: Optional[dict[str, Any]] = None,
         payload: Optional[dict[str, Any]] = None,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
         """
         Executes a POST request against Sterling OMS API.
@@ -232,6 +393,7 @@ class SterlingOMSClient:
             resource_name: The specific resource to make the request against.
             params: Query parameters for the REST API.
             payload: The request payload.
+            use_cache: Whether a cached response of an idempotent read API may be returned.
 
         Returns:
             The JSON response from the Sterling OMS REST API.
@@ -239,14 +401,24 @@ class SterlingOMSClient:
         if params is None:
             params = {}
 
+        return self._read_through(
+            "POST",
+            resource_name,
+            params,
+            payload,
+            use_cache,
+            lambda: self._post(resource_name, params, payload),
+        )
+
+    def _post(
+        self,
+        resource_name: str,
+        params: dict[str, Any],
+        payload: Optional[dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Executes a POST request without going through the response cache."""
         try:
-            response = self.session.post(
-                url=f"{self.base_url}/{resource_name}",
-                headers=self.headers,
-                params=params,
-                data=json.dumps(payload),
-                auth=self.auth,
-            )
+            response = self._send("POST", resource_name, params=params, data=json.dumps(payload))
             response.raise_for_status()
             return response.json()
         except RequestException:
@@ -263,6 +435,7 @@ class SterlingOMSClient:
         self,
         resource_name: str,
         params: Optional[dict[str, Any]] = None,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
         """
         Executes a GET request against Sterling OMS API.
@@ -270,6 +443,7 @@ class SterlingOMSClient:
         Args:
             resource_name: The specific resource to make the request against.
             params: Query parameters for the REST API.
+            use_cache: Whether a cached response of an idempotent read API may be returned.
 
         Returns:
             The JSON list response from the Sterling OMS REST API.
@@ -277,13 +451,19 @@ class SterlingOMSClient:
         if params is None:
             params = {}
 
+        return self._read_through(
+            "GET",
+            resource_name,
+            params,
+            None,
+            use_cache,
+            lambda: self._get(resource_name, params),
+        )
+
+    def _get(self, resource_name: str, params: dict[str, Any]) -> Dict[str, Any]:
+        """Executes a GET request without going through the response cache."""
         try:
-            response = self.session.get(
-                url=f"{self.base_url}/{resource_name}",
-                headers=self.headers,
-                params=params,
-                auth=self.auth,
-            )
+            response = self._send("GET", resource_name, params=params)
             response.raise_for_status()
             return response.json()
         except RequestException:
@@ -297,23 +477,57 @@ class SterlingOMSClient:
                 }
 
 
+_CLIENT_POOL: Dict[str, SterlingOMSClient] = {}
+_CLIENT_POOL_LOCK = threading.Lock()
+
+
+def _client_pool_key(credentials: Dict[str, Any]) -> str:
+    """Builds a pool key from the credentials without keeping secrets in plain text."""
+    material = json.dumps(
+        [
+            credentials[CredentialKeys.BASE_URL],
+            credentials[CredentialKeys.USERNAME],
+            credentials[CredentialKeys.PASSWORD],
+            credentials[CredentialKeys.CLIENT_CERT],
+            credentials[CredentialKeys.CLIENT_KEY],
+        ]
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def clear_sterling_oms_client_pool() -> None:
+    """Closes and forgets all pooled Sterling OMS clients (e.g. after a credential rotation)."""
+    with _CLIENT_POOL_LOCK:
+        for client in _CLIENT_POOL.values():
+            client.session.close()
+        _CLIENT_POOL.clear()
+
+
 def get_sterling_oms_client() -> SterlingOMSClient:
     """
     Get the Sterling OMS client with credentials.
 
+    Clients are pooled per process and keyed by credentials, so the mutual-TLS session, its
+    connection pool and the JWT token are reused across tool calls.
+
     NOTE: DO NOT CALL DIRECTLY IN TESTING!
 
     To test, either mock this call or call the client directly.
 
     Returns:
-        A new instance of the Sterling OMS client.
+        The pooled instance of the Sterling OMS client for the current credentials.
     """
     credentials = get_tool_credentials(Systems.STERLING_OMS)
-    sterling_oms_client = SterlingOMSClient(
-        base_url=credentials[CredentialKeys.BASE_URL],
-        username=credentials[CredentialKeys.USERNAME],
-        password=credentials[CredentialKeys.PASSWORD],
-        client_cert=credentials[CredentialKeys.CLIENT_CERT],
-        client_key=credentials[CredentialKeys.CLIENT_KEY],
-    )
+    pool_key = _client_pool_key(credentials)
+    with _CLIENT_POOL_LOCK:
+        sterling_oms_client = _CLIENT_POOL.get(pool_key)
+        if sterling_oms_client is None:
+            sterling_oms_client = SterlingOMSClient(
+                base_url=credentials[CredentialKeys.BASE_URL],
+                username=credentials[CredentialKeys.USERNAME],
+                password=credentials[CredentialKeys.PASSWORD],
+                client_cert=credentials[CredentialKeys.CLIENT_CERT],
+                client_key=credentials[CredentialKeys.CLIENT_KEY],
+            )
+            _CLIENT_POOL[pool_key] = sterling_oms_client
     return sterling_oms_client
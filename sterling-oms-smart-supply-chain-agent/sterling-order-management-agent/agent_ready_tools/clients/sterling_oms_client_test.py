@@ -1,6 +1,15 @@
+import base64
+import json
+import time
 from unittest.mock import MagicMock, patch
 
-from agent_ready_tools.clients.sterling_oms_client import SterlingOMSClient
+from agent_ready_tools.clients.sterling_oms_client import (
+    SterlingOMSClient,
+    clear_sterling_oms_client_pool,
+    get_jwt_expiry,
+    get_sterling_oms_client,
+)
+from agent_ready_tools.utils.credentials import CredentialKeys
 
 
 @patch("agent_ready_tools.clients.sterling_oms_client.ClientSideCertificateHTTPAdapter")
@@ -69,3 +78,111 @@ def test_sterling_oms_client(
 
     mock_get.assert_called_once()
     mock_post.assert_called_once()
+
+
+def _make_jwt(exp: float) -> str:
+    """
+    Build an unsigned JWT with the given expiry.
+
+    Args:
+        exp: The expiry as a UNIX timestamp.
+
+    Returns:
+        The encoded token.
+    """
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).decode().rstrip("=")
+    return f"e30.{payload}.sig"
+
+
+def test_get_jwt_expiry() -> None:
+    """Test that the JWT expiry is read from the `exp` claim."""
+    assert get_jwt_expiry(_make_jwt(1700000000)) == 1700000000
+    assert get_jwt_expiry("not-a-jwt") is None
+
+
+@patch("agent_ready_tools.clients.sterling_oms_client.ClientSideCertificateHTTPAdapter")
+@patch("agent_ready_tools.clients.sterling_oms_client.requests.Session.request")
+@patch("agent_ready_tools.clients.sterling_oms_client.requests.Session.get")
+@patch("agent_ready_tools.clients.sterling_oms_client.requests.Session.post")
+def test_sterling_oms_client_refreshes_token(
+    mock_post: MagicMock,
+    mock_get: MagicMock,
+    mock_request: MagicMock,
+    mock_mem_adapter: MagicMock,
+) -> None:
+    """
+    Test that the JWT token is reused until it nears expiry and refreshed on 401.
+
+    Args:
+        mock_post: The mock for the session.post function
+        mock_get: The mock for the session.get function
+        mock_request: The mock for the session.request function
+        mock_mem_adapter: The mock for the in-memory adapter
+    """
+    mock_get.side_effect = [
+        MagicMock(status_code=200, text=_make_jwt(time.time() + 3600)),
+        MagicMock(status_code=200, text=_make_jwt(time.time() + 3600)),
+    ]
+    unauthorized = MagicMock(status_code=401)
+    ok = MagicMock(status_code=200)
+    ok.json.return_value = {"test_key": "test_val"}
+    mock_request.side_effect = [ok, unauthorized, ok]
+
+    client = SterlingOMSClient(
+        base_url="https://host/api",
+        username="user",
+        password="pw",
+        client_cert="dummy-cert",
+        client_key="dummy-key",
+    )
+    first_token = client.jwt_token
+
+    # A valid token is reused without a new login
+    assert client.get_request(resource_name="invoke/getStatusList", use_cache=False) == {
+        "test_key": "test_val"
+    }
+    assert mock_post.call_count == 1
+
+    # A 401 triggers a single refresh and retry
+    assert client.get_request(resource_name="invoke/getStatusList", use_cache=False) == {
+        "test_key": "test_val"
+    }
+    assert mock_post.call_count == 2
+    assert mock_request.call_count == 3
+    assert client.jwt_token != first_token
+    assert client.headers["Authorization"] == f"Bearer {client.jwt_token}"
+
+
+@patch("agent_ready_tools.clients.sterling_oms_client.SterlingOMSClient")
+@patch("agent_ready_tools.clients.sterling_oms_client.get_tool_credentials")
+def test_get_sterling_oms_client_reuses_pooled_client(
+    mock_credentials: MagicMock,
+    mock_client_class: MagicMock,
+) -> None:
+    """
+    Test that clients are pooled per credentials.
+
+    Args:
+        mock_credentials: The mock for the get_tool_credentials function
+        mock_client_class: The mock for the SterlingOMSClient class
+    """
+    clear_sterling_oms_client_pool()
+    credentials = {
+        CredentialKeys.BASE_URL: "https://host/api",
+        CredentialKeys.USERNAME: "user",
+        CredentialKeys.PASSWORD: "pw",
+        CredentialKeys.CLIENT_CERT: "dummy-cert",
+        CredentialKeys.CLIENT_KEY: "dummy-key",
+    }
+    mock_credentials.return_value = credentials
+    mock_client_class.side_effect = lambda **_: MagicMock()
+
+    first = get_sterling_oms_client()
+    assert get_sterling_oms_client() is first
+    assert mock_client_class.call_count == 1
+
+    mock_credentials.return_value = {**credentials, CredentialKeys.USERNAME: "other"}
+    assert get_sterling_oms_client() is not first
+    assert mock_client_class.call_count == 2
+
+    clear_sterling_oms_client_pool()
@@ -0,0 +1,189 @@
+from collections import OrderedDict
+import copy
+from dataclasses import dataclass
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+# Seconds a response of each idempotent read API stays cached, APIs not listed are never cached
+DEFAULT_RESPONSE_TTLS: Dict[str, float] = {
+    "getStatusList": 60 * 60,
+    "getCustomerList": 5 * 60,
+    "getCustomerDetails": 5 * 60,
+    "getOrderDetails": 30,
+}
+# Maximum number of responses kept before the least recently used one is evicted
+DEFAULT_MAX_CACHED_RESPONSES = 512
+
+
+class CacheKey(NamedTuple):
+    """Identifies a cached response and the read API it belongs to."""
+
+    api_name: str
+    digest: str
+
+
+@dataclass
+class ResponseCacheStats:
+    """Counters of a response cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def get_api_name(resource_name: str, payload: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """
+    Resolves the Sterling OMS API behind a request.
+
+    Args:
+        resource_name: The requested resource, e.g. `invoke/getStatusList` or `invoke/getPage`.
+        payload: The request payload, holding the paged API for `invoke/getPage`.
+
+    Returns:
+        The API name, or None for REST resources that are not invoked APIs.
+    """
+    resource = resource_name.strip("/")
+    if resource == "invoke/getPage":
+        api = payload.get("API") if isinstance(payload, dict) else None
+        return api.get("Name") if isinstance(api, dict) else None
+    if resource.startswith("invoke/"):
+        return resource.split("/", 1)[1]
+    return None
+
+
+class SterlingOMSResponseCache:
+    """
+    A thread-safe, size-bounded LRU cache of Sterling OMS read responses with per-API TTLs.
+
+    Only successful responses of the APIs listed in the TTL table are cached; callers changing
+    data on the server drop the affected entries with `invalidate`.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = DEFAULT_MAX_CACHED_RESPONSES,
+    ):
+        """
+        Args:
+            ttls: Seconds a response stays cached, per API name.
+            max_entries: Maximum number of cached responses.
+        """
+        self.ttls = dict(DEFAULT_RESPONSE_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = ResponseCacheStats()
+
+    def make_key(
+        self,
+        method: str,
+        resource_name: str,
+        params: Optional[Dict[str, Any]] = None,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> Optional[CacheKey]:
+        """
+        Builds the cache key of a request.
+
+        Args:
+            method: The HTTP method.
+            resource_name: The requested resource.
+            params: Query parameters of the request.
+            payload: The request payload.
+
+        Returns:
+            The cache key, or None if the request is not cacheable.
+        """
+        api_name = get_api_name(resource_name, payload)
+        if api_name is None or self.ttls.get(api_name, 0) <= 0:
+            return None
+        material = json.dumps(
+            [method.upper(), resource_name.strip("/"), params or {}, payload or {}],
+            sort_keys=True,
+            default=str,
+        )
+        return CacheKey(api_name, hashlib.sha256(material.encode("utf-8")).hexdigest())
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """
+        Looks up a response.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            A copy of the cached response, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            response = entry[1]
+        return copy.deepcopy(response)
+
+    def put(self, key: CacheKey, response: Any) -> None:
+        """
+        Stores a response unless it reports an error.
+
+        Args:
+            key: The cache key.
+            response: The response to store.
+        """
+        if not isinstance(response, dict) or "errors" in response or "errorMessage" in response:
+            return
+        expires_at = time.monotonic() + self.ttls.get(key.api_name, 0)
+        with self._lock:
+            self._entries[key] = (expires_at, copy.deepcopy(response))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def invalidate(self, api_names: Optional[Iterable[str]] = None) -> int:
+        """
+        Drops cached responses.
+
+        Args:
+            api_names: The APIs whose responses are dropped, all responses when None.
+
+        Returns:
+            The number of dropped responses.
+        """
+        with self._lock:
+            if api_names is None:
+                stale = list(self._entries)
+            else:
+                names = set(api_names)
+                stale = [key for key in self._entries if key.api_name in names]
+            for key in stale:
+                del self._entries[key]
+            self._stats.invalidations += len(stale)
+            return len(stale)
+
+    def stats(self) -> ResponseCacheStats:
+        """Returns a snapshot of the cache counters."""
+        with self._lock:
+            return ResponseCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                invalidations=self._stats.invalidations,
+                size=len(self._entries),
+            )
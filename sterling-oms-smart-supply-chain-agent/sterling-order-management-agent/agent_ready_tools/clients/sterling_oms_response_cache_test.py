@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+from agent_ready_tools.clients.sterling_oms_response_cache import (
+    SterlingOMSResponseCache,
+    get_api_name,
+)
+
+ORDER_DETAILS_PAYLOAD = {"API": {"Name": "getOrderDetails", "Input": {"Order": {"OrderNo": "Y1"}}}}
+
+
+def test_get_api_name() -> None:
+    """Test that the API name is read from the resource or the getPage payload."""
+    assert get_api_name("invoke/getStatusList") == "getStatusList"
+    assert get_api_name("/invoke/getPage", ORDER_DETAILS_PAYLOAD) == "getOrderDetails"
+    assert get_api_name("order/123") is None
+
+
+def test_response_cache_ttl_and_invalidation() -> None:
+    """Test that cached responses expire, can be invalidated and are counted."""
+    cache = SterlingOMSResponseCache(ttls={"getOrderDetails": 30})
+    key = cache.make_key("POST", "invoke/getPage", {}, ORDER_DETAILS_PAYLOAD)
+    assert key is not None
+    assert cache.make_key("POST", "invoke/getStatusList") is None
+
+    with patch("agent_ready_tools.clients.sterling_oms_response_cache.time.monotonic") as now:
+        now.return_value = 100.0
+        assert cache.get(key) is None
+        cache.put(key, {"Output": {"Order": {"OrderNo": "Y1"}}})
+        cache.put(
+            cache.make_key("POST", "invoke/getPage", {}, {"API": {"Name": "getOrderDetails"}}),
+            {"errorMessage": "boom"},
+        )
+        assert cache.get(key) == {"Output": {"Order": {"OrderNo": "Y1"}}}
+        assert cache.stats().size == 1
+
+        now.return_value = 131.0
+        assert cache.get(key) is None
+
+        now.return_value = 200.0
+        cache.put(key, {"Output": {}})
+        assert cache.invalidate(["getOrderDetails"]) == 1
+        assert cache.get(key) is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.invalidations, stats.size) == (1, 3, 1, 0)
+    assert stats.hit_rate == 0.25
+
+
+def test_response_cache_evicts_least_recently_used() -> None:
+    """Test that the cache stays within its size bound."""
+    cache = SterlingOMSResponseCache(ttls={"getStatusList": 60}, max_entries=2)
+    keys = [cache.make_key("POST", "invoke/getStatusList", {}, {"Page": i}) for i in range(3)]
+
+    cache.put(keys[0], {"i": 0})
+    cache.put(keys[1], {"i": 1})
+    assert cache.get(keys[0]) == {"i": 0}
+    cache.put(keys[2], {"i": 2})
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == {"i": 0}
+    assert cache.stats().evictions == 1
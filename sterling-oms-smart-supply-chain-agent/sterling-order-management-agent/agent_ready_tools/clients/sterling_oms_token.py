@@ -0,0 +1,27 @@
+import base64
+import json
+from typing import Optional
+
+# Refresh the JWT this many seconds before it expires
+TOKEN_REFRESH_MARGIN_SECONDS = 60
+# Token lifetime assumed when the JWT carries no `exp` claim
+DEFAULT_TOKEN_TTL_SECONDS = 15 * 60
+
+
+def get_jwt_expiry(token: str) -> Optional[float]:
+    """
+    Reads the `exp` claim of a JWT without verifying its signature.
+
+    Args:
+        token: The encoded JWT.
+
+    Returns:
+        The expiry as a UNIX timestamp, or None if the token carries no readable `exp` claim.
+    """
+    try:
+        payload_segment = token.split(".")[1]
+        payload_segment += "=" * (-len(payload_segment) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload_segment))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
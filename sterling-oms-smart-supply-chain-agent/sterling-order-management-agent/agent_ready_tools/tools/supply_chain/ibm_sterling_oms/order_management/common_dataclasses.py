@@ -3,7 +3,11 @@ from typing import Any, Dict, Optional
 
 from pydantic.dataclasses import dataclass
 
+from agent_ready_tools.clients.sterling_oms_client import SterlingOMSClient
+from agent_ready_tools.utils.date_conversion import iso_8601_datetime_convert_to_date
+
 # from invoke/getStatusList, querying requires the specific status code so storing a dict of common codes here
+# used as a fallback when the status list cannot be retrieved, see `get_status_desc_to_code`
 STATUS_DESC_TO_CODE = {
     "Draft Order Created": "1000",
     "Awaiting Validation": "1000.100",
@@ -89,6 +93,44 @@ STATUS_DESC_TO_CODE = {
     "Cancelled": "9000",
 }
 
+# getStatusList input selecting the sales order fulfillment statuses
+STATUS_LIST_PAYLOAD = {"DocumentType": "0001", "ProcessTypeKey": "ORDER_FULFILLMENT"}
+
+
+def get_status_desc_to_code(client: SterlingOMSClient) -> Dict[str, str]:
+    """
+    Retrieves the order fulfillment statuses from `invoke/getStatusList`.
+
+    The response is served from the client's response cache after the first call.
+
+    Args:
+        client: The Sterling OMS client
+
+    Returns:
+        A mapping from status description to status code, falling back to `STATUS_DESC_TO_CODE` if
+        the status list cannot be retrieved.
+    """
+    response = client.post_request(
+        resource_name="invoke/getStatusList", payload=STATUS_LIST_PAYLOAD
+    )
+    return status_desc_to_code_from_response(response)
+
+
+def status_desc_to_code_from_response(response: Any) -> Dict[str, str]:
+    """Parse a getStatusList response into a mapping from status description to status code."""
+    if not isinstance(response, dict) or "errors" in response or "errorMessage" in response:
+        return STATUS_DESC_TO_CODE
+
+    statuses = response.get("StatusList", response).get("Status", [])
+    if isinstance(statuses, dict):
+        statuses = [statuses]
+    status_desc_to_code = {
+        status["Description"]: status["Status"]
+        for status in statuses
+        if isinstance(status, dict) and status.get("Description") and status.get("Status")
+    }
+    return status_desc_to_code or STATUS_DESC_TO_CODE
+
 
 def display_error_from_response(response: Dict[str, Any]) -> str:
     """Parse the error response into a user friendly format."""
@@ -159,9 +201,13 @@ def get_order_list_body_from_template(
     status: Optional[str] = None,
     limit: Optional[int] = 0,
     skip: Optional[int] = 0,
+    status_desc_to_code: Optional[Dict[str, str]] = None,
 ) -> Dict[str, Any]:
     """Generate post request payload for get order list."""
 
+    if status_desc_to_code is None:
+        status_desc_to_code = STATUS_DESC_TO_CODE
+
     check_limit = int(limit) if limit and int(limit) > 0 else 10
 
     check_skip = int(skip) if skip and int(skip) >= 0 else 0
@@ -188,7 +234,7 @@ def get_order_list_body_from_template(
                     "ReadFromHistory": "N",
                     "FromOrderDate": from_date if from_date is not None else "",
                     "ToOrderDate": to_date if to_date is not None else "",
-                    "Status": STATUS_DESC_TO_CODE.get(status, "") if status is not None else "",
+                    "Status": status_desc_to_code.get(status, "") if status is not None else "",
                     "OrderDateQryType": "BETWEEN",
                     "OrderBy": {"Attribute": {"Name": "OrderDate", "Desc": True}},
                 }
@@ -319,6 +365,23 @@ class OMSOrderHeader:
     # AddressLine1 : Optional[str]
 
 
+def order_header_from_response(order: Dict[str, Any]) -> OMSOrderHeader:
+    """Parse one `Output.OrderList.Order` entry of a getOrderList response into an order header."""
+    return OMSOrderHeader(
+        order_number=order.get("OrderNo", ""),
+        order_status=order.get("Status", ""),
+        buyer_organization=order.get("BuyerOrganizationCode"),
+        enterprise=order.get("EnterpriseCode", ""),
+        order_date=iso_8601_datetime_convert_to_date(order.get("OrderDate", "")),
+        total_amount=f"{order.get("PriceInfo", {}).get("TotalAmount", "0.00")} {order.get("PriceInfo", {}).get("Currency", "")}",
+        hold_status=order.get("HoldFlag", ""),
+        order_id=order.get("OrderHeaderKey", ""),
+        city_name=order.get("PersonInfoShipTo", {}).get("City", ""),
+        zip_code=order.get("PersonInfoShipTo", {}).get("ZipCode", ""),
+        # address= order.get("PersonInfoShipTo",{}).get("AddressLine1","")
+    )
+
+
 @dataclass
 class OMSCustomerAccount:
     """Represents the details of a customer account."""
@@ -386,3 +449,75 @@ class OMSUpdateOrderResponse:
 
     order_id: str
     order_number: Optional[str]
+
+
+@dataclass
+class OMSOrderDetailsBatchItem:
+    """Represents the order details retrieved for one requested order of a batch."""
+
+    order_number: Optional[str]
+    order_header_key: Optional[str]
+    success: bool
+    message: Optional[str] = None
+    details: Optional[OMSOrderDetails] = None
+
+
+def order_details_from_response(r: Dict[str, Any]) -> OMSOrderDetails:
+    """Parse the `Output.Order` object of a getOrderDetails response into order details."""
+    result = OMSOrderDetails(
+        order_id=r.get("id", ""),
+        order_number=r.get("OrderNo"),
+        order_date=r.get("OrderDate"),
+        order_type=r.get("DocumentType"),
+        status=r.get("Status"),
+        buyer_organization=r.get("BuyerOrganizationCode"),
+        requested_ship_date=r.get("ReqShipDate"),
+        requested_delivery_date=r.get("ReqDeliveryDate"),
+        bill_to_id=r.get("BillToID"),
+        vendor_id=r.get("VendorID", ""),
+        customer_po_number=r.get("CustomerPONo", ""),
+        total_amount=r.get("PriceInfo", {}).get("TotalAmount", "")
+        + " "
+        + r.get("PriceInfo", {}).get("Currency", ""),
+        order_lines=None,
+        order_dates=None,
+        order_notes=None,
+        city_name=r.get("PersonInfoShipTo", {}).get("City", ""),
+        zip_code=r.get("PersonInfoShipTo", {}).get("ZipCode", ""),
+        # address= r.get("PersonInfoShipTo",{}).get("AddressLine1","")
+    )
+
+    line_items = r.get("OrderLines", {}).get("OrderLine")
+    if line_items is not None and isinstance(line_items, list):
+        result.order_lines = [
+            OMSOrderLine(
+                item_id=line.get("ItemDetails", {}).get("ItemID"),
+                uom=line.get("ItemDetails", {}).get("UnitOfMeasure"),
+                ship_node=line.get("ShipNode"),
+                segment=line.get("Segment"),
+                segment_type=line.get("SegmentType"),
+            )
+            for line in line_items
+        ]
+
+    dates = r.get("OrderDates", {}).get("OrderDate")
+    if dates is not None and isinstance(dates, list):
+        result.order_dates = [
+            OMSOrderDate(
+                committed_date=date.get("CommittedDate"),
+                expected_date=date.get("ExpectedDate"),
+            )
+            for date in dates
+        ]
+
+    notes = r.get("Notes", {}).get("Note")
+    if notes is not None and isinstance(notes, list):
+        result.order_notes = [
+            OMSOrderNote(
+                note_text=note.get("NoteText"),
+                reason_code=note.get("ReasonCode"),
+            )
+            for note in notes
+        ]
+
+    return result
@@ -0,0 +1,110 @@
+from typing import Optional
+
+from ibm_watsonx_orchestrate.agent_builder.tools import tool
+
+from agent_ready_tools.clients.sterling_oms_async_client import SterlingOMSRequest
+from agent_ready_tools.clients.sterling_oms_client import get_sterling_oms_client
+from agent_ready_tools.tools.procurement.common_dataclasses import ToolResponse
+from agent_ready_tools.tools.supply_chain.ibm_sterling_oms.order_management.common_dataclasses import (
+    OMSOrderDetailsBatchItem,
+    display_error_from_response,
+    get_order_details_body_from_template,
+    order_details_from_response,
+)
+from agent_ready_tools.utils.tool_credentials import STERLING_OMS_CONNECTIONS
+
+# Maximum number of getOrderDetails calls in flight at once
+MAX_CONCURRENT_ORDER_DETAILS = 10
+
+
+@tool(expected_credentials=STERLING_OMS_CONNECTIONS)
+def sterling_oms_get_order_details_batch(
+    order_header_keys: Optional[list[str]] = None,
+    order_numbers: Optional[list[str]] = None,
+    enterprise_code: Optional[str] = None,
+) -> ToolResponse[list[OMSOrderDetailsBatchItem]]:
+    """
+    Retrieves order details for several orders at once.
+
+    Args:
+        order_header_keys: The unique ids of the orders, returned by the tool
+            `sterling_oms_get_orders`. When order_numbers is also given, both lists are paired by
+            position.
+        order_numbers: The numbers of the orders
+        enterprise_code: The unique ID of the enterprise to which the orders belong to
+
+    Returns:
+        The retrieved order details, one entry per requested order in the requested order.
+    """
+    header_keys = order_header_keys or []
+    numbers = order_numbers or []
+    if header_keys and numbers and len(header_keys) != len(numbers):
+        return ToolResponse(
+            success=False,
+            message="order_header_keys and order_numbers must have the same number of entries.",
+        )
+    count = max(len(header_keys), len(numbers))
+    if count == 0:
+        return ToolResponse(
+            success=False,
+            message="No orders provided, please specify order_header_keys or order_numbers.",
+        )
+    requested = [
+        (
+            numbers[i] if numbers else "",
+            header_keys[i] if header_keys else "",
+        )
+        for i in range(count)
+    ]
+
+    try:
+        client = get_sterling_oms_client()
+    except (ValueError, AssertionError):
+        return ToolResponse(success=False, message="Failure to retrieve credentials")
+
+    # Identical orders are fetched once and shared between their positions
+    unique_orders = list(dict.fromkeys(requested))
+    responses = client.gather_requests(
+        [
+            SterlingOMSRequest(
+                method="POST",
+                resource_name="invoke/getPage",
+                payload=get_order_details_body_from_template(
+                    order_number, order_header_key, enterprise_code
+                ),
+            )
+            for order_number, order_header_key in unique_orders
+        ],
+        max_concurrency=MAX_CONCURRENT_ORDER_DETAILS,
+    )
+
+    items_by_order = {}
+    for (order_number, order_header_key), response in zip(unique_orders, responses):
+        item = OMSOrderDetailsBatchItem(
+            order_number=order_number or None,
+            order_header_key=order_header_key or None,
+            success=False,
+        )
+        if not isinstance(response, dict):
+            item.message = f"Unexpected response: {response}"
+        elif "errors" in response:
+            item.message = display_error_from_response(response)
+        elif "errorMessage" in response:
+            item.message = response["errorMessage"]
+        else:
+            order = response.get("Output", {}).get("Order")
+            if isinstance(order, dict) and order:
+                item.success = True
+                item.details = order_details_from_response(order)
+            else:
+                item.message = "Order not found"
+        items_by_order[(order_number, order_header_key)] = item
+
+    results = [items_by_order[order] for order in requested]
+    succeeded = sum(1 for item in results if item.success)
+
+    return ToolResponse(
+        success=succeeded > 0,
+        message=f"Order details retrieved for {succeeded} of {len(results)} orders.",
+        content=results,
+    )
@@ -0,0 +1,77 @@
+from unittest.mock import MagicMock, patch
+
+from agent_ready_tools.tools.supply_chain.ibm_sterling_oms.order_management.get_order_details_batch import (
+    sterling_oms_get_order_details_batch,
+)
+
+
+def _order_response(order_number: str) -> dict:
+    """
+    Build a getOrderDetails response for an order.
+
+    Args:
+        order_number: The number of the order
+
+    Returns:
+        The mocked API response.
+    """
+    return {
+        "Output": {
+            "Order": {
+                "OrderNo": order_number,
+                "Status": "Shipped",
+                "PriceInfo": {"Currency": "USD", "TotalAmount": "10.00"},
+            }
+        }
+    }
+
+
+def test_get_order_details_batch() -> None:
+    """Test that orders are deduplicated, fetched in one batch and returned in input order."""
+
+    with patch(
+        "agent_ready_tools.tools.supply_chain.ibm_sterling_oms.order_management.get_order_details_batch.get_sterling_oms_client"
+    ) as mock_sterling_client:
+        mock_client = MagicMock()
+        mock_sterling_client.return_value = mock_client
+        mock_client.gather_requests.return_value = [
+            _order_response("Y1"),
+            {"errorMessage": "Order not accessible", "status_code": 403},
+            _order_response("Y3"),
+        ]
+
+        response = sterling_oms_get_order_details_batch(
+            order_header_keys=["K1", "K2", "K1", "K3"],
+            order_numbers=["Y1", "Y2", "Y1", "Y3"],
+        )
+
+        assert response.success
+        assert response.content
+
+        # duplicate K1 is only fetched once
+        requests = mock_client.gather_requests.call_args.args[0]
+        assert [r.payload["API"]["Input"]["Order"]["OrderHeaderKey"] for r in requests] == [
+            "K1",
+            "K2",
+            "K3",
+        ]
+
+        assert [item.order_header_key for item in response.content] == ["K1", "K2", "K1", "K3"]
+        assert [item.success for item in response.content] == [True, False, True, True]
+        assert response.content[0].details.order_number == "Y1"
+        assert response.content[1].message == "Order not accessible"
+        assert response.content[3].details.order_number == "Y3"
+
+
+def test_get_order_details_batch_mismatched_lists() -> None:
+    """Test that mismatched order lists are rejected without calling the API."""
+
+    with patch(
+        "agent_ready_tools.tools.supply_chain.ibm_sterling_oms.order_management.get_order_details_batch.get_sterling_oms_client"
+    ) as mock_sterling_client:
+        response = sterling_oms_get_order_details_batch(
+            order_header_keys=["K1", "K2"], order_numbers=["Y1"]
+        )
+
+        assert not response.success
+        mock_sterling_client.assert_not_called()
@@ -7,8 +7,9 @@ from agent_ready_tools.tools.procurement.common_dataclasses import ToolResponse
 from agent_ready_tools.tools.supply_chain.ibm_sterling_oms.order_management.common_dataclasses import (
     OMSOrderHeader,
     get_order_list_body_from_template,
+    get_status_desc_to_code,
+    order_header_from_response,
 )
-from agent_ready_tools.utils.date_conversion import iso_8601_datetime_convert_to_date
 from agent_ready_tools.utils.tool_credentials import STERLING_OMS_CONNECTIONS
 
 
@@ -53,6 +54,7 @@ def sterling_oms_get_orders(
         status,
         limit,
         skip,
+        status_desc_to_code=get_status_desc_to_code(client) if status else None,
     )
 
     response = client.post_request(resource_name="invoke/getPage", payload=payload)
@@ -61,23 +63,7 @@ def sterling_oms_get_orders(
 
     order_list = response.get("Output", {}).get("OrderList", {}).get("Order", [])
 
-    order_header_list = []
-    for order in order_list:
-        order_header_list.append(
-            OMSOrderHeader(
-                order_number=order.get("OrderNo", ""),
-                order_status=order.get("Status", ""),
-                buyer_organization=order.get("BuyerOrganizationCode"),
-                enterprise=order.get("EnterpriseCode", ""),
-                order_date=iso_8601_datetime_convert_to_date(order.get("OrderDate", "")),
-                total_amount=f"{order.get("PriceInfo", {}).get("TotalAmount", "0.00")} {order.get("PriceInfo", {}).get("Currency", "")}",
-                hold_status=order.get("HoldFlag", ""),
-                order_id=order.get("OrderHeaderKey", ""),
-                city_name=order.get("PersonInfoShipTo", {}).get("City", ""),
-                zip_code=order.get("PersonInfoShipTo", {}).get("ZipCode", ""),
-                # address= order.get("PersonInfoShipTo",{}).get("AddressLine1","")
-            )
-        )
+    order_header_list = [order_header_from_response(order) for order in order_list]
 
     if len(order_header_list) == 0:
         return ToolResponse(success=False, message="No orders were found")
@@ -68,3 +68,22 @@ def test_get_orders() -> None:
         mock_client.post_request.assert_called_once_with(
             resource_name="invoke/getPage", payload=get_order_list_body_from_template()
         )
+
+
+def test_get_orders_resolves_status_from_status_list() -> None:
+    """Test that the status filter is resolved with the status list of the server."""
+
+    with patch(
+        "agent_ready_tools.tools.supply_chain.ibm_sterling_oms.order_management.get_orders.get_sterling_oms_client"
+    ) as mock_sterling_client:
+        mock_client = MagicMock()
+        mock_sterling_client.return_value = mock_client
+        mock_client.post_request.side_effect = [
+            {"Status": [{"Description": "Created", "Status": "1100.custom"}]},
+            TEST_ORDERS,
+        ]
+
+        sterling_oms_get_orders(status="Created")
+
+        payload = mock_client.post_request.call_args_list[1].kwargs["payload"]
+        assert payload["API"]["Input"]["Order"]["Status"] == "1100.custom"
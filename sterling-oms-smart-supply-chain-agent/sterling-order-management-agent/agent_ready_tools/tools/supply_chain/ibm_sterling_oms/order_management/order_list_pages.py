@@ -0,0 +1,243 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+
+from agent_ready_tools.clients.sterling_oms_async_client import AsyncSterlingOMSClient
+from agent_ready_tools.clients.sterling_oms_client import SterlingOMSClient
+from agent_ready_tools.tools.supply_chain.ibm_sterling_oms.order_management.common_dataclasses import (
+    STATUS_LIST_PAYLOAD,
+    OMSOrderHeader,
+    display_error_from_response,
+    get_order_list_body_from_template,
+    get_status_desc_to_code,
+    order_header_from_response,
+    status_desc_to_code_from_response,
+)
+
+# Page size used when walking an order list, getPage accepts at most a few hundred records a page
+DEFAULT_ORDER_LIST_PAGE_SIZE = 100
+
+
+class OrderListPageError(Exception):
+    """Raised when a page of an order list could not be retrieved."""
+
+
+def _order_list_payload(
+    buyer_organization_code: Optional[str],
+    order_number: Optional[str],
+    enterprise_code: Optional[str],
+    from_date: Optional[str],
+    to_date: Optional[str],
+    status: Optional[str],
+    page_size: int,
+    max_items: Optional[int],
+    status_desc_to_code: Optional[Dict[str, str]],
+) -> Dict[str, Any]:
+    """Build the getPage payload of the first page, shrinking the page to fit a small budget."""
+    if max_items is not None:
+        page_size = min(page_size, max_items)
+    return get_order_list_body_from_template(
+        buyer_organization_code,
+        order_number,
+        enterprise_code,
+        from_date,
+        to_date,
+        status,
+        limit=page_size,
+        skip=0,
+        status_desc_to_code=status_desc_to_code,
+    )
+
+
+def _page_payload(
+    first_page: Dict[str, Any], page_number: int, page_set_token: str
+) -> Dict[str, Any]:
+    """Build the getPage payload of a page, carrying over the page set token of the previous one."""
+    return {**first_page, "PageNumber": page_number, "PageSetToken": page_set_token}
+
+
+def _read_page(response: Dict[str, Any], page_size: int) -> Tuple[list[Dict[str, Any]], bool, str]:
+    """
+    Extract the orders of a getPage response.
+
+    Args:
+        response: The getPage response
+        page_size: The requested page size
+
+    Returns:
+        The orders of the page, whether it is the last page and the page set token of the next
+        page.
+    """
+    if "errors" in response:
+        raise OrderListPageError(display_error_from_response(response))
+    if "errorMessage" in response:
+        raise OrderListPageError(response["errorMessage"])
+
+    order_list = response.get("Output", {}).get("OrderList", {})
+    orders = order_list.get("Order", [])
+    # A page holding a single order comes back as an object instead of a list
+    if isinstance(orders, dict):
+        orders = [orders]
+
+    is_last_page = (
+        response.get("IsLastPage") == "Y"
+        or order_list.get("LastRecordSet") == "Y"
+        or len(orders) < page_size
+    )
+    return orders, is_last_page, response.get("PageSetToken", "")
+
+
+def iter_order_headers(
+    client: SterlingOMSClient,
+    buyer_organization_code: Optional[str] = None,
+    order_number: Optional[str] = None,
+    enterprise_code: Optional[str] = None,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    status: Optional[str] = None,
+    page_size: int = DEFAULT_ORDER_LIST_PAGE_SIZE,
+    max_items: Optional[int] = None,
+) -> Iterator[OMSOrderHeader]:
+    """
+    Lazily walks the pages of an order list query, fetching the next page in the background while
+    the current one is consumed.
+
+    Only the page being consumed and the prefetched one are held in memory, so large date ranges
+    can be streamed without loading every order up front.
+
+    Args:
+        client: The Sterling OMS client
+        buyer_organization_code: Buyer Organization Code (e.g. Sterling)
+        order_number: The number of the order
+        enterprise_code: The enterprise code of the buyer
+        from_date: Beginning date to query from in ISO-8601 format (YYYY-MM-DD)
+        to_date: End date to query to in ISO-8601 format (YYYY-MM-DD)
+        status: Status of Order (e.g. Backordered, Created, Cancelled, etc.)
+        page_size: Number of orders requested per page
+        max_items: Maximum number of orders to yield, all matching orders when None
+
+    Returns:
+        An iterator over the matching orders, newest first.
+    """
+    if max_items is not None and max_items <= 0:
+        return
+
+    first_page = _order_list_payload(
+        buyer_organization_code,
+        order_number,
+        enterprise_code,
+        from_date,
+        to_date,
+        status,
+        page_size,
+        max_items,
+        get_status_desc_to_code(client) if status else None,
+    )
+    page_size = first_page["PageSize"]
+    remaining = max_items
+
+    def fetch(page_number: int, page_set_token: str) -> Dict[str, Any]:
+        return client.post_request(
+            resource_name="invoke/getPage",
+            payload=_page_payload(first_page, page_number, page_set_token),
+        )
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        page_number = 1
+        pending: Optional[Future] = executor.submit(fetch, page_number, "")
+        while pending is not None:
+            orders, is_last_page, page_set_token = _read_page(pending.result(), page_size)
+            pending = None
+            if remaining is not None:
+                orders = orders[:remaining]
+                remaining -= len(orders)
+            if not is_last_page and (remaining is None or remaining > 0):
+                page_number += 1
+                pending = executor.submit(fetch, page_number, page_set_token)
+            for order in orders:
+                yield order_header_from_response(order)
+    finally:
+        # Do not wait for a prefetched page nobody is going to read
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def aiter_order_headers(
+    client: AsyncSterlingOMSClient,
+    buyer_organization_code: Optional[str] = None,
+    order_number: Optional[str] = None,
+    enterprise_code: Optional[str] = None,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    status: Optional[str] = None,
+    page_size: int = DEFAULT_ORDER_LIST_PAGE_SIZE,
+    max_items: Optional[int] = None,
+) -> AsyncIterator[OMSOrderHeader]:
+    """
+    Asynchronous counterpart of `iter_order_headers`, the next page is requested as a task while
+    the current one is consumed.
+
+    Args:
+        client: The async Sterling OMS client
+        buyer_organization_code: Buyer Organization Code (e.g. Sterling)
+        order_number: The number of the order
+        enterprise_code: The enterprise code of the buyer
+        from_date: Beginning date to query from in ISO-8601 format (YYYY-MM-DD)
+        to_date: End date to query to in ISO-8601 format (YYYY-MM-DD)
+        status: Status of Order (e.g. Backordered, Created, Cancelled, etc.)
+        page_size: Number of orders requested per page
+        max_items: Maximum number of orders to yield, all matching orders when None
+
+    Returns:
+        An async iterator over the matching orders, newest first.
+    """
+    if max_items is not None and max_items <= 0:
+        return
+
+    first_page = _order_list_payload(
+        buyer_organization_code,
+        order_number,
+        enterprise_code,
+        from_date,
+        to_date,
+        status,
+        page_size,
+        max_items,
+        (
+            status_desc_to_code_from_response(
+                await client.post_request(
+                    resource_name="invoke/getStatusList", payload=STATUS_LIST_PAYLOAD
+                )
+            )
+            if status
+            else None
+        ),
+    )
+    page_size = first_page["PageSize"]
+    remaining = max_items
+
+    def fetch(page_number: int, page_set_token: str) -> "asyncio.Task[Dict[str, Any]]":
+        return asyncio.ensure_future(
+            client.post_request(
+                resource_name="invoke/getPage",
+                payload=_page_payload(first_page, page_number, page_set_token),
+            )
+        )
+
+    page_number = 1
+    pending: Optional[asyncio.Future] = fetch(page_number, "")
+    try:
+        while pending is not None:
+            orders, is_last_page, page_set_token = _read_page(await pending, page_size)
+            pending = None
+            if remaining is not None:
+                orders = orders[:remaining]
+                remaining -= len(orders)
+            if not is_last_page and (remaining is None or remaining > 0):
+                page_number += 1
+                pending = fetch(page_number, page_set_token)
+            for order in orders:
+                yield order_header_from_response(order)
+    finally:
+        if pending is not None:
+            pending.cancel()
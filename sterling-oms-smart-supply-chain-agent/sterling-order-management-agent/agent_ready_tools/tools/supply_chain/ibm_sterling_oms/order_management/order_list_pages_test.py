@@ -0,0 +1,99 @@
+import asyncio
+from typing import Any, Dict
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from agent_ready_tools.tools.supply_chain.ibm_sterling_oms.order_management.order_list_pages import (
+    OrderListPageError,
+    aiter_order_headers,
+    iter_order_headers,
+)
+
+TOTAL_ORDERS = 7
+
+
+def _order_page(resource_name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Serve a page of a list of TOTAL_ORDERS orders.
+
+    Args:
+        resource_name: The requested resource
+        payload: The getPage payload
+
+    Returns:
+        The getPage response.
+    """
+    page_number, page_size = payload["PageNumber"], payload["PageSize"]
+    start = (page_number - 1) * page_size
+    end = min(start + page_size, TOTAL_ORDERS)
+    return {
+        "IsLastPage": "Y" if end >= TOTAL_ORDERS else "N",
+        "PageSetToken": f"token-{page_number}",
+        "Output": {
+            "OrderList": {
+                "Order": [
+                    {
+                        "OrderNo": f"Y{i}",
+                        "OrderHeaderKey": str(i),
+                        "OrderDate": "2025-08-22T23:01:31+00:00",
+                        "Status": "Created",
+                    }
+                    for i in range(start, end)
+                ]
+            }
+        },
+    }
+
+
+def test_iter_order_headers() -> None:
+    """Test that all pages of an order list are walked in order."""
+    client = MagicMock()
+    client.post_request.side_effect = lambda resource_name, payload: _order_page(
+        resource_name, payload
+    )
+
+    orders = list(iter_order_headers(client, enterprise_code="Aurora", page_size=3))
+
+    assert [o.order_number for o in orders] == [f"Y{i}" for i in range(TOTAL_ORDERS)]
+    assert orders[0].order_date == "2025-08-22"
+    payloads = [c.kwargs["payload"] for c in client.post_request.call_args_list]
+    assert [p["PageNumber"] for p in payloads] == [1, 2, 3]
+    assert [p["PageSetToken"] for p in payloads] == ["", "token-1", "token-2"]
+    assert payloads[0]["API"]["Input"]["Order"]["EnterpriseCode"] == "Aurora"
+
+
+def test_iter_order_headers_stops_at_budget() -> None:
+    """Test that no page is requested past the item budget."""
+    client = MagicMock()
+    client.post_request.side_effect = lambda resource_name, payload: _order_page(
+        resource_name, payload
+    )
+
+    orders = list(iter_order_headers(client, page_size=3, max_items=5))
+
+    assert [o.order_number for o in orders] == [f"Y{i}" for i in range(5)]
+    assert client.post_request.call_count == 2
+
+
+def test_iter_order_headers_raises_on_error() -> None:
+    """Test that a failed page is surfaced as an error."""
+    client = MagicMock()
+    client.post_request.return_value = {"errorMessage": "boom", "status_code": 500}
+
+    with pytest.raises(OrderListPageError, match="boom"):
+        list(iter_order_headers(client))
+
+
+def test_aiter_order_headers() -> None:
+    """Test that the async iterator walks the pages and honours the item budget."""
+    client = MagicMock()
+    client.post_request = AsyncMock(
+        side_effect=lambda resource_name, payload: _order_page(resource_name, payload)
+    )
+
+    async def run() -> list[str]:
+        return [o.order_number async for o in aiter_order_headers(client, page_size=2, max_items=6)]
+
+    assert asyncio.run(run()) == [f"Y{i}" for i in range(6)]
+    assert client.post_request.await_count == 3
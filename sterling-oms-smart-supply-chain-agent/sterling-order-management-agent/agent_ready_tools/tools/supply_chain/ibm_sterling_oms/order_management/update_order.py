@@ -69,6 +69,9 @@ def sterling_oms_update_order(
     if "errors" in response:
         return ToolResponse(success=False, message=response["errors"][0].get("ErrorDescription"))
 
+    # Cached order details no longer reflect the order
+    client.response_cache.invalidate(["getOrderDetails"])
+
     update_order_response = OMSUpdateOrderResponse(
         order_id=response.get("id", ""),
         order_number=response.get("OrderNo", ""),